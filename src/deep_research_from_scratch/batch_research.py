@@ -0,0 +1,318 @@
+"""Batch Research Runner.
+
+This module runs many research requests concurrently through the scoping graph
+or the full multi-agent research system. It is intended for scheduled jobs that
+previously looped over briefs serially:
+
+1. All requests share one process, so the compiled graphs and model clients
+   are reused across items
+2. A global semaphore bounds how many graph runs are in flight at once, and an
+   optional shared rate limiter bounds model requests per second across items
+3. An optional bounded LLM cache lets items reuse identical model calls
+4. Results are yielded as soon as each run finishes and can be written out
+   incrementally as JSON lines
+
+The rate limiter and the LLM cache are process-wide while a batch runs and are
+removed again when it ends.
+
+Example:
+    python -m deep_research_from_scratch.batch_research briefs.jsonl -o reports.jsonl --max-concurrency 4
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+from langchain_core.caches import InMemoryCache
+from langchain_core.globals import get_llm_cache, set_llm_cache
+from langchain_core.messages import HumanMessage
+from langchain_core.rate_limiters import InMemoryRateLimiter
+from langchain_core.runnables import RunnableConfig
+from typing_extensions import (
+    Any,
+    AsyncIterator,
+    Iterable,
+    Iterator,
+    Literal,
+    Optional,
+    TypedDict,
+    Union,
+)
+
+from deep_research_from_scratch.http_transport import aclose_async_http_client
+from deep_research_from_scratch.model_router import (
+    get_prompt_cache_stats,
+    set_rate_limiter,
+)
+from deep_research_from_scratch.progress_events import set_progress_sink
+
+# ===== CONFIGURATION =====
+
+# Graph names mirror the keys used in langgraph.json
+BatchGraph = Literal["scope_research", "research_agent_full"]
+
+# Default number of graph runs allowed in flight at the same time
+default_max_concurrency = 4
+
+# Entries kept by the shared LLM cache; the least recently used are evicted
+default_llm_cache_size = 1000
+
+# ===== SCHEMAS =====
+
+class BatchRequest(TypedDict, total=False):
+    """A single research request in a batch.
+
+    Either ``query`` (a single user message) or ``messages`` (a list of
+    ``(role, content)`` pairs or message dicts) must be provided.
+    """
+    id: str
+    query: str
+    messages: list
+
+class BatchResult(TypedDict, total=False):
+    """Outcome of a single batch item, serializable as one JSON line."""
+    id: str
+    graph: str
+    status: Literal["completed", "needs_clarification", "error"]
+    research_brief: Optional[str]
+    final_report: Optional[str]
+    last_message: Optional[str]
+    error: Optional[str]
+    elapsed_seconds: float
+
+# ===== HELPER FUNCTIONS =====
+
+def get_graph(graph: BatchGraph):
+    """Return the compiled graph registered under the given langgraph.json name."""
+    if graph == "scope_research":
+        from deep_research_from_scratch.research_agent_scope import scope_research
+        return scope_research
+    if graph == "research_agent_full":
+        from deep_research_from_scratch.research_agent_full import agent
+        return agent
+    raise ValueError(f"Unknown batch graph: {graph}")
+
+def normalize_request(request: Union[str, BatchRequest], index: int) -> BatchRequest:
+    """Coerce a raw request (plain string or dict) into a BatchRequest with an id."""
+    if isinstance(request, str):
+        request = {"query": request}
+    normalized = dict(request)
+    normalized.setdefault("id", str(index))
+    if "query" not in normalized and "messages" not in normalized:
+        raise ValueError(f"Batch request {normalized['id']} has neither 'query' nor 'messages'")
+    return normalized
+
+def build_graph_input(request: BatchRequest) -> dict:
+    """Build the graph input state for a batch request."""
+    if request.get("messages"):
+        return {"messages": request["messages"]}
+    return {"messages": [HumanMessage(content=request["query"])]}
+
+def build_result(request: BatchRequest, graph: BatchGraph, state: dict, elapsed: float) -> BatchResult:
+    """Summarize a finished graph state as a JSON-serializable result."""
+    messages = state.get("messages", [])
+    last_message = str(messages[-1].content) if messages else None
+    research_brief = state.get("research_brief")
+    final_report = state.get("final_report")
+
+    if graph == "research_agent_full":
+        status = "completed" if final_report else "needs_clarification"
+    else:
+        status = "completed" if research_brief else "needs_clarification"
+
+    return {
+        "id": request["id"],
+        "graph": graph,
+        "status": status,
+        "research_brief": research_brief,
+        "final_report": final_report,
+        "last_message": last_message,
+        "error": None,
+        "elapsed_seconds": round(elapsed, 3),
+    }
+
+@contextmanager
+def shared_batch_resources(
+    share_llm_cache: bool,
+    llm_cache_size: int,
+    requests_per_second: Optional[float],
+    max_concurrency: int,
+) -> Iterator[None]:
+    """Install the batch's LLM cache and model rate limiter, and restore the previous ones afterwards.
+
+    Every model in this package is created with ``init_chat_model`` and honours the
+    global LangChain cache, so with a shared cache identical calls made by different
+    batch items (for example summarizing the same webpage twice) are only paid for
+    once. An LLM cache that is already configured is left in place.
+    """
+    previous_cache = get_llm_cache()
+    if share_llm_cache and previous_cache is None:
+        set_llm_cache(InMemoryCache(maxsize=llm_cache_size))
+    previous_limiter = None
+    if requests_per_second:
+        limiter = InMemoryRateLimiter(requests_per_second=requests_per_second, max_bucket_size=max_concurrency)
+        previous_limiter = set_rate_limiter(limiter)
+    try:
+        yield
+    finally:
+        if requests_per_second:
+            set_rate_limiter(previous_limiter)
+        if share_llm_cache and previous_cache is None:
+            set_llm_cache(None)
+
+# ===== BATCH EXECUTION =====
+
+async def stream_batch(
+    requests: Iterable[Union[str, BatchRequest]],
+    graph: BatchGraph = "research_agent_full",
+    max_concurrency: int = default_max_concurrency,
+    config: Optional[RunnableConfig] = None,
+    share_llm_cache: bool = False,
+    llm_cache_size: int = default_llm_cache_size,
+    requests_per_second: Optional[float] = None,
+) -> AsyncIterator[BatchResult]:
+    """Run research requests concurrently and yield results as each one finishes.
+
+    Args:
+        requests: Plain query strings or BatchRequest dicts
+        graph: Name of the graph to run each request through
+        max_concurrency: Maximum number of graph runs in flight at once
+        config: Optional RunnableConfig applied to every run
+        share_llm_cache: Whether to share an LLM cache across the batch's items
+        llm_cache_size: Maximum number of entries in the shared LLM cache
+        requests_per_second: Model requests per second allowed across all items (None for no limit)
+
+    Yields:
+        BatchResult for each request, in completion order
+    """
+    if max_concurrency < 1:
+        raise ValueError("max_concurrency must be at least 1")
+
+    compiled_graph = get_graph(graph)
+    semaphore = asyncio.Semaphore(max_concurrency)
+    normalized = [normalize_request(request, i) for i, request in enumerate(requests)]
+
+    async def run_one(request: BatchRequest) -> BatchResult:
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                state = await compiled_graph.ainvoke(build_graph_input(request), config=config)
+            except Exception as e:
+                return {
+                    "id": request["id"],
+                    "graph": graph,
+                    "status": "error",
+                    "error": f"{type(e).__name__}: {e}",
+                    "elapsed_seconds": round(time.perf_counter() - start, 3),
+                }
+            return build_result(request, graph, state, time.perf_counter() - start)
+
+    with shared_batch_resources(share_llm_cache, llm_cache_size, requests_per_second, max_concurrency):
+        tasks = [asyncio.create_task(run_one(request)) for request in normalized]
+        try:
+            for next_result in asyncio.as_completed(tasks):
+                yield await next_result
+        finally:
+            # Cancel outstanding runs if the consumer stops iterating early
+            for task in tasks:
+                task.cancel()
+
+async def run_batch(
+    requests: Iterable[Union[str, BatchRequest]],
+    output_path: Union[str, Path],
+    graph: BatchGraph = "research_agent_full",
+    max_concurrency: int = default_max_concurrency,
+    config: Optional[RunnableConfig] = None,
+    share_llm_cache: bool = False,
+    llm_cache_size: int = default_llm_cache_size,
+    requests_per_second: Optional[float] = None,
+) -> list[BatchResult]:
+    """Run a batch of research requests and append each result to a JSON-lines file.
+
+    Each result is written and flushed as soon as it is available, so partial
+    output survives if the job is interrupted.
+
+    Args:
+        requests: Plain query strings or BatchRequest dicts
+        output_path: Path of the JSON-lines file to write results to
+        graph: Name of the graph to run each request through
+        max_concurrency: Maximum number of graph runs in flight at once
+        config: Optional RunnableConfig applied to every run
+        share_llm_cache: Whether to share an LLM cache across the batch's items
+        llm_cache_size: Maximum number of entries in the shared LLM cache
+        requests_per_second: Model requests per second allowed across all items (None for no limit)
+
+    Returns:
+        List of all results, in completion order
+    """
+    results = []
+    with open(output_path, "a", encoding="utf-8") as f:
+        async for result in stream_batch(
+            requests,
+            graph=graph,
+            max_concurrency=max_concurrency,
+            config=config,
+            share_llm_cache=share_llm_cache,
+            llm_cache_size=llm_cache_size,
+            requests_per_second=requests_per_second,
+        ):
+            f.write(json.dumps(result, ensure_ascii=False) + "\n")
+            f.flush()
+            results.append(result)
+    return results
+
+def load_requests(path: Union[str, Path]) -> list[Union[str, BatchRequest]]:
+    """Load batch requests from a JSON-lines file.
+
+    Each non-empty line is either a JSON object (a BatchRequest) or a JSON string.
+    """
+    requests: list[Any] = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                requests.append(json.loads(line))
+    return requests
+
+# ===== COMMAND LINE =====
+
+def main() -> None:
+    """Run a batch from the command line."""
+    parser = argparse.ArgumentParser(description="Run research requests concurrently.")
+    parser.add_argument("input", help="JSON-lines file of research requests")
+    parser.add_argument("-o", "--output", required=True, help="JSON-lines file to append results to")
+    parser.add_argument("--graph", default="research_agent_full", choices=["scope_research", "research_agent_full"])
+    parser.add_argument("--max-concurrency", type=int, default=default_max_concurrency)
+    parser.add_argument("--llm-cache", action="store_true", help="Share a bounded in-memory LLM cache across items")
+    parser.add_argument("--llm-cache-size", type=int, default=default_llm_cache_size, help="Entries kept by the LLM cache")
+    parser.add_argument("--requests-per-second", type=float, help="Model requests per second allowed across all items")
+    parser.add_argument("--cache-stats", help="JSON file to write provider prompt cache statistics to")
+    parser.add_argument("--progress-log", help="JSON-lines file to append progress events to")
+    args = parser.parse_args()
+
+    if args.progress_log:
+        set_progress_sink(args.progress_log)
+
+    async def run() -> None:
+        try:
+            await run_batch(
+                load_requests(args.input),
+                args.output,
+                graph=args.graph,
+                max_concurrency=args.max_concurrency,
+                share_llm_cache=args.llm_cache,
+                llm_cache_size=args.llm_cache_size,
+                requests_per_second=args.requests_per_second,
+            )
+        finally:
+            await aclose_async_http_client()
+
+    asyncio.run(run())
+
+    if args.cache_stats:
+        Path(args.cache_stats).write_text(json.dumps(get_prompt_cache_stats(), indent=2), encoding="utf-8")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""Content-Addressed Blob Store.
+
+This module stores large text payloads on disk, addressed by the SHA-256 of
+their content, so graph state can carry a short reference string instead of the
+text itself. Identical payloads are stored once, and payloads are only read
+back when something actually needs them.
+
+References look like ``blob:sha256:<hex digest>`` and can be kept in any
+``list[str]`` state field alongside plain strings.
+"""
+
+import hashlib
+import os
+import zlib
+from pathlib import Path
+
+from typing_extensions import List, Optional
+
+from deep_research_from_scratch.storage_dirs import user_data_dir
+
+# ===== CONFIGURATION =====
+
+REF_PREFIX = "blob:sha256:"
+
+# Directory in the per-user data directory unless overridden by the environment;
+# spilled notes are referenced from saved graph state, so they are not a cache
+default_blob_dir = Path(os.getenv(
+    "DEEP_RESEARCH_BLOB_DIR",
+    user_data_dir() / "blob_store",
+))
+
+# ===== BLOB STORE =====
+
+class BlobStore:
+    """Zlib-compressed, content-addressed text storage in a local directory."""
+
+    def __init__(self, root: Path = default_blob_dir):
+        """Use the given directory for blobs, creating it on first write."""
+        self.root = Path(root)
+
+    def _path(self, digest: str) -> Path:
+        """Return the file path of a digest, fanned out by its first two characters."""
+        return self.root / digest[:2] / digest
+
+    def put(self, text: str) -> str:
+        """Store text and return its reference. Writing the same text twice is a no-op."""
+        data = text.encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._path(digest)
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_name(f"{digest}.{os.getpid()}.tmp")
+            tmp_path.write_bytes(zlib.compress(data))
+            os.replace(tmp_path, path)
+        return REF_PREFIX + digest
+
+    def get(self, ref: str) -> str:
+        """Load the text behind a reference.
+
+        Raises:
+            KeyError: If the blob does not exist
+        """
+        path = self._path(ref[len(REF_PREFIX):])
+        try:
+            return zlib.decompress(path.read_bytes()).decode("utf-8")
+        except FileNotFoundError:
+            raise KeyError(ref) from None
+
+# Global store - created lazily on first use
+_store: Optional[BlobStore] = None
+
+def get_blob_store() -> BlobStore:
+    """Get or create the process-wide blob store."""
+    global _store
+    if _store is None:
+        _store = BlobStore()
+    return _store
+
+# ===== HELPER FUNCTIONS =====
+
+def is_blob_ref(value: str) -> bool:
+    """Return whether a string is a blob reference."""
+    return isinstance(value, str) and value.startswith(REF_PREFIX)
+
+def spill_text(text: str) -> str:
+    """Store text in the blob store and return its reference."""
+    return get_blob_store().put(text)
+
+def load_text(value: str) -> str:
+    """Return the text behind a reference, or the value itself if it is plain text."""
+    return get_blob_store().get(value) if is_blob_ref(value) else value
+
+def load_notes(notes: List[str]) -> List[str]:
+    """Resolve a list of notes that may mix plain strings and blob references."""
+    return [load_text(note) for note in notes]
+
+def combine_notes(notes: List[str]) -> str:
+    """Join several notes into one entry, without loading anything for a single note.
+
+    A single note (plain or reference) is passed through unchanged, so spilled notes
+    stay spilled as they move from researcher to supervisor state.
+    """
+    if len(notes) == 1:
+        return notes[0]
+    combined = "\n".join(load_notes(notes))
+    return spill_text(combined) if any(is_blob_ref(note) for note in notes) else combined
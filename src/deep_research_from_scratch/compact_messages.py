@@ -0,0 +1,129 @@
+"""Compact Tool Message Representation.
+
+This module keeps large tool outputs out of graph state. In compact mode a
+ToolMessage produced by ``tavily_search`` is stored as a short stub whose
+artifact lists its sources (URL, title and a summary id); the summaries
+themselves live in the content-addressed blob store. Other large tool outputs
+are stored whole under a single content id.
+
+Messages are expanded back into text only when a model prompt is built.
+Identical summaries share one blob, and a source that already appeared
+earlier in the conversation is rendered only once.
+"""
+
+from langchain_core.messages import BaseMessage, ToolMessage
+from typing_extensions import List, Optional, Sequence
+
+from deep_research_from_scratch.blob_store import load_text, spill_text
+from deep_research_from_scratch.state_research import SearchResults, SourceRecord
+from deep_research_from_scratch.utils import render_search_results
+
+# ===== CONFIGURATION =====
+
+# Tool outputs shorter than this are kept inline
+min_compact_chars = 2000
+
+# ===== COMPACTION =====
+
+def is_compact(message: BaseMessage) -> bool:
+    """Return whether a message is a compacted tool message."""
+    return (
+        isinstance(message, ToolMessage)
+        and isinstance(message.artifact, dict)
+        and message.artifact.get("compact") in ("search", "text")
+    )
+
+def compact_tool_message(message: ToolMessage) -> ToolMessage:
+    """Move the bulk of a tool message into the blob store.
+
+    Search results (a tool message whose artifact is a SearchResults dump) become
+    a list of source records that point at their summary and excerpts blobs. Any other tool output longer than
+    min_compact_chars is stored whole, and the compact keys are added to its existing artifact. Short outputs
+    are returned unchanged.
+    """
+    if is_compact(message):
+        return message
+
+    if message.name == "tavily_search" and isinstance(message.artifact, dict):
+        results = SearchResults.model_validate(message.artifact)
+        sources = [
+            {
+                "url": source.url,
+                "title": source.title,
+                "summary_id": spill_text(source.summary),
+                "excerpts_id": spill_text(source.excerpts) if source.excerpts else None,
+                "summary_tier": source.summary_tier,
+            }
+            for source in results.sources
+        ]
+        stub = "; ".join(f"{source['title']} <{source['url']}>" for source in sources)
+        return message.model_copy(update={
+            "content": f"[{len(sources)} search results stored out of state: {stub}]",
+            "artifact": {"compact": "search", "sources": sources},
+        })
+
+    content = message.content if isinstance(message.content, str) else str(message.content)
+    if len(content) < min_compact_chars:
+        return message
+    # Keep what the tool recorded in its artifact (e.g. the status of a ConductResearch call)
+    artifact = message.artifact if isinstance(message.artifact, dict) else (
+        {} if message.artifact is None else {"artifact": message.artifact}
+    )
+    return message.model_copy(update={
+        "content": f"[{message.name} output stored out of state, {len(content)} characters]",
+        "artifact": {**artifact, "compact": "text", "content_id": spill_text(content)},
+    })
+
+def drop_search_artifact(message: ToolMessage) -> ToolMessage:
+    """Remove the SearchResults artifact from an uncompacted tavily_search message."""
+    if message.name != "tavily_search" or is_compact(message) or message.artifact is None:
+        return message
+    return message.model_copy(update={"artifact": None})
+
+# ===== RENDERING =====
+
+def render_messages(
+    messages: Sequence[BaseMessage],
+    output_format: str = "text",
+    max_tokens: Optional[int] = None,
+) -> List[BaseMessage]:
+    """Expand compacted tool messages into full text for a model prompt.
+
+    Non-compact messages are returned unchanged. Search sources whose summary was
+    already rendered earlier in the list are referenced instead of repeated.
+
+    Args:
+        messages: Messages that may contain compacted tool messages
+        output_format: Rendering of search results ("text", "json" or "truncated")
+        max_tokens: Token budget per search result for the "truncated" format
+    """
+    rendered = []
+    seen_summaries = set()
+    for message in messages:
+        if not is_compact(message):
+            rendered.append(message)
+            continue
+
+        if message.artifact["compact"] == "text":
+            content = load_text(message.artifact["content_id"])
+        else:
+            records = []
+            for source in message.artifact["sources"]:
+                summary_id = source["summary_id"]
+                if summary_id in seen_summaries:
+                    summary, excerpts = "(Same content as a source shown earlier in this conversation.)", ""
+                else:
+                    summary = load_text(summary_id)
+                    excerpts = load_text(source["excerpts_id"]) if source.get("excerpts_id") else ""
+                    seen_summaries.add(summary_id)
+                records.append(SourceRecord(
+                    title=source["title"],
+                    url=source["url"],
+                    summary=summary,
+                    excerpts=excerpts,
+                    summary_tier=source.get("summary_tier", "llm"),
+                ))
+            content = render_search_results(SearchResults(sources=records), output_format, max_tokens)
+
+        rendered.append(message.model_copy(update={"content": content}))
+    return rendered
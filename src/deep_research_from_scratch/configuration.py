@@ -0,0 +1,181 @@
+"""Runtime Configuration for the Research Graphs.
+
+This module defines the options that change how a research run executes
+(for example where sub-agents run). Values are resolved per run in this order:
+
+1. ``config["configurable"]`` passed to the graph invocation
+2. ``DEEP_RESEARCH_<FIELD_NAME>`` environment variables
+3. The defaults declared below
+"""
+
+import os
+
+from langchain_core.runnables import RunnableConfig
+from pydantic import BaseModel, Field
+from typing_extensions import Literal, Optional
+
+
+class Configuration(BaseModel):
+    """Runtime options shared by the research graphs."""
+
+    # Number of worker processes used to run ConductResearch jobs (0 runs them in-process)
+    research_worker_processes: int = Field(
+        default=0,
+        ge=0,
+        description="Worker processes for sub-agent research. 0 runs researchers on the supervisor's event loop.",
+    )
+    # Re-invoke the supervisor as soon as enough researchers finish instead of waiting for all of them
+    speculative_research: bool = Field(
+        default=False,
+        description="Let the supervisor continue while slow researchers keep running in the background.",
+    )
+    # Fraction of newly launched researchers that must finish before the supervisor is re-invoked
+    speculative_quorum: float = Field(
+        default=0.5,
+        gt=0.0,
+        le=1.0,
+        description="Fraction of newly launched researchers to wait for in speculative mode.",
+    )
+    # Deadline for one researcher sub-agent; a researcher that misses it is reported as failed
+    research_timeout_seconds: Optional[float] = Field(
+        default=1200.0,
+        gt=0.0,
+        description="Seconds a researcher sub-agent may run before it is cancelled. None disables the deadline.",
+    )
+
+    # Decide on clarification and write the research brief in one model call instead of two sequential ones
+    scoping_mode: Literal["two_step", "single_call"] = Field(
+        default="two_step",
+        description="'two_step' runs the clarification and research brief calls in sequence; "
+        "'single_call' returns both from one structured-output call.",
+    )
+    # Reuse the scoping result of an identical earlier conversation and skip the scoping calls
+    scope_cache: bool = Field(
+        default=False,
+        description="Cache clarification decisions and research briefs keyed on the normalized conversation.",
+    )
+    scope_cache_max_age_hours: float = Field(
+        default=24.0,
+        gt=0.0,
+        description="Freshness window of cached scoping results; older entries are neither served nor kept.",
+    )
+
+    # Answer ConductResearch calls from a semantic cache of earlier researcher outputs
+    research_cache: bool = Field(
+        default=False,
+        description="Reuse a cached researcher output when a new research topic is semantically close to a cached one.",
+    )
+    research_cache_threshold: float = Field(
+        default=0.92,
+        ge=0.0,
+        le=1.0,
+        description="Minimum cosine similarity between research topics for a cache hit.",
+    )
+    research_cache_max_age_hours: float = Field(
+        default=168.0,
+        gt=0.0,
+        description="Freshness window of cached research; older entries are neither served nor kept.",
+    )
+
+    # Persistent memory of findings from earlier runs that the supervisor can search
+    research_memory: bool = Field(
+        default=False,
+        description="Store researcher findings across runs and give the supervisor a SearchResearchMemory tool.",
+    )
+    research_memory_results: int = Field(
+        default=3,
+        gt=0,
+        description="Maximum number of stored findings returned per SearchResearchMemory call.",
+    )
+    research_memory_max_age_days: float = Field(
+        default=90.0,
+        gt=0.0,
+        description="Findings older than this are evicted from research memory.",
+    )
+    research_memory_max_mb: float = Field(
+        default=50.0,
+        gt=0.0,
+        description="Size limit of research memory; least recently used findings are evicted beyond it.",
+    )
+
+    # Keep raw notes in the on-disk blob store and carry only references in graph state
+    spill_raw_notes: bool = Field(
+        default=False,
+        description="Spill raw research notes to a content-addressed blob store instead of keeping them in state.",
+    )
+
+    # Size limit of a run's graph state; beyond it large messages and notes move to the blob store
+    memory_budget_mb: Optional[float] = Field(
+        default=None,
+        gt=0.0,
+        description="Budget in MB for graph state, checked by the supervisor and by each researcher. "
+        "Over budget, tool outputs are compacted and notes spilled to the blob store. None disables the budget.",
+    )
+
+    # Store tool outputs as source records in the blob store and render them only for prompts
+    compact_tool_messages: bool = Field(
+        default=False,
+        description="Keep large tool outputs out of researcher_messages and expand them only when prompting.",
+    )
+
+    # Backend that serves tavily_search: the Tavily API, an offline local corpus or synthetic load-test results
+    search_provider: Literal["tavily", "local", "fake"] = Field(
+        default="tavily",
+        description="Search backend: 'tavily' for the hosted API, 'local' for an indexed directory of documents, "
+        "'fake' for synthetic results with simulated latency (load tests).",
+    )
+    local_corpus_dir: Optional[str] = Field(
+        default=None,
+        description="Directory served by the local search provider. Defaults to DEEP_RESEARCH_LOCAL_CORPUS_DIR or files/.",
+    )
+
+    # Search with snippets first and fetch raw content only for relevant sources
+    search_depth: Literal["full", "adaptive"] = Field(
+        default="full",
+        description="'full' fetches raw content for every result; 'adaptive' fetches it only for results above search_relevance_threshold.",
+    )
+    search_relevance_threshold: float = Field(
+        default=0.5,
+        ge=0.0,
+        le=1.0,
+        description="Minimum Tavily relevance score for fetching a result's raw content in adaptive mode.",
+    )
+
+    # Summarize most pages locally and reserve the LLM summarizer for pages that need it
+    summarization_mode: Literal["llm", "tiered"] = Field(
+        default="llm",
+        description="'llm' summarizes every page with the model; 'tiered' uses a local extractive summary unless a page is long, query-dense or highly relevant.",
+    )
+
+    # Focus page summaries on the search query and research topic, within a per-source budget
+    query_aware_summaries: bool = Field(
+        default=False,
+        description="Summarize pages for the originating query and research topic instead of generically.",
+    )
+    summary_max_tokens: int = Field(
+        default=300,
+        gt=0,
+        description="Approximate token budget per source summary (summary plus excerpts) when query_aware_summaries is on.",
+    )
+
+    # How search tool results are rendered into tool messages and researcher prompts
+    search_output_format: Literal["text", "json", "truncated"] = Field(
+        default="text",
+        description="Rendering of search results: full text, JSON source records, or text truncated to search_output_max_tokens.",
+    )
+    search_output_max_tokens: int = Field(
+        default=2000,
+        gt=0,
+        description="Approximate token budget for one search result when search_output_format is 'truncated'.",
+    )
+
+    @classmethod
+    def from_runnable_config(cls, config: Optional[RunnableConfig] = None) -> "Configuration":
+        """Create a Configuration from a RunnableConfig, falling back to environment variables."""
+        configurable = (config or {}).get("configurable", {}) or {}
+        values = {}
+        for name in cls.model_fields:
+            value = configurable.get(name, os.environ.get(f"DEEP_RESEARCH_{name.upper()}"))
+            if value is not None:
+                values[name] = value
+        return cls(**values)
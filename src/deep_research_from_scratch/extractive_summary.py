@@ -0,0 +1,117 @@
+"""Local Extractive Summarization.
+
+This module provides a fast, model-free summarizer for search results. It
+splits a page into sentences, ranks them against the search query with BM25
+and keeps the best ones in their original order.
+
+It is the cheap first tier of tiered summarization: most pages are summarized
+locally. A page is escalated to the LLM summarizer only when it is dense with
+query terms and also long or ranked highly by the search engine. Long, highly
+ranked pages are the common case for Tavily results, so neither signal
+escalates a page on its own.
+"""
+
+import re
+from collections import Counter
+
+from typing_extensions import List, Literal
+
+from deep_research_from_scratch.local_index import BM25, html_to_text, tokenize
+from deep_research_from_scratch.state_research import Summary
+
+# ===== CONFIGURATION =====
+
+# Number of sentences kept in an extractive summary
+summary_sentences = 6
+
+# Number of top-ranked sentences quoted as key excerpts
+excerpt_sentences = 2
+
+# Sentences shorter than this many words are ignored (navigation, captions, ...)
+min_sentence_words = 5
+
+# A page counts as query-dense when at least this fraction of its sentences mention a
+# query term; only dense pages are escalated, since their relevant content does not
+# fit in a few extracted sentences
+llm_min_density = 0.5
+
+# A dense page is escalated when it has more words than this...
+llm_min_words = 2000
+
+# ...or when the search engine's relevance score is at least this
+llm_min_score = 0.85
+
+SENTENCE_PATTERN = re.compile(r"(?<=[.!?])\s+(?=[A-Z0-9\"'(\[])|\n{2,}")
+
+SummaryTier = Literal["extractive", "llm"]
+
+# ===== SENTENCE SCORING =====
+
+def split_sentences(text: str) -> List[str]:
+    """Split page text into sentences, dropping fragments that are too short to be useful."""
+    sentences = (" ".join(part.split()) for part in SENTENCE_PATTERN.split(html_to_text(text)))
+    return [sentence for sentence in sentences if len(sentence.split()) >= min_sentence_words]
+
+def score_sentences(sentences: List[str], query: str) -> List[float]:
+    """Score sentences against the query with BM25, treating each sentence as a document."""
+    query_terms = tokenize(query)
+    if not query_terms:
+        return [0.0] * len(sentences)
+    return BM25([Counter(tokenize(sentence)) for sentence in sentences]).scores(query_terms)
+
+def query_density(sentences: List[str], query: str) -> float:
+    """Fraction of sentences that mention at least one query term."""
+    query_terms = set(tokenize(query))
+    if not sentences or not query_terms:
+        return 0.0
+    matching = sum(1 for sentence in sentences if query_terms.intersection(tokenize(sentence)))
+    return matching / len(sentences)
+
+# ===== TIERED SUMMARIZATION =====
+
+def select_summary_tier(result: dict, query: str) -> SummaryTier:
+    """Decide whether a search result is summarized locally or by the LLM.
+
+    Args:
+        result: Tavily search result with raw_content and an optional relevance score
+        query: The search query the result was returned for
+
+    Returns:
+        "llm" for query-dense pages that are also long or highly relevant, "extractive" otherwise
+    """
+    raw_content = result.get("raw_content") or ""
+    long_page = len(raw_content.split()) > llm_min_words
+    relevant = result.get("score", 0.0) >= llm_min_score
+    if not (long_page or relevant):
+        return "extractive"
+    dense = query_density(split_sentences(raw_content), query) >= llm_min_density
+    return "llm" if dense else "extractive"
+
+def extractive_summary(webpage_content: str, query: str) -> Summary:
+    """Summarize a page by selecting its sentences most relevant to the query.
+
+    The summary keeps the selected sentences in document order; the key excerpts
+    quote the highest-ranked ones. Without query matches the opening sentences are used.
+
+    Args:
+        webpage_content: Raw webpage content
+        query: The search query, used to rank sentences
+
+    Returns:
+        Summary with the selected sentences and key excerpts
+    """
+    sentences = split_sentences(webpage_content)
+    if not sentences:
+        return Summary(summary=" ".join(webpage_content.split()[:150]), key_excerpts="")
+
+    scores = score_sentences(sentences, query)
+    ranked = sorted(range(len(sentences)), key=lambda i: (-scores[i], i))
+    if scores[ranked[0]] <= 0:
+        ranked = list(range(len(sentences)))
+
+    selected = sorted(ranked[:summary_sentences])
+    excerpts = [f'"{sentences[i]}"' for i in ranked[:excerpt_sentences] if scores[i] > 0]
+    return Summary(
+        summary=" ".join(sentences[i] for i in selected),
+        key_excerpts="\n".join(excerpts),
+    )
@@ -0,0 +1,251 @@
+"""Fake Model and Search Backends for Load Tests.
+
+Load tests need the full research graph to run end to end without paying for
+(or being rate-limited by) hosted models and search. This module provides
+stand-ins that behave like the real backends from the graph's point of view,
+with latencies drawn from configurable distributions:
+
+- FakeChatModel: a chat model that answers scoping and summarization calls with
+  schema-valid structured output, makes the supervisor delegate a fixed number
+  of research topics, makes researchers run a fixed number of searches, and
+  writes compressed research and reports of a configurable length
+- FakeSearchProvider: a search provider returning synthetic pages
+
+Enable them in a server or process with environment variables:
+
+    DEEP_RESEARCH_FAKE_MODELS=true        # every role uses "fake:<role>"
+    DEEP_RESEARCH_FAKE_MODEL_LATENCY=lognormal:1.5,0.6
+    DEEP_RESEARCH_FAKE_SUMMARIZE_LATENCY=lognormal:0.6,0.4   # per role override
+    DEEP_RESEARCH_FAKE_SEARCH_LATENCY=uniform:0.3,1.2
+
+and run with ``{"configurable": {"search_provider": "fake"}}``. Latency specs are
+``<seconds>``, ``fixed:<s>``, ``uniform:<low>,<high>``, ``normal:<mean>,<sd>``,
+``lognormal:<median>,<sigma>`` or ``exponential:<mean>``.
+"""
+
+import asyncio
+import hashlib
+import math
+import os
+import random
+import time
+from dataclasses import dataclass
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage, ToolMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langchain_core.utils.function_calling import convert_to_openai_tool
+from typing_extensions import Any, List, Optional
+
+from deep_research_from_scratch.search_providers import SearchProvider
+
+# ===== CONFIGURATION =====
+
+# Research topics the fake supervisor delegates in its first step
+fake_research_topics = int(os.getenv("DEEP_RESEARCH_FAKE_RESEARCH_TOPICS", 3))
+
+# Searches each fake researcher runs before it answers
+fake_searches_per_researcher = int(os.getenv("DEEP_RESEARCH_FAKE_SEARCHES", 2))
+
+# Approximate size of free-text answers (compressed research, reports) and of search pages
+fake_output_tokens = int(os.getenv("DEEP_RESEARCH_FAKE_OUTPUT_TOKENS", 400))
+fake_page_tokens = int(os.getenv("DEEP_RESEARCH_FAKE_PAGE_TOKENS", 1500))
+
+FILLER = (
+    "Independent measurements report consistent results across regions, with the largest "
+    "differences explained by sample size and collection method. "
+)
+
+# ===== LATENCY DISTRIBUTIONS =====
+
+@dataclass(frozen=True)
+class LatencyDistribution:
+    """Distribution of simulated call latencies in seconds."""
+    kind: str = "fixed"
+    a: float = 0.0
+    b: float = 0.0
+
+    @classmethod
+    def parse(cls, spec: Optional[str], default: str = "0") -> "LatencyDistribution":
+        """Parse a spec such as "0.5", "uniform:0.2,1.0" or "lognormal:1.5,0.6"."""
+        spec = (spec or default).strip()
+        kind, _, params = spec.partition(":") if ":" in spec else ("fixed", "", spec)
+        values = [float(value) for value in params.split(",") if value.strip()]
+        if kind not in ("fixed", "uniform", "normal", "lognormal", "exponential") or not values:
+            raise ValueError(f"Invalid latency distribution '{spec}'")
+        return cls(kind, values[0], values[1] if len(values) > 1 else 0.0)
+
+    @classmethod
+    def from_env(cls, name: str, default: str = "0") -> "LatencyDistribution":
+        """Read a distribution from the environment variable DEEP_RESEARCH_FAKE_<NAME>_LATENCY."""
+        return cls.parse(os.getenv(f"DEEP_RESEARCH_FAKE_{name.upper()}_LATENCY"), default)
+
+    def sample(self) -> float:
+        """Draw one latency; never negative."""
+        if self.kind == "uniform":
+            value = random.uniform(self.a, self.b)
+        elif self.kind == "normal":
+            value = random.gauss(self.a, self.b)
+        elif self.kind == "lognormal":
+            value = random.lognormvariate(math.log(self.a), self.b) if self.a > 0 else 0.0
+        elif self.kind == "exponential":
+            value = random.expovariate(1 / self.a) if self.a > 0 else 0.0
+        else:
+            value = self.a
+        return max(0.0, value)
+
+# ===== FAKE CHAT MODEL =====
+
+def filler_text(tokens: int, seed: str = "") -> str:
+    """Deterministic text of roughly the given number of tokens."""
+    repeats = max(1, tokens * 4 // len(FILLER))
+    return (f"{seed}. " if seed else "") + FILLER * repeats
+
+def fake_value(schema: dict, name: str = "") -> Any:
+    """Smallest value that validates against a JSON schema property."""
+    if "anyOf" in schema:
+        options = [option for option in schema["anyOf"] if option.get("type") != "null"]
+        return fake_value(options[0] if options else {}, name)
+    if "enum" in schema:
+        return schema["enum"][0]
+    kind = schema.get("type")
+    if kind == "boolean":
+        # False keeps the graph moving, e.g. need_clarification
+        return False
+    if kind in ("integer", "number"):
+        return schema.get("minimum", 0)
+    if kind == "array":
+        return []
+    if kind == "object":
+        return {key: fake_value(value, key) for key, value in schema.get("properties", {}).items()}
+    return filler_text(40, name.replace("_", " ").capitalize())
+
+class FakeChatModel(BaseChatModel):
+    """Chat model stand-in that drives the research graphs to completion with simulated latency."""
+
+    model_name: str = "fake"
+    latency: LatencyDistribution = LatencyDistribution()
+    tools: list = []
+    tool_choice: Any = None
+
+    @classmethod
+    def from_model_id(cls, model: str) -> "FakeChatModel":
+        """Create the model for "fake:<name>", with latency from DEEP_RESEARCH_FAKE_<NAME>_LATENCY."""
+        name = model.split(":", 1)[1] if ":" in model else model
+        default = os.getenv("DEEP_RESEARCH_FAKE_MODEL_LATENCY", "0")
+        return cls(model_name=name, latency=LatencyDistribution.from_env(name, default))
+
+    @property
+    def _llm_type(self) -> str:
+        """Type of the model, for LangChain tracing."""
+        return "fake"
+
+    def bind_tools(self, tools: list, tool_choice: Any = None, **kwargs: Any) -> "FakeChatModel":
+        """Return a copy that answers with calls to the given tools."""
+        return self.model_copy(update={"tools": [convert_to_openai_tool(t) for t in tools], "tool_choice": tool_choice})
+
+    def _tool_call(self, name: str, args: dict, seed: str) -> dict:
+        """Build a tool call with a deterministic id."""
+        digest = hashlib.sha1(f"{name}:{seed}".encode()).hexdigest()[:12]
+        return {"name": name, "args": args, "id": f"call_{digest}"}
+
+    def _respond(self, messages: List[BaseMessage]) -> AIMessage:
+        """Choose the answer the graph expects at this point of the conversation."""
+        names = [tool["function"]["name"] for tool in self.tools]
+        seed = str(messages[-1].content)[:80] if messages else ""
+        tool_results = [message for message in messages if isinstance(message, ToolMessage)]
+
+        if self.tool_choice and len(self.tools) == 1:
+            # Structured output: fill the schema
+            function = self.tools[0]["function"]
+            return AIMessage(content="", tool_calls=[
+                self._tool_call(function["name"], fake_value(function.get("parameters", {})), seed)
+            ])
+        if "ConductResearch" in names:
+            if not any(message.name == "ConductResearch" for message in tool_results):
+                return AIMessage(content="", tool_calls=[
+                    self._tool_call("ConductResearch", {"research_topic": f"Research topic {i + 1}: {seed}"}, f"{seed}{i}")
+                    for i in range(fake_research_topics)
+                ])
+            return AIMessage(content="", tool_calls=[self._tool_call("ResearchComplete", {}, seed)])
+        if "tavily_search" in names:
+            searches = sum(message.name == "tavily_search" for message in tool_results)
+            if searches < fake_searches_per_researcher:
+                return AIMessage(content="", tool_calls=[
+                    self._tool_call("tavily_search", {"query": f"{seed[:40]} {searches + 1}"}, f"{seed}{searches}")
+                ])
+        return AIMessage(content=filler_text(fake_output_tokens, "Findings") + "\n\nSources: https://example.com/source-1")
+
+    def _result(self, messages: List[BaseMessage]) -> ChatResult:
+        """Build the response with token usage estimated from text lengths."""
+        message = self._respond(messages)
+        input_tokens = sum(len(str(m.content)) for m in messages) // 4
+        output_tokens = max(1, len(str(message.content)) // 4)
+        message.usage_metadata = {
+            "input_tokens": input_tokens,
+            "output_tokens": output_tokens,
+            "total_tokens": input_tokens + output_tokens,
+        }
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None, run_manager: Any = None, **kwargs: Any) -> ChatResult:
+        """Answer after a simulated latency, blocking the calling thread."""
+        time.sleep(self.latency.sample())
+        return self._result(messages)
+
+    async def _agenerate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None, run_manager: Any = None, **kwargs: Any) -> ChatResult:
+        """Answer after a simulated latency without blocking the event loop."""
+        await asyncio.sleep(self.latency.sample())
+        return self._result(messages)
+
+# ===== FAKE SEARCH PROVIDER =====
+
+class FakeSearchProvider(SearchProvider):
+    """Search provider returning synthetic pages after a simulated latency."""
+
+    name = "fake"
+
+    def __init__(self, latency: Optional[LatencyDistribution] = None, page_tokens: int = fake_page_tokens):
+        """Create the provider; latency defaults to DEEP_RESEARCH_FAKE_SEARCH_LATENCY."""
+        self.latency = latency or LatencyDistribution.from_env("search")
+        self.page_tokens = page_tokens
+
+    def _results(self, query: str, max_results: int, include_raw_content: bool) -> dict:
+        """Synthetic results for a query; URLs are stable per query."""
+        slug = hashlib.sha1(query.encode()).hexdigest()[:10]
+        results = []
+        for i in range(max_results):
+            result = {
+                "url": f"https://example.com/{slug}/{i}",
+                "title": f"{query} ({i + 1})",
+                "content": filler_text(40, query),
+                "score": round(0.9 - 0.1 * i, 2),
+            }
+            if include_raw_content:
+                result["raw_content"] = filler_text(self.page_tokens, query)
+            results.append(result)
+        return {"query": query, "results": results}
+
+    def search(self, query, max_results=3, topic="general", include_raw_content=True) -> dict:
+        """Return synthetic results, blocking for the simulated latency."""
+        time.sleep(self.latency.sample())
+        return self._results(query, max_results, include_raw_content)
+
+    async def asearch(self, query, max_results=3, topic="general", include_raw_content=True) -> dict:
+        """Return synthetic results after the simulated latency without blocking the event loop."""
+        await asyncio.sleep(self.latency.sample())
+        return self._results(query, max_results, include_raw_content)
+
+    def _pages(self, urls: List[str]) -> dict:
+        """Synthetic full content for URLs."""
+        return {"results": [{"url": url, "raw_content": filler_text(self.page_tokens, url)} for url in urls], "failed_results": []}
+
+    def extract(self, urls: List[str]) -> dict:
+        """Return a synthetic page for every URL, blocking for the simulated latency."""
+        time.sleep(self.latency.sample())
+        return self._pages(urls)
+
+    async def aextract(self, urls: List[str]) -> dict:
+        """Async version of extract."""
+        await asyncio.sleep(self.latency.sample())
+        return self._pages(urls)
@@ -0,0 +1,218 @@
+"""Shared HTTP Transport.
+
+Dozens of concurrent researchers all talk to the same few hosts (the model API
+and the search API). This module gives them one tuned connection pool per
+process instead of letting every client open its own sockets:
+
+- Keep-alive connections are reused across requests, researchers and graphs,
+  which avoids repeated TCP and TLS handshakes
+- Pool size, keep-alive expiry, timeouts and optional HTTP/2 are configurable
+- Connection failures (where the request was never sent) are retried with
+  exponential backoff and full jitter
+- Clients are closed at interpreter exit; code that runs its own event loop
+  closes that loop's client with ``aclose_async_http_client`` before the loop ends
+
+SDKs that take a ``requests`` session instead of an httpx client (the sync
+Tavily client) get a session from ``create_requests_session`` with the same
+pool size and connection retries.
+
+Settings are read from ``DEEP_RESEARCH_HTTP_<SETTING>`` environment variables,
+for example ``DEEP_RESEARCH_HTTP_MAX_CONNECTIONS=200`` or ``DEEP_RESEARCH_HTTP_HTTP2=true``.
+HTTP/2 requires the optional ``h2`` package and is silently disabled without it.
+"""
+
+import asyncio
+import atexit
+import importlib.util
+import os
+import random
+import time
+import weakref
+from dataclasses import dataclass, fields
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+from typing_extensions import Optional
+from urllib3.util.retry import Retry
+
+# ===== CONFIGURATION =====
+
+@dataclass
+class TransportSettings:
+    """Tunable parameters of the shared HTTP clients."""
+    max_connections: int = 100
+    max_keepalive_connections: int = 20
+    keepalive_expiry: float = 30.0
+    http2: bool = False
+    connect_timeout: float = 10.0
+    read_timeout: float = 600.0
+    retries: int = 3
+    backoff_base: float = 0.25
+    backoff_max: float = 8.0
+
+    @classmethod
+    def from_env(cls) -> "TransportSettings":
+        """Read settings from DEEP_RESEARCH_HTTP_<FIELD> environment variables."""
+        values = {}
+        for field in fields(cls):
+            raw = os.getenv(f"DEEP_RESEARCH_HTTP_{field.name.upper()}")
+            if raw is None:
+                continue
+            if field.type in (bool, "bool"):
+                values[field.name] = raw.lower() in ("1", "true", "yes")
+            else:
+                values[field.name] = (int if field.type in (int, "int") else float)(raw)
+        return cls(**values)
+
+    @property
+    def http2_enabled(self) -> bool:
+        """Whether HTTP/2 is requested and the h2 package is available."""
+        return self.http2 and importlib.util.find_spec("h2") is not None
+
+    def limits(self) -> httpx.Limits:
+        """Return the connection pool limits."""
+        return httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive_connections,
+            keepalive_expiry=self.keepalive_expiry,
+        )
+
+    def timeout(self) -> httpx.Timeout:
+        """Per-request timeouts; reads may be long for streaming model responses."""
+        return httpx.Timeout(self.read_timeout, connect=self.connect_timeout, pool=self.connect_timeout)
+
+    def backoff(self, attempt: int) -> float:
+        """Full-jitter exponential backoff delay for a retry attempt (0-based)."""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+settings = TransportSettings.from_env()
+
+# Errors raised before a request reaches the server, so retrying cannot duplicate it
+RETRYABLE_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout)
+
+# ===== TRANSPORTS =====
+
+class RetryTransport(httpx.HTTPTransport):
+    """HTTP transport that retries connection failures with jittered backoff."""
+
+    def __init__(self, transport_settings: TransportSettings):
+        """Create a pooled transport from settings."""
+        super().__init__(limits=transport_settings.limits(), http2=transport_settings.http2_enabled)
+        self.settings = transport_settings
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        """Send a request, retrying when the connection cannot be established."""
+        for attempt in range(self.settings.retries + 1):
+            try:
+                return super().handle_request(request)
+            except RETRYABLE_ERRORS:
+                if attempt == self.settings.retries:
+                    raise
+                time.sleep(self.settings.backoff(attempt))
+
+class AsyncRetryTransport(httpx.AsyncHTTPTransport):
+    """Async HTTP transport that retries connection failures with jittered backoff."""
+
+    def __init__(self, transport_settings: TransportSettings):
+        """Create a pooled async transport from settings."""
+        super().__init__(limits=transport_settings.limits(), http2=transport_settings.http2_enabled)
+        self.settings = transport_settings
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        """Send a request, retrying when the connection cannot be established."""
+        for attempt in range(self.settings.retries + 1):
+            try:
+                return await super().handle_async_request(request)
+            except RETRYABLE_ERRORS:
+                if attempt == self.settings.retries:
+                    raise
+                await asyncio.sleep(self.settings.backoff(attempt))
+
+# ===== SHARED CLIENTS =====
+
+_client: Optional[httpx.Client] = None
+
+# Async connections belong to the event loop that opened them, so the pool is kept per loop
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = weakref.WeakKeyDictionary()
+
+def get_http_client() -> httpx.Client:
+    """Get or create the process-wide pooled HTTP client."""
+    global _client
+    if _client is None:
+        _client = httpx.Client(
+            transport=RetryTransport(settings),
+            timeout=settings.timeout(),
+            follow_redirects=True,
+        )
+    return _client
+
+def get_async_http_client() -> httpx.AsyncClient:
+    """Get or create the pooled async HTTP client of the running event loop."""
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None:
+        client = httpx.AsyncClient(
+            transport=AsyncRetryTransport(settings),
+            timeout=settings.timeout(),
+            follow_redirects=True,
+        )
+        _async_clients[loop] = client
+    return client
+
+class SharedAsyncClient(httpx.AsyncClient):
+    """Async client handle for SDKs that take one client at construction time.
+
+    Model clients are created once per process but may be used from several
+    event loops (e.g. successive asyncio.run calls). Every request is sent
+    through the pool of the loop it runs on.
+    """
+
+    async def send(self, request: httpx.Request, **kwargs) -> httpx.Response:
+        """Send the request through the running loop's shared client."""
+        return await get_async_http_client().send(request, **kwargs)
+
+_shared_async_client: Optional[SharedAsyncClient] = None
+
+def get_shared_async_client() -> SharedAsyncClient:
+    """Get the process-wide async client handle to pass to model SDKs."""
+    global _shared_async_client
+    if _shared_async_client is None:
+        _shared_async_client = SharedAsyncClient(timeout=settings.timeout())
+    return _shared_async_client
+
+def create_requests_session() -> requests.Session:
+    """Create a requests session with the shared pool size and connection retries.
+
+    Each caller gets its own session, because SDKs set their authentication headers
+    on the session they are given. Keep-alive expiry is managed by urllib3.
+    """
+    # Like RetryTransport, only retry requests that never reached the server
+    retries = Retry(connect=settings.retries, read=0, status=0, other=0, backoff_factor=settings.backoff_base)
+    adapter = HTTPAdapter(pool_maxsize=settings.max_keepalive_connections, max_retries=retries)
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+# ===== CLEANUP =====
+
+async def aclose_async_http_client() -> None:
+    """Close the running event loop's pooled client, e.g. before asyncio.run returns."""
+    client = _async_clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+
+def close_http_clients() -> None:
+    """Close the sync client and the async clients of loops that are not running."""
+    global _client
+    if _client is not None:
+        _client.close()
+        _client = None
+    for loop, client in list(_async_clients.items()):
+        # A closed loop cannot run aclose(); its connections die with the process
+        if not loop.is_closed() and not loop.is_running():
+            loop.run_until_complete(client.aclose())
+    _async_clients.clear()
+
+atexit.register(close_http_clients)
@@ -0,0 +1,353 @@
+r"""Load Test Driver for the Research Graphs.
+
+This module reproduces production load locally: it drives many concurrent runs
+of ``research_agent_full`` against a LangGraph server (``langgraph dev`` or
+``langgraph up``) serving langgraph.json, and reports for each concurrency level:
+
+- Throughput: completed runs per second
+- Queueing delay: time from submitting a run until the server starts executing it
+- End-to-end latency: p50, p95 and p99 from submission until the final state
+- Memory: resident memory of the server process, at baseline and at peak, and
+  the peak increase per concurrent run
+
+Runs are closed-loop: at concurrency N, N clients each submit their next run as
+soon as the previous one finishes. Throughput that stops growing while queueing
+delay and latency keep climbing marks the concurrency ceiling of the worker.
+
+Start the server with the fake model and search stand-ins of fake_backends.py so
+that only the system under test is measured:
+
+    DEEP_RESEARCH_FAKE_MODELS=true \
+    DEEP_RESEARCH_FAKE_MODEL_LATENCY=lognormal:1.5,0.6 \
+    DEEP_RESEARCH_FAKE_SEARCH_LATENCY=uniform:0.3,1.2 \
+    langgraph dev --no-browser
+
+    python -m deep_research_from_scratch.load_test --url http://127.0.0.1:2024 \
+        --concurrency 1,4,16,64 --runs 64 --server-pid <pid> -o load.json
+
+Without ``--url`` the graph runs inside the driver process, which measures the
+graph itself without the server; ``--jobs`` then emulates the server's job limit.
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+from typing_extensions import Any, Optional
+
+# ===== CONFIGURATION =====
+
+# Graph under test, as named in langgraph.json
+default_graph = "research_agent_full"
+
+default_query = "Compare the total cost of ownership of heat pumps and gas boilers for a family home in Germany."
+
+# Seconds between resident memory samples
+memory_sample_interval = 0.25
+
+# Relative throughput gain below which an added concurrency level is not worth it
+ceiling_gain = 0.1
+
+# ===== MEASUREMENTS =====
+
+@dataclass
+class RunSample:
+    """Timings of one run, in seconds on the driver's monotonic clock."""
+    submitted_at: float
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    error: Optional[str] = None
+    state_bytes: int = 0
+
+    @property
+    def queue_delay(self) -> Optional[float]:
+        """Time until the run started executing."""
+        return None if self.started_at is None else self.started_at - self.submitted_at
+
+    @property
+    def latency(self) -> Optional[float]:
+        """End-to-end time until the final state arrived."""
+        return None if self.finished_at is None else self.finished_at - self.submitted_at
+
+def percentile(values: list[float], q: float) -> Optional[float]:
+    """Nearest-rank percentile (q between 0 and 1), or None without values."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, math.ceil(q * len(ordered)) - 1))]
+
+def read_rss_bytes(pid: int) -> Optional[int]:
+    """Resident memory of a process from /proc, or None where that is unavailable."""
+    try:
+        with open(f"/proc/{pid}/status", encoding="utf-8") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        return None
+    return None
+
+class MemorySampler:
+    """Sample the resident memory of a process in the background."""
+
+    def __init__(self, pid: Optional[int], interval: float = memory_sample_interval):
+        """Create a sampler for a process id (None disables sampling)."""
+        self.pid = pid
+        self.interval = interval
+        self.baseline: Optional[int] = read_rss_bytes(pid) if pid else None
+        self.peak: Optional[int] = self.baseline
+        self._task: Optional[asyncio.Task] = None
+
+    async def _sample(self) -> None:
+        """Record the peak until cancelled."""
+        while True:
+            rss = read_rss_bytes(self.pid)
+            if rss is not None:
+                self.peak = max(self.peak or 0, rss)
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> None:
+        """Start sampling."""
+        if self.baseline is not None:
+            self._task = asyncio.create_task(self._sample())
+
+    async def stop(self) -> None:
+        """Stop sampling."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+# ===== TARGETS =====
+
+class ServerTarget:
+    """Runs a graph on a LangGraph server as stateless runs."""
+
+    def __init__(self, url: str, graph: str = default_graph):
+        """Connect to a server URL."""
+        from langgraph_sdk import get_client
+        self.client = get_client(url=url)
+        self.graph = graph
+
+    async def run(self, graph_input: dict, config: dict, sample: RunSample) -> None:
+        """Stream one run; its first state update marks the start of execution."""
+        final_state = None
+        async for part in self.client.runs.stream(
+            None, self.graph, input=graph_input, config=config, stream_mode="values"
+        ):
+            if part.event == "error":
+                raise RuntimeError(f"{part.data.get('error', 'Error')}: {part.data.get('message', '')}")
+            if part.event == "values":
+                if sample.started_at is None:
+                    sample.started_at = time.monotonic()
+                final_state = part.data
+        sample.state_bytes = len(json.dumps(final_state, default=str)) if final_state else 0
+
+class InProcessTarget:
+    """Runs a graph inside the driver process, optionally limited to a number of concurrent jobs."""
+
+    def __init__(self, graph: str = default_graph, jobs: Optional[int] = None):
+        """Load the compiled graph."""
+        from deep_research_from_scratch.batch_research import get_graph
+        self.graph = get_graph(graph)
+        self._jobs = asyncio.Semaphore(jobs) if jobs else None
+
+    async def _stream(self, graph_input: dict, config: dict, sample: RunSample) -> None:
+        """Stream one run; its first state update marks the start of execution."""
+        final_state = None
+        async for state in self.graph.astream(graph_input, config, stream_mode="values"):
+            if sample.started_at is None:
+                sample.started_at = time.monotonic()
+            final_state = state
+        sample.state_bytes = len(json.dumps(final_state, default=str)) if final_state else 0
+
+    async def run(self, graph_input: dict, config: dict, sample: RunSample) -> None:
+        """Run the graph, waiting for a free job slot first when jobs are limited."""
+        if self._jobs is None:
+            return await self._stream(graph_input, config, sample)
+        async with self._jobs:
+            await self._stream(graph_input, config, sample)
+
+# ===== LOAD GENERATION =====
+
+def build_input(query: str, index: int) -> dict:
+    """Graph input for one run; every run gets a distinct question so nothing is served from caches."""
+    return {"messages": [{"role": "user", "content": f"{query} (load test run {index})"}]}
+
+async def run_level(
+    target: Any,
+    concurrency: int,
+    runs: int,
+    query: str = default_query,
+    config: Optional[dict] = None,
+    server_pid: Optional[int] = None,
+) -> dict:
+    """Run a closed-loop load level and summarize it.
+
+    Args:
+        target: ServerTarget or InProcessTarget
+        concurrency: Number of clients, each with one run in flight
+        runs: Total number of runs at this level
+        query: Research question the runs are based on
+        config: RunnableConfig sent with every run
+        server_pid: Process whose memory is sampled
+
+    Returns:
+        Level report with throughput, queueing delay, latency percentiles and memory
+    """
+    samples: list[RunSample] = []
+    next_index = iter(range(runs))
+    memory = MemorySampler(server_pid)
+
+    async def client() -> None:
+        for index in next_index:
+            sample = RunSample(submitted_at=time.monotonic())
+            samples.append(sample)
+            try:
+                await target.run(build_input(query, index), config or {}, sample)
+            except Exception as e:
+                sample.error = f"{type(e).__name__}: {e}"
+            sample.finished_at = time.monotonic()
+
+    memory.start()
+    start = time.monotonic()
+    await asyncio.gather(*[client() for _ in range(concurrency)])
+    duration = time.monotonic() - start
+    await memory.stop()
+    return summarize_level(concurrency, samples, duration, memory)
+
+def summarize_level(concurrency: int, samples: list[RunSample], duration: float, memory: MemorySampler) -> dict:
+    """Aggregate run samples into a level report (times in seconds, memory in MB)."""
+    succeeded = [sample for sample in samples if sample.error is None]
+    latencies = [sample.latency for sample in succeeded]
+    delays = [sample.queue_delay for sample in succeeded if sample.queue_delay is not None]
+
+    def rounded(value: Optional[float], digits: int = 3) -> Optional[float]:
+        return None if value is None else round(value, digits)
+
+    in_flight = min(concurrency, len(samples)) or 1
+    mb = 1024 * 1024
+    growth = memory.peak - memory.baseline if memory.baseline is not None else None
+    return {
+        "concurrency": concurrency,
+        "runs": len(samples),
+        "errors": len(samples) - len(succeeded),
+        "duration_s": round(duration, 3),
+        "throughput_rps": round(len(succeeded) / duration, 4) if duration else 0.0,
+        **{f"queue_delay_p{q}_s": rounded(percentile(delays, q / 100)) for q in (50, 95, 99)},
+        **{f"latency_p{q}_s": rounded(percentile(latencies, q / 100)) for q in (50, 95, 99)},
+        "rss_baseline_mb": rounded(memory.baseline / mb if memory.baseline is not None else None, 1),
+        "rss_peak_mb": rounded(memory.peak / mb if memory.peak is not None else None, 1),
+        "memory_per_run_mb": rounded(growth / mb / in_flight if growth is not None else None, 2),
+        "state_kb_mean": round(sum(s.state_bytes for s in succeeded) / len(succeeded) / 1024, 1) if succeeded else 0.0,
+        "error_samples": sorted({sample.error for sample in samples if sample.error})[:3],
+    }
+
+def find_ceiling(levels: list[dict]) -> Optional[int]:
+    """Highest concurrency level whose throughput still improved on the previous level by ceiling_gain."""
+    ceiling = None
+    best = 0.0
+    for level in sorted(levels, key=lambda level: level["concurrency"]):
+        if level["errors"] == level["runs"]:
+            break
+        if ceiling is None or level["throughput_rps"] >= best * (1 + ceiling_gain):
+            ceiling = level["concurrency"]
+        best = max(best, level["throughput_rps"])
+    return ceiling
+
+async def run_load_test(
+    target: Any,
+    concurrency_levels: list[int],
+    runs: Optional[int] = None,
+    query: str = default_query,
+    config: Optional[dict] = None,
+    server_pid: Optional[int] = None,
+) -> dict:
+    """Run every concurrency level in turn and report the levels and the concurrency ceiling.
+
+    Args:
+        target: ServerTarget or InProcessTarget
+        concurrency_levels: Concurrency levels to run, in order
+        runs: Runs per level (default: four times the concurrency)
+        query: Research question the runs are based on
+        config: RunnableConfig sent with every run
+        server_pid: Process whose memory is sampled
+
+    Returns:
+        {"levels": [...], "ceiling": concurrency or None}
+    """
+    levels = []
+    for concurrency in concurrency_levels:
+        levels.append(await run_level(
+            target, concurrency, runs or 4 * concurrency, query=query, config=config, server_pid=server_pid
+        ))
+    return {"levels": levels, "ceiling": find_ceiling(levels)}
+
+def format_report(report: dict) -> str:
+    """Render a load test report as a fixed-width table."""
+    columns = [
+        ("conc", "concurrency"), ("runs", "runs"), ("err", "errors"), ("rps", "throughput_rps"),
+        ("queue p50", "queue_delay_p50_s"), ("queue p95", "queue_delay_p95_s"),
+        ("p50", "latency_p50_s"), ("p95", "latency_p95_s"), ("p99", "latency_p99_s"),
+        ("rss peak MB", "rss_peak_mb"), ("MB/run", "memory_per_run_mb"),
+    ]
+    rows = [[title for title, _ in columns]]
+    rows += [["-" if level[key] is None else str(level[key]) for _, key in columns] for level in report["levels"]]
+    widths = [max(len(row[i]) for row in rows) for i in range(len(columns))]
+    lines = ["  ".join(cell.rjust(width) for cell, width in zip(row, widths)) for row in rows]
+    lines.append(f"Concurrency ceiling: {report['ceiling'] if report['ceiling'] is not None else 'not reached'}")
+    return "\n".join(lines)
+
+# ===== COMMAND LINE =====
+
+def main() -> None:
+    """Run a load test from the command line."""
+    parser = argparse.ArgumentParser(description="Drive concurrent research runs and report throughput, latency and memory.")
+    parser.add_argument("--url", help="LangGraph server URL; without it the graph runs in this process")
+    parser.add_argument("--graph", default=default_graph, help="Graph name from langgraph.json")
+    parser.add_argument("--concurrency", default="1,2,4,8,16", help="Comma-separated concurrency levels")
+    parser.add_argument("--runs", type=int, help="Runs per level (default: four times the concurrency)")
+    parser.add_argument("--query", default=default_query, help="Research question the runs are based on")
+    parser.add_argument("--search-provider", default="fake", choices=["fake", "local", "tavily"])
+    parser.add_argument("--config", help="JSON object merged into the configurable of every run")
+    parser.add_argument("--server-pid", type=int, help="Server process to sample memory of (in-process: this process)")
+    parser.add_argument("--jobs", type=int, help="In-process only: maximum graph runs executing at once")
+    parser.add_argument("-o", "--output", help="JSON file to write the report to")
+    args = parser.parse_args()
+
+    configurable = {"search_provider": args.search_provider, **(json.loads(args.config) if args.config else {})}
+    if args.url:
+        target, pid = ServerTarget(args.url, args.graph), args.server_pid
+    else:
+        target, pid = InProcessTarget(args.graph, args.jobs), args.server_pid or os.getpid()
+
+    async def run() -> dict:
+        from deep_research_from_scratch.http_transport import aclose_async_http_client
+
+        try:
+            return await run_load_test(
+                target,
+                [int(level) for level in args.concurrency.split(",") if level.strip()],
+                runs=args.runs,
+                query=args.query,
+                config={"configurable": configurable},
+                server_pid=pid,
+            )
+        finally:
+            await aclose_async_http_client()
+
+    report = asyncio.run(run())
+    report["settings"] = {**vars(args), "configurable": configurable}
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2), encoding="utf-8")
+    print(format_report(report))  # noqa: T201
+
+if __name__ == "__main__":
+    main()
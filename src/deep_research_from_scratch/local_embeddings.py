@@ -0,0 +1,118 @@
+"""Local Text Embeddings.
+
+This module provides embeddings that run entirely on the local machine, for
+retrieval and similarity lookups that should not call a hosted embedding API.
+
+Two embedders are available:
+- SentenceTransformerEmbedder: semantic embeddings from a sentence-transformers
+  model, used when the optional ``sentence-transformers`` package is installed
+- HashingEmbedder: dependency-free feature-hashed bag of words, used as a
+  lexical fallback when no semantic model is available
+"""
+
+import hashlib
+import logging
+import math
+import os
+import re
+
+from typing_extensions import List, Optional, Protocol
+
+# ===== CONFIGURATION =====
+
+# Model used by SentenceTransformerEmbedder unless overridden by the environment
+default_embedding_model = os.getenv(
+    "DEEP_RESEARCH_EMBEDDING_MODEL", "sentence-transformers/all-MiniLM-L6-v2"
+)
+
+# Dimension of HashingEmbedder vectors
+hashing_dimensions = 1024
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+logger = logging.getLogger(__name__)
+
+class Embedder(Protocol):
+    """Anything that turns texts into fixed-size vectors."""
+
+    name: str
+
+    def embed(self, texts: List[str]) -> List[List[float]]:
+        """Embed a batch of texts."""
+        ...
+
+# ===== EMBEDDERS =====
+
+class SentenceTransformerEmbedder:
+    """Semantic embeddings from a local sentence-transformers model."""
+
+    def __init__(self, model_name: str = default_embedding_model):
+        """Load the model. Raises ImportError if sentence-transformers is not installed."""
+        from sentence_transformers import SentenceTransformer
+
+        self.name = f"sentence-transformers:{model_name}"
+        self._model = SentenceTransformer(model_name)
+
+    def embed(self, texts: List[str]) -> List[List[float]]:
+        """Embed texts as L2-normalized vectors."""
+        vectors = self._model.encode(texts, normalize_embeddings=True, show_progress_bar=False)
+        return [vector.tolist() for vector in vectors]
+
+class HashingEmbedder:
+    """Feature-hashed unigram and bigram counts, L2-normalized.
+
+    Captures lexical overlap only, but needs no model download or extra packages.
+    """
+
+    def __init__(self, dimensions: int = hashing_dimensions):
+        """Create an embedder producing vectors of the given dimension."""
+        self.name = f"hashing:{dimensions}"
+        self.dimensions = dimensions
+
+    def _bucket(self, feature: str) -> int:
+        """Map a feature to a stable bucket, independent of PYTHONHASHSEED."""
+        return int.from_bytes(hashlib.blake2b(feature.encode(), digest_size=8).digest(), "little") % self.dimensions
+
+    def embed(self, texts: List[str]) -> List[List[float]]:
+        """Embed texts as L2-normalized hashed feature vectors."""
+        vectors = []
+        for text in texts:
+            tokens = TOKEN_PATTERN.findall(text.lower())
+            vector = [0.0] * self.dimensions
+            for feature in tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]:
+                vector[self._bucket(feature)] += 1.0
+            norm = math.sqrt(sum(v * v for v in vector)) or 1.0
+            vectors.append([v / norm for v in vector])
+        return vectors
+
+# ===== HELPER FUNCTIONS =====
+
+def cosine_similarity(a: List[float], b: List[float]) -> float:
+    """Cosine similarity of two vectors."""
+    dot = sum(x * y for x, y in zip(a, b))
+    norm = math.sqrt(sum(x * x for x in a)) * math.sqrt(sum(y * y for y in b))
+    return dot / norm if norm else 0.0
+
+_semantic_embedder: Optional[SentenceTransformerEmbedder] = None
+_semantic_unavailable = False
+
+def get_semantic_embedder() -> Optional[SentenceTransformerEmbedder]:
+    """Return the shared sentence-transformers embedder, or None if it is not installed or cannot be loaded.
+
+    Besides a missing package, loading fails when the model cannot be downloaded
+    (offline machines) or its files are corrupt; callers then fall back to lexical ranking.
+    """
+    global _semantic_embedder, _semantic_unavailable
+    if _semantic_embedder is None and not _semantic_unavailable:
+        try:
+            _semantic_embedder = SentenceTransformerEmbedder()
+        except ImportError:
+            _semantic_unavailable = True
+        except Exception as e:
+            logger.warning("Could not load embedding model %s, using lexical ranking: %r", default_embedding_model, e)
+            _semantic_unavailable = True
+    return _semantic_embedder
+
+def get_local_embedder() -> Embedder:
+    """Return the best available local embedder, falling back to HashingEmbedder."""
+    return get_semantic_embedder() or HashingEmbedder()
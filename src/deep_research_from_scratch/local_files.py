@@ -0,0 +1,253 @@
+"""Streaming Reader for Large Local Research Files.
+
+This module provides file tools that serve large local documents in small
+windows instead of returning whole files as a single tool message. Files are
+memory-mapped, so only the pages that are actually read are loaded, and a
+document of many megabytes can be explored by byte offset, by line number or
+by grep-style search without ever holding it fully in memory or in the prompt.
+
+All paths are resolved inside the research ``files/`` directory.
+"""
+
+import mmap
+import re
+import threading
+from array import array
+from pathlib import Path
+
+from langchain_core.tools import InjectedToolArg, tool
+from typing_extensions import Annotated, Optional
+
+# ===== CONFIGURATION =====
+
+# Directory the tools are allowed to read from
+documents_dir = Path(__file__).resolve().parent / "files"
+
+# Upper bounds that keep a single tool response small
+max_window_bytes = 64 * 1024
+max_lines_per_read = 400
+max_line_chars = 1000
+
+# Number of documents whose line offset tables are kept between tool calls
+line_offset_cache_size = 32
+
+# ===== FILE ACCESS =====
+
+# Line offset tables by path, with the mtime and size they were built for. Paging
+# through a document calls the tools many times; each call maps the file anew.
+_line_offset_cache: dict[Path, tuple[int, int, array]] = {}
+_line_offset_lock = threading.Lock()
+
+def resolve_document_path(path: str) -> Path:
+    """Resolve a user-supplied path inside documents_dir.
+
+    Raises:
+        ValueError: If the path escapes documents_dir or is not a file
+    """
+    root = documents_dir.resolve()
+    candidate = (root / path).resolve()
+    if candidate != root and root not in candidate.parents:
+        raise ValueError(f"Access denied: {path} is outside the research files directory")
+    if not candidate.is_file():
+        raise ValueError(f"File not found: {path}")
+    return candidate
+
+class MappedDocument:
+    """Read-only memory map of a file with a lazily built, cached line offset table."""
+
+    def __init__(self, path: Path):
+        """Memory-map a file for reading."""
+        self.path = path
+        stat = path.stat()
+        self.size = stat.st_size
+        self._mtime_ns = stat.st_mtime_ns
+        self._file = open(path, "rb")
+        # mmap cannot map empty files
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if self.size else b""
+        self._line_offsets: Optional[array] = None
+
+    def close(self) -> None:
+        """Release the memory map and file handle."""
+        if isinstance(self._map, mmap.mmap):
+            self._map.close()
+        self._file.close()
+
+    def __enter__(self) -> "MappedDocument":
+        """Enter the context manager."""
+        return self
+
+    def __exit__(self, *exc) -> None:
+        """Close the document on exit."""
+        self.close()
+
+    @property
+    def line_offsets(self) -> array:
+        """Byte offset of the start of every line, reused while the file's mtime and size are unchanged."""
+        if self._line_offsets is None:
+            with _line_offset_lock:
+                cached = _line_offset_cache.get(self.path)
+            if cached is not None and cached[:2] == (self._mtime_ns, self.size):
+                self._line_offsets = cached[2]
+                return self._line_offsets
+
+            offsets = array("Q", [0])
+            position = self._map.find(b"\n")
+            while position != -1:
+                if position + 1 < self.size:
+                    offsets.append(position + 1)
+                position = self._map.find(b"\n", position + 1)
+            self._line_offsets = offsets
+            with _line_offset_lock:
+                _line_offset_cache.pop(self.path, None)
+                _line_offset_cache[self.path] = (self._mtime_ns, self.size, offsets)
+                while len(_line_offset_cache) > line_offset_cache_size:
+                    # Evict the least recently built table
+                    del _line_offset_cache[next(iter(_line_offset_cache))]
+        return self._line_offsets
+
+    @property
+    def line_count(self) -> int:
+        """Number of lines in the document."""
+        return len(self.line_offsets) if self.size else 0
+
+    def read_bytes(self, offset: int, length: int) -> str:
+        """Decode a byte range, replacing characters split at the window edges."""
+        return self._map[offset:offset + length].decode("utf-8", errors="replace")
+
+    def read_lines(self, start_line: int, num_lines: int) -> list[str]:
+        """Return lines [start_line, start_line + num_lines) using 1-based numbering."""
+        offsets = self.line_offsets
+        first = start_line - 1
+        last = min(first + num_lines, len(offsets))
+        if first >= last:
+            return []
+        end = offsets[last] if last < len(offsets) else self.size
+        text = self._map[offsets[first]:end].decode("utf-8", errors="replace")
+        return text.splitlines()
+
+    def line_number_at(self, offset: int) -> int:
+        """Return the 1-based line number containing a byte offset."""
+        offsets = self.line_offsets
+        low, high = 0, len(offsets) - 1
+        while low < high:
+            middle = (low + high + 1) // 2
+            if offsets[middle] <= offset:
+                low = middle
+            else:
+                high = middle - 1
+        return low + 1
+
+    def finditer(self, pattern: re.Pattern):
+        """Iterate regex matches over the mapped bytes."""
+        return pattern.finditer(self._map)
+
+def truncate_line(line: str) -> str:
+    """Shorten very long lines so one line cannot flood the response."""
+    return line if len(line) <= max_line_chars else line[:max_line_chars] + " [...]"
+
+# ===== RESEARCH TOOLS =====
+
+@tool(parse_docstring=True)
+def read_document_window(
+    path: str,
+    offset: int = 0,
+    length: int = 8192,
+) -> str:
+    """Read a byte range of a large local document without loading the whole file.
+
+    Use this to page through big documents. The response header reports the total file size
+    so you can request the next window.
+
+    Args:
+        path: File path relative to the research files directory
+        offset: Byte offset to start reading from
+        length: Number of bytes to read (at most 65536)
+
+    Returns:
+        The requested window of text with its byte range and the total file size
+    """
+    try:
+        with MappedDocument(resolve_document_path(path)) as document:
+            offset = max(0, min(offset, document.size))
+            length = max(0, min(length, max_window_bytes))
+            text = document.read_bytes(offset, length)
+            end = min(offset + length, document.size)
+            return f"[{path}: bytes {offset}-{end} of {document.size}]\n{text}"
+    except (OSError, ValueError) as e:
+        return f"Error: {e}"
+
+@tool(parse_docstring=True)
+def read_document_lines(
+    path: str,
+    start_line: int = 1,
+    num_lines: int = 100,
+) -> str:
+    """Read a range of lines from a large local document, with line numbers.
+
+    Args:
+        path: File path relative to the research files directory
+        start_line: First line to read (1-based)
+        num_lines: Number of lines to read (at most 400)
+
+    Returns:
+        Numbered lines with the total line count of the document
+    """
+    try:
+        with MappedDocument(resolve_document_path(path)) as document:
+            start_line = max(1, start_line)
+            num_lines = max(1, min(num_lines, max_lines_per_read))
+            if start_line > document.line_count:
+                return f"[{path}: line {start_line} is past the end of the file ({document.line_count} lines)]"
+            lines = document.read_lines(start_line, num_lines)
+            end_line = start_line + len(lines) - 1
+            header = f"[{path}: lines {start_line}-{end_line} of {document.line_count}]"
+            body = "\n".join(f"{start_line + i}: {truncate_line(line)}" for i, line in enumerate(lines))
+            return f"{header}\n{body}"
+    except (OSError, ValueError) as e:
+        return f"Error: {e}"
+
+@tool(parse_docstring=True)
+def grep_document(
+    path: str,
+    pattern: str,
+    ignore_case: bool = True,
+    max_matches: Annotated[int, InjectedToolArg] = 30,
+) -> str:
+    """Search a local document for a regular expression and return matching lines with line numbers.
+
+    Use the line numbers with read_document_lines to read the surrounding context.
+
+    Args:
+        path: File path relative to the research files directory
+        pattern: Regular expression (or plain text) to search for
+        ignore_case: Whether matching ignores case
+        max_matches: Maximum number of matching lines to return
+
+    Returns:
+        Matching lines prefixed by their line numbers
+    """
+    try:
+        regex = re.compile(pattern.encode("utf-8"), re.IGNORECASE if ignore_case else 0)
+    except re.error as e:
+        return f"Error: invalid pattern: {e}"
+
+    try:
+        with MappedDocument(resolve_document_path(path)) as document:
+            results = []
+            last_line = 0
+            for match in document.finditer(regex):
+                line_number = document.line_number_at(match.start())
+                # Report each line once even if it matches several times
+                if line_number == last_line:
+                    continue
+                last_line = line_number
+                line = document.read_lines(line_number, 1)
+                results.append(f"{line_number}: {truncate_line(line[0] if line else '')}")
+                if len(results) >= max_matches:
+                    results.append(f"[stopped after {max_matches} matching lines]")
+                    break
+            if not results:
+                return f"No matches for '{pattern}' in {path}"
+            return f"[{path}: {document.line_count} lines]\n" + "\n".join(results)
+    except (OSError, ValueError) as e:
+        return f"Error: {e}"
@@ -0,0 +1,344 @@
+"""Local Document Index.
+
+This module indexes a directory of local research documents once and serves
+ranked passages for a query, so an agent can answer questions about a large
+local corpus in a single tool call instead of listing, opening and scanning
+files turn by turn.
+
+Key features:
+- Paragraph-aware chunking with line numbers for citation
+- BM25 lexical ranking, optionally blended with local semantic embeddings
+- On-disk persistence with incremental updates when a file's mtime or size changes
+"""
+
+import asyncio
+import hashlib
+import html
+import json
+import math
+import os
+import re
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+
+from langchain_core.tools import InjectedToolArg, StructuredTool
+from typing_extensions import Annotated, List, Optional
+
+from deep_research_from_scratch.local_embeddings import (
+    cosine_similarity,
+    get_semantic_embedder,
+)
+from deep_research_from_scratch.storage_dirs import user_cache_dir
+
+# ===== CONFIGURATION =====
+
+# File types that are indexed
+indexed_suffixes = {".md", ".markdown", ".txt", ".rst", ".html", ".htm", ".csv", ".json"}
+
+# Target chunk size in words
+chunk_words = 200
+
+# Minimum seconds between directory scans for changed files
+refresh_interval_seconds = 5.0
+
+# Weight of the embedding similarity when blending with BM25 (0 disables blending)
+embedding_weight = 0.5
+
+# Directory for saved indexes, in the per-user cache directory unless overridden by the environment
+default_index_dir = Path(os.getenv("DEEP_RESEARCH_LOCAL_INDEX_DIR", user_cache_dir() / "local_index"))
+
+INDEX_VERSION = 1
+
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "has", "in", "is", "it",
+    "its", "of", "on", "or", "that", "the", "this", "to", "was", "were", "with",
+}
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+HTML_TAG_PATTERN = re.compile(r"<(script|style)[^>]*>.*?</\1>|<[^>]+>", re.DOTALL | re.IGNORECASE)
+
+# ===== TEXT PROCESSING =====
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase and split text into alphanumeric terms, dropping stopwords."""
+    return [token for token in TOKEN_PATTERN.findall(text.lower()) if token not in STOPWORDS]
+
+def html_to_text(content: str) -> str:
+    """Strip tags, scripts and styles from HTML and unescape entities."""
+    return html.unescape(HTML_TAG_PATTERN.sub(" ", content))
+
+def chunk_text(text: str, max_words: int = chunk_words) -> List[dict]:
+    """Split text into passages of roughly max_words, preferring paragraph breaks.
+
+    Returns:
+        List of dicts with text, start_line and end_line (1-based, inclusive)
+    """
+    chunks = []
+    current: List[str] = []
+    current_words = 0
+    start_line = 1
+
+    def flush(end_line: int) -> None:
+        nonlocal current, current_words
+        passage = "\n".join(current).strip()
+        if passage:
+            chunks.append({"text": passage, "start_line": start_line, "end_line": end_line})
+        current, current_words = [], 0
+
+    for line_number, line in enumerate(text.splitlines(), 1):
+        words = len(line.split())
+        # Close the chunk at a paragraph break once it is large enough, or when it would overflow
+        if current and ((not line.strip() and current_words >= max_words // 2) or current_words + words > max_words):
+            flush(line_number - 1)
+            start_line = line_number
+        if not current:
+            start_line = line_number
+        current.append(line)
+        current_words += words
+    flush(start_line + len(current) - 1)
+    return chunks
+
+# ===== RANKING =====
+
+class BM25:
+    """Okapi BM25 over pre-tokenized documents given as term-frequency maps."""
+
+    def __init__(self, documents: List[dict], k1: float = 1.5, b: float = 0.75):
+        """Build collection statistics for the given term-frequency maps."""
+        self.documents = documents
+        self.k1 = k1
+        self.b = b
+        self.lengths = [sum(tf.values()) for tf in documents]
+        self.avgdl = (sum(self.lengths) / len(self.lengths)) if documents else 0.0
+        self.document_frequency = Counter()
+        for tf in documents:
+            self.document_frequency.update(tf.keys())
+
+    def idf(self, term: str) -> float:
+        """Inverse document frequency with the usual +1 smoothing."""
+        n = len(self.documents)
+        df = self.document_frequency.get(term, 0)
+        return math.log(1 + (n - df + 0.5) / (df + 0.5))
+
+    def scores(self, query_terms: List[str]) -> List[float]:
+        """Score every document against the query terms."""
+        results = []
+        for tf, length in zip(self.documents, self.lengths):
+            score = 0.0
+            for term in query_terms:
+                freq = tf.get(term, 0)
+                if freq:
+                    denominator = freq + self.k1 * (1 - self.b + self.b * length / (self.avgdl or 1.0))
+                    score += self.idf(term) * freq * (self.k1 + 1) / denominator
+            results.append(score)
+        return results
+
+# ===== DOCUMENT INDEX =====
+
+class LocalDocumentIndex:
+    """Persistent, incrementally updated passage index over a directory of documents."""
+
+    def __init__(self, corpus_dir: Path, index_path: Optional[Path] = None, use_embeddings: bool = True):
+        """Open (or create) the index for a corpus directory.
+
+        Args:
+            corpus_dir: Directory whose documents are indexed, recursively
+            index_path: JSON file the index is stored in; defaults to a file named
+                after the corpus directory (and a hash of its path) in default_index_dir
+            use_embeddings: Blend in local semantic embeddings when sentence-transformers is installed
+        """
+        self.corpus_dir = Path(corpus_dir).resolve()
+        if index_path is None:
+            path_hash = hashlib.sha1(str(self.corpus_dir).encode("utf-8")).hexdigest()[:12]
+            index_path = default_index_dir / f"{self.corpus_dir.name}-{path_hash}.json"
+        self.index_path = Path(index_path)
+        self.embedder = get_semantic_embedder() if use_embeddings else None
+        self.files: dict[str, dict] = {}
+        self._bm25: Optional[BM25] = None
+        self._passages: List[dict] = []
+        self._last_refresh = 0.0
+        self._load()
+
+    def _load(self) -> None:
+        """Load a previously saved index if it matches the current format and embedder."""
+        if not self.index_path.exists():
+            return
+        try:
+            data = json.loads(self.index_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        embedder_name = self.embedder.name if self.embedder else None
+        if data.get("version") == INDEX_VERSION and data.get("embedder") == embedder_name:
+            self.files = data.get("files", {})
+
+    def _save(self) -> None:
+        """Write the index to disk atomically."""
+        self.index_path.parent.mkdir(parents=True, exist_ok=True)
+        data = {
+            "version": INDEX_VERSION,
+            "embedder": self.embedder.name if self.embedder else None,
+            "files": self.files,
+        }
+        tmp_path = self.index_path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(data), encoding="utf-8")
+        os.replace(tmp_path, self.index_path)
+
+    def _read_document(self, path: Path) -> str:
+        """Read a document as plain text."""
+        content = path.read_text(encoding="utf-8", errors="replace")
+        if path.suffix.lower() in (".html", ".htm"):
+            content = html_to_text(content)
+        return content
+
+    def _index_file(self, path: Path, stat: os.stat_result) -> dict:
+        """Chunk and tokenize one file."""
+        chunks = chunk_text(self._read_document(path))
+        for chunk in chunks:
+            chunk["tf"] = dict(Counter(tokenize(chunk["text"])))
+        if self.embedder and chunks:
+            for chunk, embedding in zip(chunks, self.embedder.embed([c["text"] for c in chunks])):
+                chunk["embedding"] = embedding
+        return {"mtime": stat.st_mtime, "size": stat.st_size, "chunks": chunks}
+
+    def refresh(self, force: bool = False) -> bool:
+        """Re-index files that were added, changed or removed since the last scan.
+
+        Args:
+            force: Scan even if the last scan was within refresh_interval_seconds
+
+        Returns:
+            Whether the index changed
+        """
+        if not force and time.monotonic() - self._last_refresh < refresh_interval_seconds:
+            return False
+        self._last_refresh = time.monotonic()
+
+        changed = False
+        seen = set()
+        for path in sorted(self.corpus_dir.rglob("*")):
+            relative = path.relative_to(self.corpus_dir)
+            if not path.is_file() or path.suffix.lower() not in indexed_suffixes:
+                continue
+            if any(part.startswith(".") for part in relative.parts):
+                continue
+            key = relative.as_posix()
+            seen.add(key)
+            stat = path.stat()
+            entry = self.files.get(key)
+            if entry and entry["mtime"] == stat.st_mtime and entry["size"] == stat.st_size:
+                continue
+            self.files[key] = self._index_file(path, stat)
+            changed = True
+
+        for key in set(self.files) - seen:
+            del self.files[key]
+            changed = True
+
+        if changed or self._bm25 is None:
+            self._passages = [
+                dict(chunk, path=key) for key, entry in sorted(self.files.items()) for chunk in entry["chunks"]
+            ]
+            self._bm25 = BM25([passage["tf"] for passage in self._passages])
+        if changed:
+            self._save()
+        return changed
+
+    def search(self, query: str, max_results: int = 5) -> List[dict]:
+        """Return the passages most relevant to a query.
+
+        Args:
+            query: Natural language or keyword query
+            max_results: Maximum number of passages to return
+
+        Returns:
+            List of dicts with path, start_line, end_line, score and text, best first
+        """
+        self.refresh()
+        if not self._passages:
+            return []
+
+        scores = self._bm25.scores(tokenize(query))
+        if self.embedder and embedding_weight > 0:
+            # Normalize BM25 to [0, 1] so it can be blended with cosine similarity
+            top = max(scores) or 1.0
+            query_embedding = self.embedder.embed([query])[0]
+            scores = [
+                (1 - embedding_weight) * score / top
+                + embedding_weight * cosine_similarity(query_embedding, passage.get("embedding", []))
+                for score, passage in zip(scores, self._passages)
+            ]
+
+        ranked = sorted(zip(scores, self._passages), key=lambda item: item[0], reverse=True)
+        return [
+            {
+                "path": passage["path"],
+                "start_line": passage["start_line"],
+                "end_line": passage["end_line"],
+                "score": round(score, 4),
+                "text": passage["text"],
+            }
+            for score, passage in ranked[:max_results]
+            if score > 0
+        ]
+
+def format_passages(passages: List[dict]) -> str:
+    """Format ranked passages for a tool response."""
+    if not passages:
+        return "No matching passages found in local documents. Try different keywords."
+    return "\n".join(
+        f"\n--- PASSAGE {i}: {p['path']} (lines {p['start_line']}-{p['end_line']}, score {p['score']}) ---\n{p['text']}\n"
+        for i, p in enumerate(passages, 1)
+    )
+
+# Global index - created lazily on first search. Searches may run in worker
+# threads (see aquery_local_documents and the local search provider), so index
+# access is serialized.
+_index: Optional[LocalDocumentIndex] = None
+_index_lock = threading.Lock()
+
+def get_document_index() -> LocalDocumentIndex:
+    """Get or create the index over the research documents in ``files/``."""
+    global _index
+    if _index is None:
+        _index = LocalDocumentIndex(Path(__file__).resolve().parent / "files")
+    return _index
+
+# ===== RESEARCH TOOLS =====
+
+def query_local_documents(
+    query: str,
+    max_results: Annotated[int, InjectedToolArg] = 5,
+) -> str:
+    """Search the local research documents and return the most relevant passages.
+
+    Passages are ranked across all local files at once, with their file path and line range.
+
+    Args:
+        query: Keywords or a question describing the information you need
+        max_results: Maximum number of passages to return
+
+    Returns:
+        Ranked passages with file path and line numbers
+    """
+    with _index_lock:
+        return format_passages(get_document_index().search(query, max_results=max_results))
+
+async def aquery_local_documents(
+    query: str,
+    max_results: Annotated[int, InjectedToolArg] = 5,
+) -> str:
+    """Async counterpart of query_local_documents.
+
+    Building or refreshing the index and embedding passages are CPU- and disk-bound,
+    so they run in a worker thread instead of blocking the event loop.
+    """
+    return await asyncio.to_thread(query_local_documents, query, max_results)
+
+search_local_documents = StructuredTool.from_function(
+    func=query_local_documents,
+    coroutine=aquery_local_documents,
+    name="search_local_documents",
+    parse_docstring=True,
+)
@@ -0,0 +1,213 @@
+"""Memory Accounting and Per-Run Memory Budget.
+
+Long supervisor runs keep every supervisor and researcher message, note and raw
+note in graph state, and a worker holds that state for every concurrent run.
+This module measures that memory and keeps it bounded:
+
+- State accounting: after each supervisor and researcher step the approximate
+  size of the graph state is published as a ``state_measured`` progress event,
+  broken down by field. The state is only walked when a budget is set or the
+  events have a consumer (a progress sink, or a run streamed with subgraphs)
+- Allocation accounting: with ``DEEP_RESEARCH_TRACEMALLOC=true``, each phase
+  (research, researcher tools, compression, report writing) takes tracemalloc
+  snapshots and publishes a ``memory_phase`` event with the memory it allocated
+  and its top allocation sites. tracemalloc is process-wide and slows Python
+  down noticeably, so this is meant for profiling sessions, and phases of
+  concurrent runs are attributed to whichever phase is measuring.
+- Budget: when a state grows beyond ``memory_budget_mb``, large tool messages are
+  compacted and notes are spilled to the blob store (see compact_messages.py and
+  blob_store.py), and a ``memory_budget_exceeded`` event is published. Prompts
+  still see the full text, because compacted messages are expanded when prompts
+  are built.
+
+Sizes are estimates of the text held in state (characters of message content,
+tool call arguments and artifacts), not exact Python object sizes.
+"""
+
+import json
+import logging
+import os
+import tracemalloc
+from contextlib import contextmanager
+
+from langchain_core.messages import BaseMessage, ToolMessage
+from typing_extensions import Any, Iterator, Mapping, Optional, Sequence
+
+from deep_research_from_scratch.blob_store import is_blob_ref, spill_text
+from deep_research_from_scratch.compact_messages import compact_tool_message, is_compact
+from deep_research_from_scratch.configuration import Configuration
+from deep_research_from_scratch.progress_events import (
+    emit_progress,
+    progress_consumers_active,
+)
+
+logger = logging.getLogger(__name__)
+
+# ===== CONFIGURATION =====
+
+# Take tracemalloc snapshots around each phase
+tracemalloc_enabled = os.getenv("DEEP_RESEARCH_TRACEMALLOC", "false").lower() in ("1", "true", "yes")
+
+# Stack frames kept per allocation, and allocation sites reported per phase
+tracemalloc_frames = int(os.getenv("DEEP_RESEARCH_TRACEMALLOC_FRAMES", 1))
+tracemalloc_top_sites = 5
+
+MB = 1024 * 1024
+
+# ===== STATE ACCOUNTING =====
+
+def approx_size(value: Any) -> int:
+    """Approximate number of bytes of text held by a state value."""
+    if value is None:
+        return 0
+    if isinstance(value, (str, bytes)):
+        return len(value)
+    if isinstance(value, BaseMessage):
+        size = approx_size(value.content)
+        size += sum(approx_size(call.get("args")) for call in getattr(value, "tool_calls", None) or [])
+        return size + approx_size(getattr(value, "artifact", None))
+    if isinstance(value, Mapping):
+        return sum(len(str(key)) + approx_size(item) for key, item in value.items())
+    if isinstance(value, (list, tuple, set)):
+        return sum(approx_size(item) for item in value)
+    if hasattr(value, "model_dump"):
+        return approx_size(value.model_dump())
+    return len(json.dumps(value, default=str))
+
+def state_sizes(state: Mapping[str, Any], update: Optional[Mapping[str, Any]] = None) -> dict[str, int]:
+    """Approximate size in bytes of each state field, counting a pending update as appended."""
+    sizes = {name: approx_size(value) for name, value in state.items()}
+    for name, value in (update or {}).items():
+        sizes[name] = sizes.get(name, 0) + approx_size(value)
+    return sizes
+
+def measure_state(phase: str, state: Mapping[str, Any], update: Optional[Mapping[str, Any]] = None) -> int:
+    """Publish a state_measured event for a graph state (plus a pending update) and return its size in bytes."""
+    sizes = state_sizes(state, update)
+    total = sum(sizes.values())
+    emit_progress(
+        "state_measured",
+        phase=phase,
+        state_bytes=total,
+        fields={name: size for name, size in sorted(sizes.items(), key=lambda item: -item[1]) if size},
+    )
+    return total
+
+# ===== ALLOCATION ACCOUNTING =====
+
+@contextmanager
+def memory_phase(phase: str, **fields: Any) -> Iterator[None]:
+    """Publish a memory_phase event with tracemalloc statistics for the block, when enabled."""
+    if not tracemalloc_enabled:
+        yield
+        return
+    if not tracemalloc.is_tracing():
+        tracemalloc.start(tracemalloc_frames)
+    before = tracemalloc.take_snapshot()
+    try:
+        yield
+    finally:
+        after = tracemalloc.take_snapshot()
+        current, peak = tracemalloc.get_traced_memory()
+        # Leave out the snapshots' own allocations
+        exclude = [tracemalloc.Filter(False, tracemalloc.__file__)]
+        diff = after.filter_traces(exclude).compare_to(before.filter_traces(exclude), "lineno")
+        emit_progress(
+            "memory_phase",
+            phase=phase,
+            **fields,
+            allocated_bytes=sum(stat.size_diff for stat in diff),
+            traced_bytes=current,
+            traced_peak_bytes=peak,
+            top_sites=[
+                {"site": str(stat.traceback[0]), "size_diff": stat.size_diff, "count_diff": stat.count_diff}
+                for stat in diff[:tracemalloc_top_sites]
+            ],
+        )
+
+# ===== BUDGET =====
+
+def budget_bytes(configuration: Configuration) -> Optional[int]:
+    """Return the state budget in bytes, or None when no budget is set."""
+    return int(configuration.memory_budget_mb * MB) if configuration.memory_budget_mb else None
+
+def compacted_history(messages: Sequence[BaseMessage]) -> list[ToolMessage]:
+    """Compacted copies of the large tool messages in a history.
+
+    The copies keep their message ids, so an add_messages update replaces the
+    originals in place.
+    """
+    replacements = []
+    for message in messages:
+        if isinstance(message, ToolMessage) and not is_compact(message):
+            compacted = compact_tool_message(message)
+            if compacted is not message:
+                replacements.append(compacted)
+    return replacements
+
+def spill_notes(notes: Sequence[str]) -> list[str]:
+    """Move notes to the blob store, keeping entries that already are references."""
+    return [note if is_blob_ref(note) else spill_text(note) for note in notes]
+
+def enforce_memory_budget(
+    phase: str,
+    state: Mapping[str, Any],
+    update: dict,
+    configuration: Configuration,
+    message_fields: Sequence[str] = (),
+    note_fields: Sequence[str] = (),
+) -> dict:
+    """Measure a state with its pending update and shrink the update when the state is over budget.
+
+    The state is not measured at all when there is no budget and no progress
+    consumer. Over budget, tool messages in the message fields, both in the
+    update and already in state, are compacted, and new entries of the note
+    fields are spilled to the blob store. Note fields use an append reducer, so
+    entries already in state are left as they are.
+
+    Args:
+        phase: Step being measured, e.g. "supervisor_tools"
+        state: Graph state the step received
+        update: State update the step is about to return
+        configuration: Run configuration with the memory budget
+        message_fields: Fields holding messages merged with add_messages
+        note_fields: Fields holding lists of notes
+
+    Returns:
+        The update, compacted when the state was over budget
+    """
+    limit = budget_bytes(configuration)
+    if limit is None and not progress_consumers_active():
+        # Nothing to enforce and nobody to report the size to
+        return update
+    state_bytes = measure_state(phase, state, update)
+    if limit is None or state_bytes <= limit:
+        return update
+
+    update = dict(update)
+    freed = 0
+    for field in message_fields:
+        history = compacted_history(state.get(field, []))
+        originals = {message.id: message for message in state.get(field, [])}
+        freed += sum(approx_size(originals[message.id]) - approx_size(message) for message in history)
+        new_messages = [
+            compact_tool_message(message) if isinstance(message, ToolMessage) else message
+            for message in update.get(field, [])
+        ]
+        freed += approx_size(update.get(field, [])) - approx_size(new_messages)
+        update[field] = history + new_messages
+    for field in note_fields:
+        if update.get(field):
+            spilled = spill_notes(update[field])
+            freed += approx_size(update[field]) - approx_size(spilled)
+            update[field] = spilled
+
+    logger.info("State of %s is %.1f MB, over the %.1f MB budget; compacting", phase, state_bytes / MB, limit / MB)
+    emit_progress(
+        "memory_budget_exceeded",
+        phase=phase,
+        state_bytes=state_bytes,
+        budget_bytes=limit,
+        freed_bytes=freed,
+    )
+    return update
@@ -0,0 +1,386 @@
+"""Provider-Aware Model Routing.
+
+This module picks the chat model used for each role in the research system
+(scoping, summarization, research, compression, supervision and report writing)
+from configuration instead of hard-coding it per module.
+
+Each role has an ordered list of candidate models. The router:
+1. Falls back to the next candidate when a call fails
+2. Optionally reorders candidates by observed p95 latency
+3. Optionally hedges async calls: if the first candidate has not answered within
+   its p95 latency, a second request is fired at the next candidate (or again at
+   the same model when the role has only one) and whichever finishes first wins
+4. Adds prompt cache breakpoints for Anthropic candidates and records cache reads
+   for every candidate (see prompt_caching.py)
+5. Sends OpenAI requests through the shared HTTP connection pool (see http_transport.py)
+6. Applies the resilience policy to every candidate call: a per-role deadline,
+   backoff retries for rate limits and server errors, and one circuit breaker per
+   provider, so an open breaker falls through to the next candidate at once
+   (see resilience.py)
+
+Configuration is read from environment variables, for example:
+
+    DEEP_RESEARCH_COMPRESS_MODELS="openai:gpt-4.1,anthropic:claude-sonnet-4-20250514"
+    DEEP_RESEARCH_ROUTING=latency
+    DEEP_RESEARCH_HEDGE_ROLES=compress,write
+    DEEP_RESEARCH_SUMMARIZE_DEADLINE_SECONDS=30
+
+Model identifiers starting with "fake:" select the simulated models of
+fake_backends.py; ``DEEP_RESEARCH_FAKE_MODELS=true`` routes every role to them
+for load tests.
+"""
+
+import asyncio
+import math
+import os
+import time
+from collections import deque
+from dataclasses import dataclass, field
+
+from langchain.chat_models import init_chat_model
+from langchain_core.language_models import BaseChatModel
+from langchain_core.rate_limiters import BaseRateLimiter
+from langchain_core.runnables import Runnable, RunnableConfig, RunnableLambda
+from typing_extensions import Any, Callable, Literal, Optional
+
+from deep_research_from_scratch.http_transport import (
+    get_http_client,
+    get_shared_async_client,
+)
+from deep_research_from_scratch.prompt_caching import (
+    PromptCacheStats,
+    add_cache_breakpoints,
+    anthropic_prompt_caching,
+)
+from deep_research_from_scratch.resilience import (
+    RetryPolicy,
+    aresilient_call,
+    default_policy,
+    resilient_call,
+)
+
+# ===== CONFIGURATION =====
+
+ModelRole = Literal["scope", "summarize", "research", "research_mcp", "compress", "supervise", "write"]
+
+@dataclass
+class RoleConfig:
+    """Model selection for a single role."""
+    # Candidate model identifiers in preference order, e.g. "openai:gpt-4.1"
+    models: list[str]
+    # Extra keyword arguments passed to init_chat_model for every candidate
+    model_kwargs: dict[str, Any] = field(default_factory=dict)
+    # Whether async calls for this role are hedged against the next candidate
+    hedge: bool = False
+    # Seconds a candidate may take, retries included, before the call fails over
+    deadline: Optional[float] = 300.0
+
+# Defaults reproduce the models previously hard-coded in each module
+DEFAULT_ROLE_CONFIGS: dict[str, RoleConfig] = {
+    "scope": RoleConfig(models=["openai:gpt-4.1-mini"], model_kwargs={"temperature": 0.0}),
+    "summarize": RoleConfig(models=["openai:gpt-4.1-mini"], deadline=60.0),
+    "research": RoleConfig(models=["openai:gpt-4.1"]),
+    "research_mcp": RoleConfig(models=["anthropic:claude-sonnet-4-20250514"]),
+    "compress": RoleConfig(models=["openai:gpt-4.1"], model_kwargs={"max_tokens": 32000}, deadline=900.0),
+    "supervise": RoleConfig(models=["openai:gpt-4.1"]),
+    "write": RoleConfig(models=["openai:gpt-4.1"], model_kwargs={"max_tokens": 32000}, deadline=900.0),
+}
+
+# Number of latency samples kept per candidate, and needed before p95 is trusted
+latency_window = 200
+min_latency_samples = 20
+
+# Delay before hedging while a candidate has too few samples for a p95 estimate
+default_hedge_delay_seconds = 60.0
+
+# Providers whose clients accept custom httpx clients and share the pooled transport
+SHARED_HTTP_PROVIDERS = ("openai:", "azure_openai:")
+
+# Providers whose SDK retries are turned off, so retries follow the resilience policy only
+SDK_RETRY_PROVIDERS = ("openai:", "azure_openai:", "anthropic:")
+share_http_clients = os.getenv("DEEP_RESEARCH_SHARED_HTTP", "true").lower() not in ("0", "false", "no")
+
+# Route every role to "fake:<role>" (simulated models with configurable latency, for load tests)
+use_fake_models = os.getenv("DEEP_RESEARCH_FAKE_MODELS", "false").lower() in ("1", "true", "yes")
+
+def load_role_configs() -> dict[str, RoleConfig]:
+    """Build role configurations from defaults overridden by environment variables.
+
+    Reads ``DEEP_RESEARCH_<ROLE>_MODELS`` (comma-separated candidates) and
+    ``DEEP_RESEARCH_<ROLE>_DEADLINE_SECONDS`` for each role, and
+    ``DEEP_RESEARCH_HEDGE_ROLES`` (comma-separated role names). With
+    ``DEEP_RESEARCH_FAKE_MODELS`` set, every role uses "fake:<role>" instead.
+    """
+    hedge_roles = {
+        role.strip() for role in os.getenv("DEEP_RESEARCH_HEDGE_ROLES", "").split(",") if role.strip()
+    }
+    configs = {}
+    for role, default in DEFAULT_ROLE_CONFIGS.items():
+        override = os.getenv(f"DEEP_RESEARCH_{role.upper()}_MODELS")
+        models = [m.strip() for m in override.split(",") if m.strip()] if override else list(default.models)
+        if use_fake_models:
+            models = [f"fake:{role}"]
+        deadline = os.getenv(f"DEEP_RESEARCH_{role.upper()}_DEADLINE_SECONDS")
+        configs[role] = RoleConfig(
+            models=models,
+            model_kwargs=dict(default.model_kwargs),
+            hedge=default.hedge or role in hedge_roles,
+            deadline=float(deadline) if deadline else default.deadline,
+        )
+    return configs
+
+# ===== LATENCY TRACKING =====
+
+class LatencyTracker:
+    """Rolling latency samples per (role, model) used for ordering and hedging."""
+
+    def __init__(self, window: int = latency_window):
+        """Create an empty tracker keeping at most ``window`` samples per key."""
+        self._samples: dict[tuple[str, str], deque] = {}
+        self._window = window
+
+    def record(self, role: str, model: str, seconds: float) -> None:
+        """Record the latency of a successful call."""
+        self._samples.setdefault((role, model), deque(maxlen=self._window)).append(seconds)
+
+    def p95(self, role: str, model: str) -> Optional[float]:
+        """Return the p95 latency for a candidate, or None if too few samples exist."""
+        samples = self._samples.get((role, model))
+        if not samples or len(samples) < min_latency_samples:
+            return None
+        ordered = sorted(samples)
+        return ordered[min(len(ordered) - 1, math.ceil(0.95 * len(ordered)) - 1)]
+
+# ===== ROUTED MODEL =====
+
+class RoutedModel(Runnable):
+    """Runnable that dispatches to one of several candidate model runnables.
+
+    Candidates are tried in order (or by observed latency when latency routing is
+    enabled). Async calls can additionally be hedged against the next candidate.
+    """
+
+    def __init__(
+        self,
+        role: str,
+        candidates: list[tuple[str, Runnable]],
+        tracker: LatencyTracker,
+        routing: Literal["ordered", "latency"] = "ordered",
+        hedge: bool = False,
+        hedge_delay: float = default_hedge_delay_seconds,
+        cache_stats: Optional[PromptCacheStats] = None,
+        policy: RetryPolicy = default_policy,
+    ):
+        """Wrap candidate runnables for a role."""
+        if not candidates:
+            raise ValueError(f"No candidate models configured for role '{role}'")
+        self.role = role
+        self.candidates = candidates
+        self.tracker = tracker
+        self.routing = routing
+        self.hedge = hedge
+        self.hedge_delay = hedge_delay
+        self.cache_stats = cache_stats
+        self.policy = policy
+
+    def _record(self, name: str, seconds: float, result: Any) -> None:
+        """Record latency and prompt cache usage of a successful call."""
+        self.tracker.record(self.role, name, seconds)
+        if self.cache_stats is not None:
+            self.cache_stats.record(self.role, name, result)
+
+    @staticmethod
+    def breaker_name(name: str) -> str:
+        """Circuit breaker shared by all candidates of a provider, e.g. "model:openai"."""
+        return "model:" + (name.split(":", 1)[0] if ":" in name else name)
+
+    def ordered_candidates(self) -> list[tuple[str, Runnable]]:
+        """Return candidates in the order they should be tried."""
+        if self.routing != "latency":
+            return list(self.candidates)
+
+        def sort_key(item: tuple[int, tuple[str, Runnable]]):
+            index, (name, _) = item
+            p95 = self.tracker.p95(self.role, name)
+            # Candidates without enough samples keep their configured position behind measured ones
+            return (p95 is None, p95 or 0.0, index)
+
+        return [candidate for _, candidate in sorted(enumerate(self.candidates), key=sort_key)]
+
+    def _hedge_delay_for(self, name: str) -> float:
+        """Return how long to wait on a candidate before firing a hedged request."""
+        p95 = self.tracker.p95(self.role, name)
+        return p95 if p95 is not None else self.hedge_delay
+
+    def invoke(self, input: Any, config: Optional[RunnableConfig] = None, **kwargs: Any) -> Any:
+        """Call candidates in order until one succeeds."""
+        last_error: Optional[Exception] = None
+        for name, runnable in self.ordered_candidates():
+            start = time.perf_counter()
+            try:
+                result = resilient_call(
+                    self.breaker_name(name), runnable.invoke, input, config, policy=self.policy, **kwargs
+                )
+            except Exception as e:
+                last_error = e
+                continue
+            self._record(name, time.perf_counter() - start, result)
+            return result
+        raise last_error
+
+    async def _acall(self, name: str, runnable: Runnable, input: Any, config: Optional[RunnableConfig], **kwargs: Any) -> Any:
+        """Call a single candidate asynchronously and record its latency."""
+        start = time.perf_counter()
+        result = await aresilient_call(
+            self.breaker_name(name), runnable.ainvoke, input, config, policy=self.policy, **kwargs
+        )
+        self._record(name, time.perf_counter() - start, result)
+        return result
+
+    async def ainvoke(self, input: Any, config: Optional[RunnableConfig] = None, **kwargs: Any) -> Any:
+        """Call candidates asynchronously, hedging the first two when enabled.
+
+        A role with a single candidate hedges with a duplicate request to the same model.
+        """
+        ordered = self.ordered_candidates()
+        last_error: Optional[Exception] = None
+
+        if self.hedge:
+            first_name, first = ordered[0]
+            second_name, second = ordered[1] if len(ordered) >= 2 else ordered[0]
+            pending = {asyncio.create_task(self._acall(first_name, first, input, config, **kwargs))}
+            done, pending = await asyncio.wait(pending, timeout=self._hedge_delay_for(first_name))
+            if done:
+                # First candidate answered before the hedge fired; on failure fall back to the others
+                task = done.pop()
+                if task.exception() is None:
+                    return task.result()
+                last_error = task.exception()
+                ordered = ordered[1:]
+            else:
+                # First candidate is slower than its p95: race a second request against it
+                pending.add(asyncio.create_task(self._acall(second_name, second, input, config, **kwargs)))
+                ordered = ordered[2:]
+            try:
+                while pending:
+                    done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    for task in done:
+                        if task.exception() is None:
+                            return task.result()
+                        last_error = task.exception()
+            finally:
+                for task in pending:
+                    task.cancel()
+
+        for name, runnable in ordered:
+            try:
+                return await self._acall(name, runnable, input, config, **kwargs)
+            except Exception as e:
+                last_error = e
+        raise last_error
+
+# ===== ROUTER =====
+
+class ModelRouter:
+    """Create routed models per role, sharing base chat model clients and latency stats."""
+
+    def __init__(
+        self,
+        role_configs: Optional[dict[str, RoleConfig]] = None,
+        routing: Optional[Literal["ordered", "latency"]] = None,
+        hedge_delay: Optional[float] = None,
+    ):
+        """Create a router from explicit role configs or the environment."""
+        self.role_configs = role_configs or load_role_configs()
+        self.routing = routing or os.getenv("DEEP_RESEARCH_ROUTING", "ordered")
+        if hedge_delay is None:
+            hedge_delay = float(os.getenv("DEEP_RESEARCH_HEDGE_DELAY_SECONDS", default_hedge_delay_seconds))
+        self.hedge_delay = hedge_delay
+        self.tracker = LatencyTracker()
+        self.cache_stats = PromptCacheStats()
+        self.rate_limiter: Optional[BaseRateLimiter] = None
+        self._base_models: dict[tuple[str, tuple], BaseChatModel] = {}
+
+    def set_rate_limiter(self, rate_limiter: Optional[BaseRateLimiter]) -> None:
+        """Share one rate limiter across every model client of the router, existing and future ones."""
+        self.rate_limiter = rate_limiter
+        for model in self._base_models.values():
+            model.rate_limiter = rate_limiter
+
+    def get_base_model(self, model: str, **model_kwargs: Any) -> BaseChatModel:
+        """Return a cached chat model client for a model identifier and kwargs."""
+        key = (model, tuple(sorted(model_kwargs.items())))
+        if key not in self._base_models:
+            if model.startswith("fake:"):
+                from deep_research_from_scratch.fake_backends import FakeChatModel
+                self._base_models[key] = FakeChatModel.from_model_id(model)
+                self._base_models[key].rate_limiter = self.rate_limiter
+                return self._base_models[key]
+            if share_http_clients and model.startswith(SHARED_HTTP_PROVIDERS):
+                model_kwargs = {
+                    "http_client": get_http_client(),
+                    "http_async_client": get_shared_async_client(),
+                    **model_kwargs,
+                }
+            if model.startswith(SDK_RETRY_PROVIDERS):
+                model_kwargs = {"max_retries": 0, **model_kwargs}
+            self._base_models[key] = init_chat_model(model=model, **model_kwargs)
+            self._base_models[key].rate_limiter = self.rate_limiter
+        return self._base_models[key]
+
+    def get_model(
+        self,
+        role: ModelRole,
+        transform: Optional[Callable[[BaseChatModel], Runnable]] = None,
+    ) -> RoutedModel:
+        """Return a routed model for a role.
+
+        Args:
+            role: Role the model is used for
+            transform: Optional function applied to every candidate, e.g. binding
+                tools or requesting structured output
+
+        Returns:
+            RoutedModel dispatching across the role's candidates
+        """
+        role_config = self.role_configs[role]
+        candidates = []
+        for model in role_config.models:
+            base_model = self.get_base_model(model, **role_config.model_kwargs)
+            runnable = transform(base_model) if transform else base_model
+            if anthropic_prompt_caching and model.startswith(("anthropic:", "claude")):
+                # Mark cache breakpoints only for the provider that understands them
+                runnable = RunnableLambda(add_cache_breakpoints) | runnable
+            candidates.append((model, runnable))
+
+        return RoutedModel(
+            role,
+            candidates,
+            self.tracker,
+            routing=self.routing,
+            hedge=role_config.hedge,
+            hedge_delay=self.hedge_delay,
+            cache_stats=self.cache_stats,
+            policy=default_policy.with_deadline(role_config.deadline),
+        )
+
+# Process-wide router shared by every graph
+router = ModelRouter()
+
+def get_model(role: ModelRole, transform: Optional[Callable[[BaseChatModel], Runnable]] = None) -> RoutedModel:
+    """Return a routed model for a role from the process-wide router."""
+    return router.get_model(role, transform)
+
+def get_role_models(role: ModelRole) -> list[str]:
+    """Return the candidate model identifiers of a role from the process-wide router."""
+    return list(router.role_configs[role].models)
+
+def set_rate_limiter(rate_limiter: Optional[BaseRateLimiter]) -> Optional[BaseRateLimiter]:
+    """Install a rate limiter for every model call of the process-wide router and return the previous one."""
+    previous = router.rate_limiter
+    router.set_rate_limiter(rate_limiter)
+    return previous
+
+def get_prompt_cache_stats() -> list[dict]:
+    """Return prompt cache totals per role and model from the process-wide router."""
+    return router.cache_stats.snapshot()
@@ -11,29 +11,49 @@ maintaining isolated context windows for each research topic.
 """
 
 import asyncio
+import logging
+import math
+import uuid
 
-from typing_extensions import Literal
+from typing_extensions import Literal, Optional
 
-from langchain.chat_models import init_chat_model
 from langchain_core.messages import (
     HumanMessage, 
     BaseMessage, 
-    SystemMessage, 
     ToolMessage,
     filter_messages
 )
+from langchain_core.runnables import RunnableConfig
 from langgraph.graph import StateGraph, START, END
 from langgraph.types import Command
 
-from deep_research_from_scratch.prompts import lead_researcher_prompt
+from deep_research_from_scratch.blob_store import combine_notes, load_text
+from deep_research_from_scratch.compact_messages import is_compact, render_messages
+from deep_research_from_scratch.configuration import Configuration
+from deep_research_from_scratch.memory_budget import enforce_memory_budget, memory_phase
+from deep_research_from_scratch.model_router import get_model
+from deep_research_from_scratch.progress_events import progress_span
+from deep_research_from_scratch.profiling import profile_span
+from deep_research_from_scratch.prompt_registry import get_system_message
 from deep_research_from_scratch.research_agent import researcher_agent
+from deep_research_from_scratch.research_cache import get_research_cache, research_models
+from deep_research_from_scratch.research_memory import get_research_memory
+from deep_research_from_scratch.resilience import DeadlineExceeded
 from deep_research_from_scratch.state_multi_agent_supervisor import (
     SupervisorState, 
     ConductResearch, 
-    ResearchComplete
+    CancelResearch,
+    ResearchComplete,
+    SearchResearchMemory,
+)
+from deep_research_from_scratch.research_workers import (
+    deadline_grace_seconds,
+    get_worker_pool,
 )
 from deep_research_from_scratch.utils import get_today_str, think_tool
 
+logger = logging.getLogger(__name__)
+
 def get_notes_from_tool_calls(messages: list[BaseMessage]) -> list[str]:
     """Extract research notes from ToolMessage objects in supervisor message history.
 
@@ -49,7 +69,13 @@ def get_notes_from_tool_calls(messages: list[BaseMessage]) -> list[str]:
     Returns:
         List of research note strings extracted from ToolMessage objects
     """
-    return [tool_msg.content for tool_msg in filter_messages(messages, include_types="tool")]
+    return [
+        # Messages compacted under the memory budget keep their text in the blob store
+        load_text(tool_msg.artifact["content_id"]) if is_compact(tool_msg) else tool_msg.content
+        for tool_msg in filter_messages(messages, include_types="tool")
+        # Skip placeholders for unfinished background research (speculative mode) and failed research
+        if not (isinstance(tool_msg.artifact, dict) and tool_msg.artifact.get("status") in ("running", "cancelled", "failed", "empty"))
+    ]
 
 # Ensure async compatibility for Jupyter environments
 try:
@@ -67,9 +93,27 @@ except ImportError:
 
 # ===== CONFIGURATION =====
 
-supervisor_tools = [ConductResearch, ResearchComplete, think_tool]
-supervisor_model = init_chat_model(model="openai:gpt-4.1")
-supervisor_model_with_tools = supervisor_model.bind_tools(supervisor_tools)
+def get_supervisor_tools(speculative: bool = False, memory: bool = False) -> list:
+    """Tools offered to the supervisor.
+
+    Speculative mode additionally lets the supervisor cancel background research,
+    and research memory lets it look up findings from earlier runs.
+    """
+    tools = [ConductResearch]
+    if speculative:
+        tools.append(CancelResearch)
+    if memory:
+        tools.append(SearchResearchMemory)
+    return tools + [ResearchComplete, think_tool]
+
+# Supervisor models keyed by (speculative, memory), each bound to its tool set
+supervisor_models = {
+    (speculative, memory): get_model(
+        "supervise", lambda model, tools=get_supervisor_tools(speculative, memory): model.bind_tools(tools)
+    )
+    for speculative in (False, True)
+    for memory in (False, True)
+}
 
 # System constants
 # Maximum number of tool call iterations for individual researcher agents
@@ -80,9 +124,333 @@ max_researcher_iterations = 6 # Calls to think_tool + ConductResearch
 # This is passed to the lead_researcher_prompt to limit parallel research tasks
 max_concurrent_researchers = 3
 
+# ===== RESEARCH EXECUTION =====
+
+async def run_research_agent(research_topic: str, configuration: Configuration) -> dict:
+    """Run a researcher sub-agent for one ConductResearch call.
+
+    Runs the researcher on the current event loop by default, or dispatches it to
+    the multi-process worker pool when research_worker_processes is set. The
+    researcher is cancelled once research_timeout_seconds have passed; pooled
+    researchers are cancelled by their worker, which frees the process for the next job.
+
+    Args:
+        research_topic: Topic from the ConductResearch tool call
+        configuration: Runtime configuration for this run
+
+    Returns:
+        Researcher output containing compressed_research and raw_notes
+
+    Raises:
+        DeadlineExceeded: If the researcher did not finish within its deadline
+    """
+    timeout = configuration.research_timeout_seconds
+    if configuration.research_worker_processes > 0:
+        pool = get_worker_pool(configuration.research_worker_processes)
+        research = pool.run(research_topic, configuration.model_dump())
+        if timeout is not None:
+            # The worker enforces the deadline; cancelling the future here cannot stop a running job
+            timeout += deadline_grace_seconds
+    else:
+        research = researcher_agent.ainvoke({
+            "researcher_messages": [
+                HumanMessage(content=research_topic)
+            ],
+            "research_topic": research_topic
+        })
+
+    try:
+        return await asyncio.wait_for(research, timeout=timeout)
+    except DeadlineExceeded:
+        raise
+    except TimeoutError as e:
+        raise DeadlineExceeded(
+            f"Research did not finish within {configuration.research_timeout_seconds:g}s"
+        ) from e
+
+async def conduct_research(research_topic: str, configuration: Configuration) -> dict:
+    """Answer a ConductResearch call and publish researcher_started/researcher_finished progress events."""
+    with progress_span("researcher_started", "researcher_finished", topic=research_topic) as progress:
+        result = await _conduct_research(research_topic, configuration)
+        progress["cache_hit"] = "cache" in result
+    return result
+
+async def _conduct_research(research_topic: str, configuration: Configuration) -> dict:
+    """Answer a ConductResearch call, from the semantic research cache when enabled.
+
+    A cache hit returns the cached compressed_research and raw_notes together with
+    a "cache" entry describing the hit, which is recorded on the ToolMessage.
+    Fresh results are added to the cache, and fresh and cached results to
+    research memory, when enabled.
+
+    Args:
+        research_topic: Topic from the ConductResearch tool call
+        configuration: Runtime configuration for this run
+
+    Returns:
+        Researcher output containing compressed_research and raw_notes
+    """
+    if not configuration.research_cache:
+        result = await run_research_agent(research_topic, configuration)
+        await remember_research(research_topic, result, configuration)
+        return result
+
+    cache = get_research_cache()
+    max_age = configuration.research_cache_max_age_hours * 3600
+    key = {"search_provider": configuration.search_provider, "models": research_models()}
+    with profile_span("research_cache_lookup", "cache", topic=research_topic) as span:
+        hit = await asyncio.to_thread(
+            cache.lookup, research_topic, configuration.research_cache_threshold, max_age, **key
+        )
+        span["hit"] = hit is not None
+    if hit is not None:
+        result = {
+            "compressed_research": hit.compressed_research,
+            "raw_notes": hit.raw_notes,
+            "cache": hit.as_artifact(),
+        }
+        # Memory may not hold it yet, e.g. when the cache was filled with memory disabled
+        await remember_research(research_topic, result, configuration)
+        return result
+
+    result = await run_research_agent(research_topic, configuration)
+    if "compressed_research" in result:
+        await asyncio.to_thread(
+            cache.store, research_topic, result["compressed_research"], list(result.get("raw_notes", [])), **key
+        )
+        await asyncio.to_thread(cache.purge, max_age)
+    await remember_research(research_topic, result, configuration)
+    return result
+
+# ===== RESEARCH MEMORY =====
+
+async def remember_research(research_topic: str, result: dict, configuration: Configuration) -> None:
+    """Add findings to research memory and evict old or excess findings."""
+    if not configuration.research_memory or "compressed_research" not in result:
+        return
+    memory = get_research_memory()
+    await asyncio.to_thread(memory.add, research_topic, result["compressed_research"])
+    await asyncio.to_thread(
+        memory.evict,
+        configuration.research_memory_max_age_days * 86400,
+        int(configuration.research_memory_max_mb * 1024 * 1024),
+    )
+
+async def search_research_memory(tool_call: dict, configuration: Configuration) -> ToolMessage:
+    """Answer a SearchResearchMemory call with the most similar stored findings."""
+    with profile_span("research_memory_search", "cache", query=tool_call["args"]["query"]) as span:
+        entries = await asyncio.to_thread(
+            get_research_memory().search,
+            tool_call["args"]["query"],
+            configuration.research_memory_results,
+            configuration.research_memory_max_age_days * 86400,
+        )
+        span["results"] = len(entries)
+    if not entries:
+        return ToolMessage(
+            content="No findings from earlier research runs match this query. Delegate research with ConductResearch.",
+            name=tool_call["name"],
+            tool_call_id=tool_call["id"],
+            artifact={"status": "empty"},
+        )
+    return ToolMessage(
+        content="Findings from earlier research runs, most relevant first:\n\n"
+        + "\n\n---\n\n".join(entry.render(index) for index, entry in enumerate(entries, 1)),
+        name=tool_call["name"],
+        tool_call_id=tool_call["id"],
+        artifact={"memory": [
+            {"topic": entry.topic, "similarity": round(entry.similarity, 4), "created_at": entry.created_at}
+            for entry in entries
+        ]},
+    )
+
+def research_artifact(result: Optional[dict], error: Optional[BaseException], **fields) -> Optional[dict]:
+    """ToolMessage artifact for a ConductResearch call: status and cache hit, if any."""
+    artifact = dict(fields)
+    if error is not None:
+        artifact["status"] = "failed"
+    elif result and "cache" in result:
+        artifact["cache"] = result["cache"]
+    return artifact or None
+
+# ===== SPECULATIVE RESEARCH =====
+
+# Background researcher tasks keyed by research_id. Tasks cannot be stored in graph
+# state, so state only tracks research_id -> topic in pending_research.
+_background_research: dict[str, asyncio.Task] = {}
+
+def format_research_note(result: Optional[dict], error: Optional[BaseException]) -> str:
+    """Return the compressed research of a finished task, or an error note."""
+    if error is not None:
+        return f"Research failed ({type(error).__name__}: {error}). The topic was not researched; retry it or continue without it."
+    if result is None:
+        return "Error synthesizing research report"
+    return result.get("compressed_research", "Error synthesizing research report")
+
+def pop_finished_research(research_id: str) -> tuple[Optional[dict], Optional[BaseException]]:
+    """Remove a finished background task from the registry and return its outcome."""
+    task = _background_research.pop(research_id, None)
+    if task is None:
+        # Lost, e.g. the process restarted while the research was running
+        return None, RuntimeError(f"Background research {research_id} is no longer available")
+    if task.cancelled():
+        return None, asyncio.CancelledError()
+    return task.result() if task.exception() is None else None, task.exception()
+
+def cancel_background_research(research_ids) -> None:
+    """Cancel background researcher tasks and forget them."""
+    for research_id in research_ids:
+        task = _background_research.pop(research_id, None)
+        if task is not None:
+            task.cancel()
+
+async def conduct_research_speculatively(
+    most_recent_message,
+    pending_research: dict[str, str],
+    configuration: Configuration,
+) -> dict:
+    """Run ConductResearch calls without waiting for every researcher to finish.
+
+    Launches each new ConductResearch call as a background task, then waits only until
+    a quorum of the new tasks has finished; without new ConductResearch calls it does
+    not wait at all. Finished research is returned as ToolMessages; unfinished
+    research gets a placeholder ToolMessage with its research_id and keeps running.
+    Research that finishes in a later iteration is delivered as a HumanMessage and
+    added to the notes directly.
+
+    Args:
+        most_recent_message: Supervisor AIMessage with the tool calls to execute
+        pending_research: research_id -> topic for research still running
+        configuration: Runtime configuration for this run
+
+    Returns:
+        Dict with supervisor_messages, notes, raw_notes and pending_research updates
+    """
+    pending_research = dict(pending_research)
+    tool_messages = []
+    notes = []
+    raw_notes = []
+
+    # Cancel research the supervisor no longer needs
+    for tool_call in most_recent_message.tool_calls:
+        if tool_call["name"] != "CancelResearch":
+            continue
+        research_id = tool_call["args"].get("research_id", "")
+        if research_id in pending_research:
+            cancel_background_research([research_id])
+            topic = pending_research.pop(research_id)
+            content = f"Cancelled research {research_id}: {topic}"
+        else:
+            content = f"No running research with id {research_id}"
+        tool_messages.append(ToolMessage(
+            content=content,
+            name=tool_call["name"],
+            tool_call_id=tool_call["id"],
+            artifact={"research_id": research_id, "status": "cancelled"},
+        ))
+
+    # Read every topic before launching so a malformed call cannot strand tasks
+    new_research = [
+        (tool_call, tool_call["args"]["research_topic"])
+        for tool_call in most_recent_message.tool_calls
+        if tool_call["name"] == "ConductResearch"
+    ]
+
+    # Launch new research in the background; cancel it again if this iteration fails
+    launched = {}
+    try:
+        for tool_call, topic in new_research:
+            research_id = uuid.uuid4().hex[:8]
+            _background_research[research_id] = asyncio.create_task(conduct_research(topic, configuration))
+            launched[research_id] = tool_call
+            pending_research[research_id] = topic
+
+        # Wait until enough research has finished to make progress
+        running = {
+            research_id: _background_research[research_id]
+            for research_id in pending_research if research_id in _background_research
+        }
+        target = max(1, math.ceil(configuration.speculative_quorum * len(launched))) if launched else 0
+        while running and sum(task.done() for task in running.values()) < target:
+            await asyncio.wait(
+                [task for task in running.values() if not task.done()],
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+
+        finished = [
+            research_id for research_id in pending_research
+            if research_id not in _background_research or _background_research[research_id].done()
+        ]
+
+        # Answer this iteration's ConductResearch calls
+        for research_id, tool_call in launched.items():
+            if research_id in finished:
+                result, error = pop_finished_research(research_id)
+                pending_research.pop(research_id)
+                tool_messages.append(ToolMessage(
+                    content=format_research_note(result, error),
+                    name=tool_call["name"],
+                    tool_call_id=tool_call["id"],
+                    artifact=research_artifact(result, error, research_id=research_id, status="completed"),
+                ))
+                if error is None:
+                    raw_notes.append(combine_notes((result or {}).get("raw_notes", [])))
+            else:
+                tool_messages.append(ToolMessage(
+                    content=(
+                        f"Research is still running in the background (research_id: {research_id}). "
+                        "Its findings will be delivered in a later message."
+                    ),
+                    name=tool_call["name"],
+                    tool_call_id=tool_call["id"],
+                    artifact={"research_id": research_id, "status": "running"},
+                ))
+
+        # Deliver research from earlier iterations that has finished since
+        late_messages = []
+        for research_id in finished:
+            if research_id in launched:
+                continue
+            topic = pending_research.pop(research_id)
+            result, error = pop_finished_research(research_id)
+            note = format_research_note(result, error)
+            if error is None:
+                notes.append(note)
+                raw_notes.append(combine_notes((result or {}).get("raw_notes", [])))
+            late_messages.append(HumanMessage(
+                content=f"Background research {research_id} has finished.\n\nTopic: {topic}\n\nFindings:\n{note}"
+            ))
+
+        return {
+            "supervisor_messages": tool_messages + late_messages,
+            "notes": notes,
+            "raw_notes": raw_notes,
+            "pending_research": pending_research,
+        }
+    except BaseException:
+        cancel_background_research(launched)
+        raise
+
+def collect_finished_background_research(pending_research: dict[str, str]) -> tuple[list[str], list[str]]:
+    """Collect finished background research and cancel whatever is still running.
+
+    Used when the research phase ends so completed work is kept and stragglers stop.
+    """
+    notes = []
+    raw_notes = []
+    for research_id in pending_research:
+        task = _background_research.get(research_id)
+        if task is not None and task.done():
+            result, error = pop_finished_research(research_id)
+            if error is None:
+                notes.append(format_research_note(result, error))
+                raw_notes.append(combine_notes(result.get("raw_notes", [])))
+    cancel_background_research(list(pending_research))
+    return notes, raw_notes
+
 # ===== SUPERVISOR NODES =====
 
-async def supervisor(state: SupervisorState) -> Command[Literal["supervisor_tools"]]:
+async def supervisor(state: SupervisorState, config: RunnableConfig) -> Command[Literal["supervisor_tools"]]:
     """Coordinate research activities.
 
     Analyzes the research brief and current progress to decide:
@@ -92,22 +460,31 @@ async def supervisor(state: SupervisorState) -> Command[Literal["supervisor_tool
 
     Args:
         state: Current supervisor state with messages and research progress
+        config: Runtime configuration, e.g. to enable speculative research
 
     Returns:
         Command to proceed to supervisor_tools node with updated state
     """
+    configuration = Configuration.from_runnable_config(config)
     supervisor_messages = state.get("supervisor_messages", [])
 
-    # Prepare system message with current date and constraints
-    system_message = lead_researcher_prompt.format(
-        date=get_today_str(), 
+    # Prepare system message with current date and constraints (rendered once per day and mode)
+    prompt_name = "lead_researcher_prompt"
+    if configuration.speculative_research:
+        prompt_name += "_speculative"
+    if configuration.research_memory:
+        prompt_name += "_memory"
+    model_with_tools = supervisor_models[(configuration.speculative_research, configuration.research_memory)]
+    system_message = get_system_message(
+        prompt_name,
+        date=get_today_str(),
         max_concurrent_research_units=max_concurrent_researchers,
-        max_researcher_iterations=max_researcher_iterations
+        max_researcher_iterations=max_researcher_iterations,
     )
-    messages = [SystemMessage(content=system_message)] + supervisor_messages
+    messages = [system_message] + render_messages(supervisor_messages)
 
     # Make decision about next research steps
-    response = await supervisor_model_with_tools.ainvoke(messages)
+    response = await model_with_tools.ainvoke(messages)
 
     return Command(
         goto="supervisor_tools",
@@ -117,28 +494,33 @@ async def supervisor(state: SupervisorState) -> Command[Literal["supervisor_tool
         }
     )
 
-async def supervisor_tools(state: SupervisorState) -> Command[Literal["supervisor", "__end__"]]:
+async def supervisor_tools(state: SupervisorState, config: RunnableConfig) -> Command[Literal["supervisor", "__end__"]]:
     """Execute supervisor decisions - either conduct research or end the process.
 
     Handles:
     - Executing think_tool calls for strategic reflection
+    - Looking up findings from earlier runs in research memory
     - Launching parallel research agents for different topics
     - Aggregating research results
     - Determining when research is complete
 
     Args:
         state: Current supervisor state with messages and iteration count
+        config: Runtime configuration, e.g. to run researchers in worker processes
 
     Returns:
         Command to continue supervision, end process, or handle errors
     """
+    configuration = Configuration.from_runnable_config(config)
     supervisor_messages = state.get("supervisor_messages", [])
     research_iterations = state.get("research_iterations", 0)
+    pending_research = state.get("pending_research", {})
     most_recent_message = supervisor_messages[-1]
 
     # Initialize variables for single return pattern
     tool_messages = []
     all_raw_notes = []
+    speculative_update = {}
     next_step = "supervisor"  # Default next step
     should_end = False
 
@@ -179,64 +561,82 @@ async def supervisor_tools(state: SupervisorState) -> Command[Literal["superviso
                     )
                 )
 
+            # Look up findings from earlier runs
+            for tool_call in most_recent_message.tool_calls:
+                if tool_call["name"] == "SearchResearchMemory":
+                    tool_messages.append(await search_research_memory(tool_call, configuration))
+
+            # Speculative mode: continue as soon as enough researchers have finished
+            if configuration.speculative_research:
+                speculative_update = await conduct_research_speculatively(
+                    most_recent_message, pending_research, configuration
+                )
+
             # Handle ConductResearch calls (asynchronous)
-            if conduct_research_calls:
+            elif conduct_research_calls:
                 # Launch parallel research agents
                 coros = [
-                    researcher_agent.ainvoke({
-                        "researcher_messages": [
-                            HumanMessage(content=tool_call["args"]["research_topic"])
-                        ],
-                        "research_topic": tool_call["args"]["research_topic"]
-                    }) 
+                    conduct_research(tool_call["args"]["research_topic"], configuration)
                     for tool_call in conduct_research_calls
                 ]
 
-                # Wait for all research to complete
-                tool_results = await asyncio.gather(*coros)
+                # Wait for all research to complete; a failed researcher does not discard the others' work
+                with memory_phase("research", topics=len(coros)):
+                    tool_results = await asyncio.gather(*coros, return_exceptions=True)
 
                 # Format research results as tool messages
                 # Each sub-agent returns compressed research findings in result["compressed_research"]
                 # We write this compressed research as the content of a ToolMessage, which allows
                 # the supervisor to later retrieve these findings via get_notes_from_tool_calls()
-                research_tool_messages = [
-                    ToolMessage(
-                        content=result.get("compressed_research", "Error synthesizing research report"),
+                for outcome, tool_call in zip(tool_results, conduct_research_calls):
+                    error = outcome if isinstance(outcome, BaseException) else None
+                    if error is not None:
+                        logger.warning("Research on %r failed: %r", tool_call["args"]["research_topic"], error)
+                    tool_messages.append(ToolMessage(
+                        content=format_research_note(None if error else outcome, error),
                         name=tool_call["name"],
-                        tool_call_id=tool_call["id"]
-                    ) for result, tool_call in zip(tool_results, conduct_research_calls)
-                ]
-
-                tool_messages.extend(research_tool_messages)
-
-                # Aggregate raw notes from all research
-                all_raw_notes = [
-                    "\n".join(result.get("raw_notes", [])) 
-                    for result in tool_results
-                ]
-
-        except Exception as e:
-            print(f"Error in supervisor tools: {e}")
+                        tool_call_id=tool_call["id"],
+                        artifact=research_artifact(None if error else outcome, error),
+                    ))
+                    # Aggregate raw notes from all successful research
+                    if error is None:
+                        all_raw_notes.append(combine_notes(outcome.get("raw_notes", [])))
+
+        except Exception:
+            logger.exception("Error in supervisor tools")
             should_end = True
             next_step = END
 
     # Single return point with appropriate state updates
     if should_end:
-        return Command(
-            goto=next_step,
-            update={
-                "notes": get_notes_from_tool_calls(supervisor_messages),
-                "research_brief": state.get("research_brief", "")
-            }
-        )
+        # Keep background research that already finished and stop the stragglers
+        pending_research = speculative_update.get("pending_research", pending_research)
+        background_notes, background_raw_notes = collect_finished_background_research(pending_research)
+        update = {
+            "notes": get_notes_from_tool_calls(supervisor_messages) + background_notes,
+            "raw_notes": background_raw_notes,
+            "research_brief": state.get("research_brief", ""),
+            "pending_research": {}
+        }
+    elif speculative_update:
+        update = {
+            "supervisor_messages": tool_messages + speculative_update["supervisor_messages"],
+            "notes": speculative_update["notes"],
+            "raw_notes": speculative_update["raw_notes"],
+            "pending_research": speculative_update["pending_research"]
+        }
     else:
-        return Command(
-            goto=next_step,
-            update={
-                "supervisor_messages": tool_messages,
-                "raw_notes": all_raw_notes
-            }
-        )
+        update = {
+            "supervisor_messages": tool_messages,
+            "raw_notes": all_raw_notes
+        }
+
+    # Over the memory budget, compact research results and spill notes instead of growing the state further
+    update = enforce_memory_budget(
+        "supervisor_tools", state, update, configuration,
+        message_fields=["supervisor_messages"], note_fields=["notes", "raw_notes"],
+    )
+    return Command(goto=next_step, update=update)
 
 # ===== GRAPH CONSTRUCTION =====
 
@@ -245,4 +645,4 @@ supervisor_builder = StateGraph(SupervisorState)
 supervisor_builder.add_node("supervisor", supervisor)
 supervisor_builder.add_node("supervisor_tools", supervisor_tools)
 supervisor_builder.add_edge(START, "supervisor")
-supervisor_agent = supervisor_builder.compile()
+supervisor_agent = supervisor_builder.compile(name="research_agent_supervisor")
@@ -0,0 +1,270 @@
+"""Run Profiling with Chrome Trace Output.
+
+An opt-in profiler that records one span per graph node, tool call, model call
+and cache lookup, and writes a Chrome trace JSON file per run. The files open in
+Perfetto (https://ui.perfetto.dev) or chrome://tracing, where parallel research
+and serial chains are visible at a glance:
+
+    agent > supervisor_subgraph > supervisor_tools > research_agent
+        > tool_node > tavily_search > summarize_webpage > ChatOpenAI
+
+Spans are collected by a LangChain callback handler that nests them by run_id
+and parent_run_id. Work that is not a LangChain run (searches, cache lookups,
+page summarization) is recorded with profile_span, which nests under the run
+that is currently executing; model calls made inside it nest under the span.
+Concurrent children of a span are laid out on separate tracks so that
+overlapping work never hides behind its siblings.
+
+Enable it for every run in the process by setting ``DEEP_RESEARCH_PROFILE_DIR``
+(this also covers the graphs served from langgraph.json), or for a block of code
+with ``with profiling(out_dir): ...``. Each top-level run writes
+``trace-<run id>.json`` to the directory. Researchers running in worker
+processes write traces of their own.
+"""
+
+import json
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from pathlib import Path
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.runnables.config import var_child_runnable_config
+from langchain_core.tracers.context import register_configure_hook
+from typing_extensions import Any, Iterator, Optional, Union
+
+# ===== CONFIGURATION =====
+
+# Directory trace files are written to; profiling is off when unset
+profile_dir = os.getenv("DEEP_RESEARCH_PROFILE_DIR")
+
+# Chain runs LangGraph marks as internal plumbing (channel writes, branch routing)
+HIDDEN_TAG = "langsmith:hidden"
+
+# Innermost manual span of the current task, with the run it was opened in
+_manual_span: ContextVar[Optional[tuple[UUID, UUID]]] = ContextVar("deep_research_manual_span", default=None)
+
+# ===== SPANS =====
+
+@dataclass
+class Span:
+    """An open or finished span of a traced run."""
+    name: str
+    category: str
+    root: UUID
+    parent: Optional[UUID]
+    start_us: float
+    track: int = 0
+    args: dict = field(default_factory=dict)
+
+class ChromeTraceProfiler(BaseCallbackHandler):
+    """Callback handler that writes a Chrome trace file for every top-level run."""
+
+    # Record inline: spans must be opened and closed in call order, and recording is cheap
+    run_inline = True
+
+    def __init__(self, out_dir: Optional[Union[str, Path]] = None):
+        """Create a profiler writing trace files to out_dir (default: DEEP_RESEARCH_PROFILE_DIR or cwd)."""
+        self.out_dir = Path(out_dir or profile_dir or ".")
+        self._lock = threading.Lock()
+        self._origin_ns = time.perf_counter_ns()
+        self._spans: dict[UUID, Span] = {}
+        # Nearest recorded ancestor of every run, including runs that are not recorded themselves
+        self._recorded_parent: dict[UUID, Optional[UUID]] = {}
+        self._events: dict[UUID, list[dict]] = {}
+        self._tracks: dict[UUID, list[list[UUID]]] = {}
+
+    # ----- span bookkeeping -----
+
+    def _now_us(self) -> float:
+        """Microseconds since the profiler was created."""
+        return (time.perf_counter_ns() - self._origin_ns) / 1000
+
+    def _track_for(self, root: UUID, parent: Optional[UUID], run_id: UUID) -> int:
+        """Pick a track: the parent's track if the parent is its innermost open span, else a new one."""
+        tracks = self._tracks.setdefault(root, [])
+        if parent is not None and parent in self._spans:
+            track = self._spans[parent].track
+            if tracks[track] and tracks[track][-1] == parent:
+                tracks[track].append(run_id)
+                return track
+        tracks.append([run_id])
+        return len(tracks) - 1
+
+    def start_span(self, run_id: UUID, parent_run_id: Optional[UUID], name: str, category: str, record: bool = True, **args: Any) -> None:
+        """Open a span, or only remember the run's place in the tree when record is False."""
+        manual = _manual_span.get()
+        if manual is not None and parent_run_id == manual[1]:
+            # Started inside profile_span: nest under the manual span instead of its run
+            parent_run_id = manual[0]
+        with self._lock:
+            parent = self._recorded_parent.get(parent_run_id, parent_run_id) if parent_run_id else None
+            if parent is not None and parent not in self._spans:
+                parent = None
+            if parent is not None and category in ("node", "chain") and self._spans[parent].name == name:
+                # LangGraph wraps each node function in a run of the same name; keep one span
+                record = False
+            if not record:
+                self._recorded_parent[run_id] = parent
+                return
+            root = self._spans[parent].root if parent is not None else run_id
+            if root == run_id:
+                self._events[root] = []
+            span = Span(name, category, root, parent, self._now_us(), args=args)
+            self._spans[run_id] = span
+            span.track = self._track_for(root, parent, run_id)
+
+    def end_span(self, run_id: UUID, error: Optional[BaseException] = None, **args: Any) -> None:
+        """Close a span; closing a top-level span writes its trace file."""
+        with self._lock:
+            self._recorded_parent.pop(run_id, None)
+            span = self._spans.pop(run_id, None)
+            if span is None:
+                return
+            tracks = self._tracks.get(span.root)
+            if tracks is None:
+                # Its root already ended and was written, e.g. a background task outlived its run
+                return
+            lane = tracks[span.track]
+            if run_id in lane:
+                lane.remove(run_id)
+            if error is not None:
+                args["error"] = type(error).__name__
+            self._events[span.root].append({
+                "name": span.name,
+                "cat": span.category,
+                "ph": "X",
+                "ts": round(span.start_us, 1),
+                "dur": round(self._now_us() - span.start_us, 1),
+                "pid": os.getpid(),
+                "tid": span.track,
+                "args": {**span.args, **args},
+            })
+            if run_id != span.root:
+                return
+            events = self._events.pop(span.root)
+            tracks = len(self._tracks.pop(span.root))
+        self._write(span.root, events, tracks)
+
+    def _write(self, root: UUID, events: list[dict], tracks: int) -> None:
+        """Write the trace of one top-level run."""
+        metadata = [
+            {"name": "thread_name", "ph": "M", "pid": os.getpid(), "tid": track, "args": {"name": f"track {track}"}}
+            for track in range(tracks)
+        ]
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+        path = self.out_dir / f"trace-{root}.json"
+        path.write_text(json.dumps({"traceEvents": metadata + events, "displayTimeUnit": "ms"}), encoding="utf-8")
+
+    # ----- callbacks -----
+
+    def on_chain_start(self, serialized, inputs, *, run_id, parent_run_id=None, tags=None, metadata=None, **kwargs):
+        """Record graphs and graph nodes; skip LangGraph's internal plumbing."""
+        name = kwargs.get("name") or (serialized or {}).get("name") or "chain"
+        node = (metadata or {}).get("langgraph_node")
+        category = "node" if node == name else "chain"
+        self.start_span(run_id, parent_run_id, name, category, record=HIDDEN_TAG not in (tags or []))
+
+    def on_chain_end(self, outputs, *, run_id, **kwargs):
+        """Close a chain span."""
+        self.end_span(run_id)
+
+    def on_chain_error(self, error, *, run_id, **kwargs):
+        """Close a chain span that raised."""
+        self.end_span(run_id, error)
+
+    def on_tool_start(self, serialized, input_str, *, run_id, parent_run_id=None, **kwargs):
+        """Record a tool call."""
+        name = kwargs.get("name") or (serialized or {}).get("name") or "tool"
+        self.start_span(run_id, parent_run_id, name, "tool")
+
+    def on_tool_end(self, output, *, run_id, **kwargs):
+        """Close a tool span."""
+        self.end_span(run_id)
+
+    def on_tool_error(self, error, *, run_id, **kwargs):
+        """Close a tool span that raised."""
+        self.end_span(run_id, error)
+
+    def on_chat_model_start(self, serialized, messages, *, run_id, parent_run_id=None, metadata=None, **kwargs):
+        """Record a chat model call with its model name."""
+        name = kwargs.get("name") or (serialized or {}).get("name") or "chat_model"
+        model = (metadata or {}).get("ls_model_name")
+        self.start_span(run_id, parent_run_id, name, "model", **({"model": model} if model else {}))
+
+    def on_llm_start(self, serialized, prompts, *, run_id, parent_run_id=None, **kwargs):
+        """Record a completion model call."""
+        self.start_span(run_id, parent_run_id, kwargs.get("name") or "llm", "model")
+
+    def on_llm_end(self, response, *, run_id, **kwargs):
+        """Close a model span with its token usage."""
+        usage = {}
+        for generations in response.generations:
+            for generation in generations:
+                metadata = getattr(getattr(generation, "message", None), "usage_metadata", None) or {}
+                for key in ("input_tokens", "output_tokens"):
+                    usage[key] = usage.get(key, 0) + metadata.get(key, 0)
+        self.end_span(run_id, **usage)
+
+    def on_llm_error(self, error, *, run_id, **kwargs):
+        """Close a model span that raised."""
+        self.end_span(run_id, error)
+
+# ===== MANUAL SPANS =====
+
+def _current_run() -> tuple[Optional[ChromeTraceProfiler], Optional[UUID]]:
+    """Return the profiler attached to the currently executing run, and that run's id."""
+    config = var_child_runnable_config.get()
+    callbacks = (config or {}).get("callbacks")
+    for handler in getattr(callbacks, "handlers", None) or []:
+        if isinstance(handler, ChromeTraceProfiler):
+            return handler, callbacks.parent_run_id
+    return None, None
+
+@contextmanager
+def profile_span(name: str, category: str = "function", **args: Any) -> Iterator[dict]:
+    """Record a span for work that is not a LangChain run, e.g. a cache lookup.
+
+    The span nests under the currently executing run. Without an active profiler
+    this is a no-op. The yielded dict collects extra arguments for the span, e.g.
+    whether a cache lookup hit.
+    """
+    profiler, run_id = _current_run()
+    extra: dict = {}
+    if profiler is None or run_id is None:
+        yield extra
+        return
+    span_id = uuid.uuid4()
+    profiler.start_span(span_id, run_id, name, category, **args)
+    token = _manual_span.set((span_id, run_id))
+    try:
+        yield extra
+    except BaseException as e:
+        profiler.end_span(span_id, e, **extra)
+        raise
+    finally:
+        _manual_span.reset(token)
+    profiler.end_span(span_id, **extra)
+
+# ===== ENABLING =====
+
+# Profiler added to the callbacks of every run started in the current context
+_active_profiler: ContextVar[Optional[ChromeTraceProfiler]] = ContextVar(
+    "deep_research_profiler", default=ChromeTraceProfiler() if profile_dir else None
+)
+register_configure_hook(_active_profiler, inheritable=True)
+
+@contextmanager
+def profiling(out_dir: Union[str, Path]) -> Iterator[ChromeTraceProfiler]:
+    """Profile every run started inside the block, writing one trace file per top-level run to out_dir."""
+    profiler = ChromeTraceProfiler(out_dir)
+    token = _active_profiler.set(profiler)
+    try:
+        yield profiler
+    finally:
+        _active_profiler.reset(token)
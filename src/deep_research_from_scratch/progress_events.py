@@ -0,0 +1,156 @@
+"""Structured Progress Events.
+
+Researchers run concurrently inside a single supervisor step, so graph-level
+updates only arrive after every researcher has finished. This module publishes
+fine-grained progress events while the work is happening:
+
+    researcher_started, researcher_finished
+    search_issued, search_completed
+    page_summarized
+    compression_started, compression_finished
+    report_section_written, report_written
+    state_measured, memory_phase, memory_budget_exceeded (see memory_budget.py)
+
+Every event is a flat JSON-serializable dict with ``event``, ``ts`` (epoch
+seconds) and, where it applies, ``duration_s`` and token counts. Events go to:
+
+- The LangGraph custom stream: ``graph.astream(..., stream_mode="custom", subgraphs=True)``
+- A JSON-lines file when ``DEEP_RESEARCH_PROGRESS_LOG`` is set (or set_progress_sink is called)
+
+Emitting is cheap: outside a streaming run without a sink it is a couple of
+lookups. Set ``DEEP_RESEARCH_PROGRESS_EVENTS=false`` to turn events off entirely.
+Researchers running in worker processes do not stream their inner events.
+"""
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+from langchain_core.messages import AIMessage
+from langgraph.config import get_config, get_stream_writer
+from typing_extensions import Any, Iterator, Literal, Optional, Union
+
+# ===== CONFIGURATION =====
+
+progress_events_enabled = os.getenv("DEEP_RESEARCH_PROGRESS_EVENTS", "true").lower() not in ("0", "false", "no")
+
+# Configurable key under which LangGraph passes the stream of a run streamed with subgraphs
+STREAM_CONFIG_KEY = "__pregel_stream"
+
+ProgressEvent = Literal[
+    "researcher_started",
+    "researcher_finished",
+    "search_issued",
+    "search_completed",
+    "page_summarized",
+    "compression_started",
+    "compression_finished",
+    "report_section_written",
+    "report_written",
+    "state_measured",
+    "memory_phase",
+    "memory_budget_exceeded",
+]
+
+# ===== JSON-LINES SINK =====
+
+class JsonlProgressSink:
+    """Append progress events to a JSON-lines file, one event per line."""
+
+    def __init__(self, path: Union[str, Path]):
+        """Open the file for appending, creating parent directories as needed."""
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._file = open(self.path, "a", encoding="utf-8", buffering=1)
+
+    def write(self, event: dict) -> None:
+        """Write one event; line buffering makes it visible to tailing dashboards at once."""
+        line = json.dumps(event, ensure_ascii=False, default=str) + "\n"
+        with self._lock:
+            self._file.write(line)
+
+    def close(self) -> None:
+        """Close the file."""
+        with self._lock:
+            self._file.close()
+
+_sink: Optional[JsonlProgressSink] = (
+    JsonlProgressSink(os.environ["DEEP_RESEARCH_PROGRESS_LOG"]) if os.getenv("DEEP_RESEARCH_PROGRESS_LOG") else None
+)
+
+def set_progress_sink(path: Optional[Union[str, Path]]) -> None:
+    """Send events to a JSON-lines file from now on, or stop writing them with None."""
+    global _sink
+    if _sink is not None:
+        _sink.close()
+    _sink = JsonlProgressSink(path) if path else None
+
+# ===== EMITTING EVENTS =====
+
+def usage_fields(message: Any) -> dict:
+    """Token counts reported by a model response, if any."""
+    usage = getattr(message, "usage_metadata", None) if isinstance(message, AIMessage) else None
+    if not usage:
+        return {}
+    return {"input_tokens": usage.get("input_tokens", 0), "output_tokens": usage.get("output_tokens", 0)}
+
+def emit_progress(event: ProgressEvent, **fields: Any) -> None:
+    """Publish a progress event to the custom stream of the current run and to the sink.
+
+    Safe to call anywhere: outside a graph run only the sink (if any) receives it.
+    """
+    if not progress_events_enabled:
+        return
+    try:
+        config = get_config()
+        writer = get_stream_writer()
+    except (RuntimeError, KeyError):
+        config, writer = None, None
+    if writer is None and _sink is None:
+        return
+
+    payload = {"event": event, "ts": round(time.time(), 3), **fields}
+    thread_id = ((config or {}).get("configurable") or {}).get("thread_id")
+    if thread_id is not None:
+        payload["thread_id"] = thread_id
+    if writer is not None:
+        writer(payload)
+    if _sink is not None:
+        _sink.write(payload)
+
+def progress_consumers_active() -> bool:
+    """Return whether events reach anyone: the sink, or a run streaming custom events with subgraphs.
+
+    Used to skip work that only feeds events, such as measuring the graph state.
+    """
+    if not progress_events_enabled:
+        return False
+    if _sink is not None:
+        return True
+    try:
+        stream = (get_config().get("configurable") or {}).get(STREAM_CONFIG_KEY)
+    except RuntimeError:
+        return False
+    return "custom" in getattr(stream, "modes", ())
+
+@contextmanager
+def progress_span(started: Optional[ProgressEvent], finished: ProgressEvent, **fields: Any) -> Iterator[dict]:
+    """Emit a start event (if given) and a finish event with the elapsed time.
+
+    The yielded dict collects extra fields for the finish event, e.g. token counts.
+    If the block raises, the finish event carries the error type instead.
+    """
+    if started is not None:
+        emit_progress(started, **fields)
+    extra: dict = {}
+    start = time.perf_counter()
+    try:
+        yield extra
+    except BaseException as e:
+        emit_progress(finished, **fields, duration_s=round(time.perf_counter() - start, 3), error=type(e).__name__)
+        raise
+    emit_progress(finished, **fields, **extra, duration_s=round(time.perf_counter() - start, 3))
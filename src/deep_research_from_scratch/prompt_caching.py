@@ -0,0 +1,110 @@
+"""Provider Prompt Caching.
+
+The research loops resend the same large system prompt, tool definitions and
+growing conversation on every turn. Providers can serve that repeated prefix
+from a prompt cache, which lowers both latency and input cost:
+
+- Anthropic caches up to explicit ``cache_control`` breakpoints. This module
+  marks the system prompt and the newest message, so every turn reuses the
+  prefix written by the previous one.
+- OpenAI caches long prompts automatically when the prefix is byte-identical.
+  That only requires a stable message layout: static system prompt first, tools
+  in a fixed order, and new content appended at the end.
+
+Cache reads reported in ``usage_metadata`` are aggregated per role and model.
+"""
+
+import os
+import threading
+from collections import defaultdict
+
+from langchain_core.messages import AIMessage, BaseMessage, SystemMessage
+from typing_extensions import Any, List
+
+# ===== CONFIGURATION =====
+
+# Add Anthropic cache_control breakpoints unless disabled by the environment
+anthropic_prompt_caching = os.getenv("DEEP_RESEARCH_PROMPT_CACHING", "true").lower() not in ("0", "false", "no")
+
+CACHE_CONTROL = {"type": "ephemeral"}
+
+# ===== CACHE BREAKPOINTS =====
+
+def with_cache_control(message: BaseMessage) -> BaseMessage:
+    """Return a copy of a message whose last content block carries a cache breakpoint.
+
+    Messages without text content (e.g. a tool-call-only AI message) are returned unchanged.
+    """
+    content = message.content
+    if isinstance(content, str):
+        if not content:
+            return message
+        blocks = [{"type": "text", "text": content, "cache_control": CACHE_CONTROL}]
+    elif content and isinstance(content[-1], dict):
+        blocks = list(content[:-1]) + [{**content[-1], "cache_control": CACHE_CONTROL}]
+    else:
+        return message
+    return message.model_copy(update={"content": blocks})
+
+def add_cache_breakpoints(messages: Any) -> Any:
+    """Mark the system prompt and the newest cacheable message for Anthropic prompt caching.
+
+    The system breakpoint caches tools and system prompt across researchers; the
+    trailing breakpoint caches the conversation so far for the next turn. Inputs
+    that are not message lists are passed through.
+    """
+    if not isinstance(messages, list) or not all(isinstance(m, BaseMessage) for m in messages):
+        return messages
+
+    marked = list(messages)
+    if marked and isinstance(marked[0], SystemMessage):
+        marked[0] = with_cache_control(marked[0])
+    for index in range(len(marked) - 1, 0, -1):
+        if not isinstance(marked[index], SystemMessage) and marked[index].content:
+            marked[index] = with_cache_control(marked[index])
+            break
+    return marked
+
+# ===== CACHE METRICS =====
+
+class PromptCacheStats:
+    """Thread-safe totals of input tokens and cache reads per (role, model)."""
+
+    def __init__(self):
+        """Create empty counters."""
+        self._lock = threading.Lock()
+        self._totals: dict[tuple[str, str], dict[str, int]] = defaultdict(
+            lambda: {"calls": 0, "input_tokens": 0, "cache_read_tokens": 0, "cache_creation_tokens": 0}
+        )
+
+    def record(self, role: str, model: str, result: Any) -> None:
+        """Record the usage of a model response, if it reports any."""
+        usage = getattr(result, "usage_metadata", None) if isinstance(result, AIMessage) else None
+        if not usage:
+            return
+        details = usage.get("input_token_details") or {}
+        with self._lock:
+            totals = self._totals[(role, model)]
+            totals["calls"] += 1
+            totals["input_tokens"] += usage.get("input_tokens", 0)
+            totals["cache_read_tokens"] += details.get("cache_read", 0) or 0
+            totals["cache_creation_tokens"] += details.get("cache_creation", 0) or 0
+
+    def snapshot(self) -> List[dict]:
+        """Return per role and model totals with the share of input tokens read from cache."""
+        with self._lock:
+            return [
+                {
+                    "role": role,
+                    "model": model,
+                    **totals,
+                    "cache_hit_ratio": round(totals["cache_read_tokens"] / totals["input_tokens"], 4)
+                    if totals["input_tokens"] else 0.0,
+                }
+                for (role, model), totals in sorted(self._totals.items())
+            ]
+
+    def reset(self) -> None:
+        """Clear all counters."""
+        with self._lock:
+            self._totals.clear()
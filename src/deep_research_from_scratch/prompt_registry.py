@@ -0,0 +1,128 @@
+"""Prompt Registry.
+
+This module gives every prompt template in prompts.py a name and a stable
+version, and memoizes rendering so that nodes stop re-formatting the same
+large prompts on every invocation:
+
+- render_prompt / get_system_message render a template once per distinct set
+  of values (for example once per day and configuration) and return the cached
+  string or SystemMessage afterwards
+- partial_prompt fills in the static fields of a template (date, limits) once
+  and leaves the per-call fields (webpage content, messages) for a cheap
+  final ``str.format``
+- prompt_version is a short hash of a template's text, so caches of model
+  outputs (summaries, research results) can include it in their keys and be
+  invalidated automatically whenever the prompt changes
+"""
+
+import hashlib
+from functools import cache, lru_cache
+from string import Formatter
+
+from langchain_core.messages import SystemMessage
+from typing_extensions import Any
+
+from deep_research_from_scratch import prompts
+
+# ===== REGISTRY =====
+
+PROMPTS: dict[str, str] = {
+    "clarify_with_user_instructions": prompts.clarify_with_user_instructions,
+    "transform_messages_into_research_topic_prompt": prompts.transform_messages_into_research_topic_prompt,
+    "scope_research_prompt": prompts.scope_research_prompt,
+    "research_agent_prompt": prompts.research_agent_prompt,
+    "summarize_webpage_prompt": prompts.summarize_webpage_prompt,
+    "query_focused_summarize_prompt": prompts.query_focused_summarize_prompt,
+    "research_agent_prompt_with_mcp": prompts.research_agent_prompt_with_mcp,
+    "lead_researcher_prompt": prompts.lead_researcher_prompt,
+    "lead_researcher_prompt_speculative": prompts.lead_researcher_prompt + prompts.speculative_research_instructions,
+    "lead_researcher_prompt_memory": prompts.lead_researcher_prompt + prompts.research_memory_instructions,
+    "lead_researcher_prompt_speculative_memory": (
+        prompts.lead_researcher_prompt + prompts.speculative_research_instructions + prompts.research_memory_instructions
+    ),
+    "compress_research_system_prompt": prompts.compress_research_system_prompt,
+    "compress_research_human_message": prompts.compress_research_human_message,
+    "final_report_generation_prompt": prompts.final_report_generation_prompt,
+}
+
+# Number of rendered prompts kept per cache; entries for earlier days age out
+render_cache_size = 256
+
+def get_template(name: str) -> str:
+    """Return a registered template.
+
+    Raises:
+        KeyError: If no prompt is registered under the name
+    """
+    try:
+        return PROMPTS[name]
+    except KeyError:
+        raise KeyError(f"Unknown prompt '{name}'") from None
+
+@cache
+def prompt_version(name: str) -> str:
+    """Return a short, stable hash of a template's text."""
+    return hashlib.sha256(get_template(name).encode("utf-8")).hexdigest()[:12]
+
+def prompt_versions() -> dict[str, str]:
+    """Return the version of every registered prompt."""
+    return {name: prompt_version(name) for name in PROMPTS}
+
+def template_fields(name: str) -> set[str]:
+    """Return the names of the fields a template expects."""
+    return {field for _, field, _, _ in Formatter().parse(get_template(name)) if field}
+
+# ===== RENDERING =====
+
+def _escape(text: str) -> str:
+    """Escape braces so text survives a later str.format call."""
+    return text.replace("{", "{{").replace("}", "}}")
+
+@lru_cache(maxsize=render_cache_size)
+def _partial(name: str, values: tuple[tuple[str, Any], ...]) -> str:
+    """Fill in the given fields of a template and keep the others as placeholders."""
+    known = dict(values)
+    parts = []
+    for literal, field, spec, conversion in Formatter().parse(get_template(name)):
+        parts.append(_escape(literal))
+        if field is None:
+            continue
+        if field in known:
+            parts.append(_escape(format(known[field], spec or "")))
+        else:
+            parts.append("{" + field + (f"!{conversion}" if conversion else "") + (f":{spec}" if spec else "") + "}")
+    return "".join(parts)
+
+def partial_prompt(name: str, **values: Any) -> str:
+    """Pre-render the static fields of a template.
+
+    The result is itself a template for the remaining fields and is memoized per
+    distinct set of values, e.g. ``partial_prompt("summarize_webpage_prompt", date=today)``
+    is built once per day.
+    """
+    return _partial(name, tuple(sorted(values.items())))
+
+@lru_cache(maxsize=render_cache_size)
+def _render(name: str, values: tuple[tuple[str, Any], ...]) -> str:
+    """Render a template with all of its fields."""
+    return get_template(name).format(**dict(values))
+
+def render_prompt(name: str, **values: Any) -> str:
+    """Render a template, reusing the cached result for identical values.
+
+    Values must be hashable. Use this for prompts whose fields change rarely
+    (date, configuration limits); use partial_prompt for per-call content.
+    """
+    return _render(name, tuple(sorted(values.items())))
+
+@lru_cache(maxsize=render_cache_size)
+def _system_message(name: str, values: tuple[tuple[str, Any], ...]) -> SystemMessage:
+    """Build the SystemMessage for a rendered template."""
+    return SystemMessage(content=_render(name, values))
+
+def get_system_message(name: str, **values: Any) -> SystemMessage:
+    """Return a memoized SystemMessage for a rendered template.
+
+    The same message object is returned for identical values, so it must not be mutated.
+    """
+    return _system_message(name, tuple(sorted(values.items())))
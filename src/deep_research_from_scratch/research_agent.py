@@ -5,32 +5,70 @@ This module implements a research agent that can perform iterative web searches
 and synthesis to answer complex research questions.
 """
 
+import asyncio
+import logging
+from contextlib import contextmanager
+
 from pydantic import BaseModel, Field
-from typing_extensions import Literal
+from typing_extensions import Iterator, Literal
 
 from langgraph.graph import StateGraph, START, END
-from langchain_core.messages import SystemMessage, HumanMessage, ToolMessage, filter_messages
-from langchain.chat_models import init_chat_model
-
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage, filter_messages
+from langchain_core.runnables import RunnableConfig, RunnableLambda
+
+from deep_research_from_scratch.blob_store import spill_text
+from deep_research_from_scratch.compact_messages import compact_tool_message, drop_search_artifact, render_messages
+from deep_research_from_scratch.configuration import Configuration
+from deep_research_from_scratch.memory_budget import enforce_memory_budget, memory_phase
+from deep_research_from_scratch.model_router import get_model
+from deep_research_from_scratch.progress_events import progress_span, usage_fields
 from deep_research_from_scratch.state_research import ResearcherState, ResearcherOutputState
-from deep_research_from_scratch.utils import tavily_search, get_today_str, think_tool
-from deep_research_from_scratch.prompts import research_agent_prompt, compress_research_system_prompt, compress_research_human_message
+from deep_research_from_scratch.utils import adaptive_tavily_search, tavily_search, get_today_str, think_tool
+from deep_research_from_scratch.prompt_registry import get_system_message, render_prompt
+
+logger = logging.getLogger(__name__)
 
 # ===== CONFIGURATION =====
 
-# Set up tools and model binding
+# Set up tools and model binding. Adaptive search mode binds a tavily_search schema
+# that also offers fetch_full_content; both schemas run the same tool.
 tools = [tavily_search, think_tool]
+adaptive_tools = [adaptive_tavily_search, think_tool]
 tools_by_name = {tool.name: tool for tool in tools}
 
 # Initialize models
-model = init_chat_model(model="openai:gpt-4.1")
-model_with_tools = model.bind_tools(tools)
-summarization_model = init_chat_model(model="openai:gpt-4.1-mini")
-compress_model = init_chat_model(model="openai:gpt-4.1", max_tokens=32000) # model="anthropic:claude-sonnet-4-20250514", max_tokens=64000
+model_with_tools = get_model("research", lambda model: model.bind_tools(tools))
+adaptive_model_with_tools = get_model("research", lambda model: model.bind_tools(adaptive_tools))
+compress_model = get_model("compress")
 
 # ===== AGENT NODES =====
 
-def llm_call(state: ResearcherState):
+def compress_messages(state: ResearcherState, researcher_messages: list) -> list:
+    """Build the compression prompt: cached system prompt, the research, then the topic-specific request."""
+    return (
+        [get_system_message("compress_research_system_prompt", date=get_today_str())]
+        + researcher_messages
+        + [HumanMessage(content=render_prompt("compress_research_human_message", research_topic=state.get("research_topic", "")))]
+    )
+
+@contextmanager
+def compression_span(state: ResearcherState) -> Iterator[dict]:
+    """Report progress and track memory around one compression call; yields the progress event fields."""
+    topic = state.get("research_topic", "")
+    with progress_span("compression_started", "compression_finished", topic=topic) as progress, memory_phase("compress_research", topic=topic):
+        yield progress
+
+def tool_error_message(tool_call: dict, error: Exception) -> ToolMessage:
+    """Report a failed tool call to the model instead of failing the whole researcher."""
+    logger.warning("Tool %s failed: %r", tool_call["name"], error)
+    return ToolMessage(
+        content=f"Error: {tool_call['name']} failed ({type(error).__name__}: {error}). Try again later or continue without it.",
+        name=tool_call["name"],
+        tool_call_id=tool_call["id"],
+        status="error",
+    )
+
+def llm_call(state: ResearcherState, config: RunnableConfig):
     """Analyze current state and decide on next actions.
 
     The model analyzes the current conversation state and decides whether to:
@@ -39,15 +77,35 @@ def llm_call(state: ResearcherState):
 
     Returns updated state with the model's response.
     """
+    configuration = Configuration.from_runnable_config(config)
+    messages = render_messages(
+        state["researcher_messages"], configuration.search_output_format, configuration.search_output_max_tokens
+    )
+    model = adaptive_model_with_tools if configuration.search_depth == "adaptive" else model_with_tools
+    return {
+        "researcher_messages": [
+            model.invoke(
+                [get_system_message("research_agent_prompt", date=get_today_str())] + messages
+            )
+        ]
+    }
+
+async def allm_call(state: ResearcherState, config: RunnableConfig):
+    """Async counterpart of llm_call that awaits the model instead of blocking a thread."""
+    configuration = Configuration.from_runnable_config(config)
+    messages = render_messages(
+        state["researcher_messages"], configuration.search_output_format, configuration.search_output_max_tokens
+    )
+    model = adaptive_model_with_tools if configuration.search_depth == "adaptive" else model_with_tools
     return {
         "researcher_messages": [
-            model_with_tools.invoke(
-                [SystemMessage(content=research_agent_prompt)] + state["researcher_messages"]
+            await model.ainvoke(
+                [get_system_message("research_agent_prompt", date=get_today_str())] + messages
             )
         ]
     }
 
-def tool_node(state: ResearcherState):
+def tool_node(state: ResearcherState, config: RunnableConfig):
     """Execute all tool calls from the previous LLM response.
 
     Executes all tool calls from the previous LLM responses.
@@ -55,46 +113,109 @@ def tool_node(state: ResearcherState):
     """
     tool_calls = state["researcher_messages"][-1].tool_calls
 
-    # Execute all tool calls
-    observations = []
-    for tool_call in tool_calls:
+    # Execute all tool calls. Invoking a tool with the full tool call returns a
+    # ToolMessage that also carries the tool's structured artifact, if any.
+    def execute(tool_call):
         tool = tools_by_name[tool_call["name"]]
-        observations.append(tool.invoke(tool_call["args"]))
+        if tool_call["name"] == "tavily_search" and state.get("research_topic"):
+            # Inject the researcher's topic so summaries can be focused on it
+            tool_call = {**tool_call, "args": {**tool_call["args"], "research_topic": state["research_topic"]}}
+        try:
+            return tool.invoke(tool_call)
+        except Exception as e:
+            return tool_error_message(tool_call, e)
+
+    with memory_phase("researcher_tools", topic=state.get("research_topic", "")):
+        tool_outputs = [execute(tool_call) for tool_call in tool_calls]
 
-    # Create tool message outputs
-    tool_outputs = [
-        ToolMessage(
-            content=observation,
-            name=tool_call["name"],
-            tool_call_id=tool_call["id"]
-        ) for observation, tool_call in zip(observations, tool_calls)
-    ]
+    return tool_node_update(state, config, tool_outputs)
 
-    return {"researcher_messages": tool_outputs}
+async def atool_node(state: ResearcherState, config: RunnableConfig):
+    """Execute all tool calls from the previous LLM response concurrently.
 
-def compress_research(state: ResearcherState) -> dict:
+    Async counterpart of tool_node: tools with a native coroutine (tavily_search)
+    run on the event loop, cheap synchronous tools (think_tool) run inline.
+    """
+    tool_calls = state["researcher_messages"][-1].tool_calls
+
+    async def execute(tool_call):
+        tool = tools_by_name[tool_call["name"]]
+        if tool_call["name"] == "tavily_search" and state.get("research_topic"):
+            # Inject the researcher's topic so summaries can be focused on it
+            tool_call = {**tool_call, "args": {**tool_call["args"], "research_topic": state["research_topic"]}}
+        try:
+            if tool.coroutine is not None:
+                return await tool.ainvoke(tool_call)
+            return tool.invoke(tool_call)
+        except Exception as e:
+            # One failed search must not discard the results of the others
+            return tool_error_message(tool_call, e)
+
+    with memory_phase("researcher_tools", topic=state.get("research_topic", "")):
+        tool_outputs = list(await asyncio.gather(*[execute(tool_call) for tool_call in tool_calls]))
+
+    return tool_node_update(state, config, tool_outputs)
+
+def tool_node_update(state: ResearcherState, config: RunnableConfig, tool_outputs: list) -> dict:
+    """State update for tool outputs: compacted in compact mode, and the history too when over the memory budget."""
+    configuration = Configuration.from_runnable_config(config)
+
+    # Keep large outputs out of state in compact mode
+    if configuration.compact_tool_messages:
+        tool_outputs = [compact_tool_message(message) for message in tool_outputs]
+    else:
+        # The structured search artifact only feeds compaction; kept next to the
+        # rendered content it would store every search result twice
+        tool_outputs = [drop_search_artifact(message) for message in tool_outputs]
+
+    return enforce_memory_budget(
+        "researcher_tools", state, {"researcher_messages": tool_outputs}, configuration,
+        message_fields=["researcher_messages"],
+    )
+
+def compress_research(state: ResearcherState, config: RunnableConfig) -> dict:
     """Compress research findings into a concise summary.
 
     Takes all the research messages and tool outputs and creates
     a compressed summary suitable for the supervisor's decision-making.
     """
-
-    system_message = compress_research_system_prompt.format(date=get_today_str())
-    messages = [SystemMessage(content=system_message)] + state.get("researcher_messages", []) + [HumanMessage(content=compress_research_human_message)]
-    response = compress_model.invoke(messages)
+    researcher_messages = render_messages(state.get("researcher_messages", []))
+    with compression_span(state) as progress:
+        response = compress_model.invoke(compress_messages(state, researcher_messages))
+        progress.update(usage_fields(response))
+    return compress_research_update(state, config, response, researcher_messages)
+
+async def acompress_research(state: ResearcherState, config: RunnableConfig) -> dict:
+    """Async counterpart of compress_research."""
+    researcher_messages = render_messages(state.get("researcher_messages", []))
+    with compression_span(state) as progress:
+        response = await compress_model.ainvoke(compress_messages(state, researcher_messages))
+        progress.update(usage_fields(response))
+    return compress_research_update(state, config, response, researcher_messages)
+
+def compress_research_update(
+    state: ResearcherState, config: RunnableConfig, response: AIMessage, researcher_messages: list
+) -> dict:
+    """State update for compressed research and the raw note taken from the researcher messages.
+
+    The raw note is spilled in spill mode or when over the memory budget.
+    """
+    configuration = Configuration.from_runnable_config(config)
+    compressed_research = str(response.content)
 
     # Extract raw notes from tool and AI messages
-    raw_notes = [
+    raw_note = "\n".join(
         str(m.content) for m in filter_messages(
-            state["researcher_messages"], 
+            researcher_messages,
             include_types=["tool", "ai"]
         )
-    ]
-
-    return {
-        "compressed_research": str(response.content),
-        "raw_notes": ["\n".join(raw_notes)]
-    }
+    )
+    if configuration.spill_raw_notes:
+        raw_note = spill_text(raw_note)
+    return enforce_memory_budget(
+        "compress_research", state, {"compressed_research": compressed_research, "raw_notes": [raw_note]},
+        configuration, note_fields=["raw_notes"],
+    )
 
 # ===== ROUTING LOGIC =====
 
@@ -122,10 +243,12 @@ def should_continue(state: ResearcherState) -> Literal["tool_node", "compress_re
 # Build the agent workflow
 agent_builder = StateGraph(ResearcherState, output_schema=ResearcherOutputState)
 
-# Add nodes to the graph
-agent_builder.add_node("llm_call", llm_call)
-agent_builder.add_node("tool_node", tool_node)
-agent_builder.add_node("compress_research", compress_research)
+# Add nodes to the graph. Each node carries a sync and an async implementation:
+# invoke() runs the sync path, while ainvoke() (used by the supervisor and the
+# LangGraph server) stays on the event loop instead of occupying executor threads.
+agent_builder.add_node("llm_call", RunnableLambda(llm_call, afunc=allm_call))
+agent_builder.add_node("tool_node", RunnableLambda(tool_node, afunc=atool_node))
+agent_builder.add_node("compress_research", RunnableLambda(compress_research, afunc=acompress_research))
 
 # Add edges to connect nodes
 agent_builder.add_edge(START, "llm_call")
@@ -141,4 +264,4 @@ agent_builder.add_edge("tool_node", "llm_call") # Loop back for more research
 agent_builder.add_edge("compress_research", END)
 
 # Compile the agent
-researcher_agent = agent_builder.compile()
+researcher_agent = agent_builder.compile(name="research_agent")
@@ -12,19 +12,31 @@ The system orchestrates the complete research workflow from initial user
 input through final report delivery.
 """
 
+import re
+
 from langchain_core.messages import HumanMessage
 from langgraph.graph import StateGraph, START, END
 
+from deep_research_from_scratch.blob_store import load_notes
+from deep_research_from_scratch.memory_budget import measure_state, memory_phase
+from deep_research_from_scratch.model_router import get_model
+from deep_research_from_scratch.progress_events import (
+    emit_progress,
+    progress_consumers_active,
+    progress_span,
+    usage_fields,
+)
 from deep_research_from_scratch.utils import get_today_str
-from deep_research_from_scratch.prompts import final_report_generation_prompt
+from deep_research_from_scratch.prompt_registry import partial_prompt
 from deep_research_from_scratch.state_scope import AgentState, AgentInputState
 from deep_research_from_scratch.research_agent_scope import clarify_with_user, write_research_brief
 from deep_research_from_scratch.multi_agent_supervisor import supervisor_agent
 
 # ===== Config =====
 
-from langchain.chat_models import init_chat_model
-writer_model = init_chat_model(model="openai:gpt-4.1", max_tokens=32000) # model="anthropic:claude-sonnet-4-20250514", max_tokens=64000
+writer_model = get_model("write")
+
+SECTION_HEADING = re.compile(r"^#{1,3} +(.+)$", re.MULTILINE)
 
 # ===== FINAL REPORT GENERATION =====
 
@@ -37,23 +49,42 @@ async def final_report_generation(state: AgentState):
     Synthesizes all research findings into a comprehensive final report
     """
 
-    notes = state.get("notes", [])
+    if progress_consumers_active():
+        measure_state("final_report_generation", state)
+
+    # Notes spilled under the memory budget are loaded back for the writer
+    notes = load_notes(state.get("notes", []))
 
     findings = "\n".join(notes)
 
-    final_report_prompt = final_report_generation_prompt.format(
+    final_report_prompt = partial_prompt("final_report_generation_prompt", date=get_today_str()).format(
         research_brief=state.get("research_brief", ""),
         findings=findings,
-        date=get_today_str()
     )
 
-    final_report = await writer_model.ainvoke([HumanMessage(content=final_report_prompt)])
+    with progress_span(None, "report_written") as progress, memory_phase("final_report_generation"):
+        final_report = await writer_model.ainvoke([HumanMessage(content=final_report_prompt)])
+        progress.update(usage_fields(final_report), chars=len(final_report.content))
+        emit_report_sections(final_report.content)
 
     return {
         "final_report": final_report.content, 
         "messages": ["Here is the final report: " + final_report.content],
     }
 
+def emit_report_sections(report: str) -> None:
+    """Publish a report_section_written event for each heading-delimited section of the report."""
+    headings = list(SECTION_HEADING.finditer(report))
+    for index, heading in enumerate(headings):
+        end = headings[index + 1].start() if index + 1 < len(headings) else len(report)
+        emit_progress(
+            "report_section_written",
+            section=heading.group(1).strip(),
+            index=index,
+            sections=len(headings),
+            chars=end - heading.start(),
+        )
+
 # ===== GRAPH CONSTRUCTION =====
 # Build the overall workflow
 deep_researcher_builder = StateGraph(AgentState, input_schema=AgentInputState)
@@ -71,4 +102,4 @@ deep_researcher_builder.add_edge("supervisor_subgraph", "final_report_generation
 deep_researcher_builder.add_edge("final_report_generation", END)
 
 # Compile the full workflow
-agent = deep_researcher_builder.compile()
+agent = deep_researcher_builder.compile(name="research_agent_full")
@@ -18,12 +18,17 @@ import os
 
 from typing_extensions import Literal
 
-from langchain.chat_models import init_chat_model
-from langchain_core.messages import SystemMessage, HumanMessage, ToolMessage, filter_messages
+from langchain_core.messages import HumanMessage, ToolMessage, filter_messages
+from langchain_core.runnables import RunnableConfig
 from langchain_mcp_adapters.client import MultiServerMCPClient
 from langgraph.graph import StateGraph, START, END
 
-from deep_research_from_scratch.prompts import research_agent_prompt_with_mcp, compress_research_system_prompt, compress_research_human_message
+from deep_research_from_scratch.blob_store import spill_text
+from deep_research_from_scratch.configuration import Configuration
+from deep_research_from_scratch.local_files import grep_document, read_document_lines, read_document_window
+from deep_research_from_scratch.local_index import search_local_documents
+from deep_research_from_scratch.model_router import get_model
+from deep_research_from_scratch.prompt_registry import get_system_message, render_prompt
 from deep_research_from_scratch.state_research import ResearcherState, ResearcherOutputState
 from deep_research_from_scratch.utils import get_today_str, think_tool, get_current_dir
 
@@ -42,6 +47,9 @@ mcp_config = {
     }
 }
 
+# Local tools served in-process alongside the MCP tools
+local_tools = [search_local_documents, read_document_lines, read_document_window, grep_document, think_tool]
+
 # Global client variable - will be initialized lazily
 _client = None
 
@@ -53,8 +61,7 @@ def get_mcp_client():
     return _client
 
 # Initialize models
-compress_model = init_chat_model(model="openai:gpt-4.1", max_tokens=32000)
-model = init_chat_model(model="anthropic:claude-sonnet-4-20250514")
+compress_model = get_model("compress")
 
 # ===== AGENT NODES =====
 
@@ -72,17 +79,18 @@ async def llm_call(state: ResearcherState):
     client = get_mcp_client()
     mcp_tools = await client.get_tools()
 
-    # Use MCP tools for local document access
-    tools = mcp_tools + [think_tool]
+    # Use MCP tools and the local document index for local document access.
+    # Tools are sorted so the cached prompt prefix (tool definitions) is identical every turn.
+    tools = sorted(mcp_tools, key=lambda tool: tool.name) + local_tools
 
     # Initialize model with tool binding
-    model_with_tools = model.bind_tools(tools)
+    model_with_tools = get_model("research_mcp", lambda model: model.bind_tools(tools))
 
     # Process user input with system prompt
     return {
         "researcher_messages": [
             model_with_tools.invoke(
-                [SystemMessage(content=research_agent_prompt_with_mcp.format(date=get_today_str()))] + state["researcher_messages"]
+                [get_system_message("research_agent_prompt_with_mcp", date=get_today_str())] + state["researcher_messages"]
             )
         ]
     }
@@ -105,19 +113,17 @@ async def tool_node(state: ResearcherState):
         # Get fresh tool references from MCP server
         client = get_mcp_client()
         mcp_tools = await client.get_tools()
-        tools = mcp_tools + [think_tool]
+        tools = mcp_tools + local_tools
         tools_by_name = {tool.name: tool for tool in tools}
 
         # Execute tool calls (sequentially for reliability)
         observations = []
         for tool_call in tool_calls:
             tool = tools_by_name[tool_call["name"]]
-            if tool_call["name"] == "think_tool":
-                # think_tool is sync, use regular invoke
-                observation = tool.invoke(tool_call["args"])
-            else:
-                # MCP tools are async, use ainvoke
-                observation = await tool.ainvoke(tool_call["args"])
+            # MCP tools and search_local_documents are async; the remaining local
+            # tools are sync and ainvoke runs them in a worker thread, so none of
+            # them blocks the event loop
+            observation = await tool.ainvoke(tool_call["args"])
             observations.append(observation)
 
         # Format results as tool messages
@@ -136,7 +142,7 @@ async def tool_node(state: ResearcherState):
 
     return {"researcher_messages": messages}
 
-def compress_research(state: ResearcherState) -> dict:
+def compress_research(state: ResearcherState, config: RunnableConfig) -> dict:
     """Compress research findings into a concise summary.
 
     Takes all the research messages and tool outputs and creates
@@ -146,8 +152,11 @@ def compress_research(state: ResearcherState) -> dict:
     file-based research content from MCP tools.
     """
 
-    system_message = compress_research_system_prompt.format(date=get_today_str())
-    messages = [SystemMessage(content=system_message)] + state.get("researcher_messages", []) + [HumanMessage(content=compress_research_human_message)]
+    messages = (
+        [get_system_message("compress_research_system_prompt", date=get_today_str())]
+        + state.get("researcher_messages", [])
+        + [HumanMessage(content=render_prompt("compress_research_human_message", research_topic=state.get("research_topic", "")))]
+    )
 
     response = compress_model.invoke(messages)
 
@@ -159,9 +168,13 @@ def compress_research(state: ResearcherState) -> dict:
         )
     ]
 
+    raw_note = "\n".join(raw_notes)
+    if Configuration.from_runnable_config(config).spill_raw_notes:
+        raw_note = spill_text(raw_note)
+
     return {
         "compressed_research": str(response.content),
-        "raw_notes": ["\n".join(raw_notes)]
+        "raw_notes": [raw_note]
     }
 
 # ===== ROUTING LOGIC =====
@@ -205,4 +218,4 @@ agent_builder_mcp.add_edge("tool_node", "llm_call")  # Loop back for more proces
 agent_builder_mcp.add_edge("compress_research", END)
 
 # Compile the agent
-agent_mcp = agent_builder_mcp.compile()
+agent_mcp = agent_builder_mcp.compile(name="research_agent_mcp")
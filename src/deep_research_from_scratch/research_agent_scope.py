@@ -7,18 +7,28 @@ This module implements the scoping phase of the research workflow, where we:
 
 The workflow uses structured output to make deterministic decisions about
 whether sufficient context exists to proceed with research.
+
+Scoping normally takes two sequential model calls. With ``scoping_mode``
+"single_call", one call returns the clarification decision and the research
+brief together, and write_research_brief passes the brief on without calling
+the model. With ``scope_cache`` enabled, a conversation that was scoped before
+skips the model calls entirely (see scope_cache.py).
 """
 
 from datetime import datetime
-from typing_extensions import Literal
+from typing_extensions import Literal, Optional, Sequence
 
-from langchain.chat_models import init_chat_model
-from langchain_core.messages import HumanMessage, AIMessage, get_buffer_string
+from langchain_core.messages import BaseMessage, HumanMessage, AIMessage, get_buffer_string
+from langchain_core.runnables import RunnableConfig
 from langgraph.graph import StateGraph, START, END
 from langgraph.types import Command
 
-from deep_research_from_scratch.prompts import clarify_with_user_instructions, transform_messages_into_research_topic_prompt
-from deep_research_from_scratch.state_scope import AgentState, ClarifyWithUser, ResearchQuestion, AgentInputState
+from deep_research_from_scratch.configuration import Configuration
+from deep_research_from_scratch.model_router import get_model
+from deep_research_from_scratch.profiling import profile_span
+from deep_research_from_scratch.prompt_registry import partial_prompt
+from deep_research_from_scratch.scope_cache import get_scope_cache
+from deep_research_from_scratch.state_scope import AgentState, ClarifyWithUser, ResearchQuestion, ScopeResearch, AgentInputState
 
 # ===== UTILITY FUNCTIONS =====
 
@@ -26,65 +36,123 @@ def get_today_str() -> str:
     """Get current date in a human-readable format."""
     return datetime.now().strftime("%a %b %#d, %Y")
 
-# ===== CONFIGURATION =====
+def scoping_conversation(messages: Sequence[BaseMessage]) -> list[BaseMessage]:
+    """Return the conversation being scoped: messages up to the user's latest one.
 
-# Initialize model
-model = init_chat_model(model="openai:gpt-4.1-mini", temperature=0.0)
+    write_research_brief sees the verification message as well, so both nodes
+    cut it off to agree on the cache key.
+    """
+    messages = list(messages)
+    for index in range(len(messages) - 1, -1, -1):
+        if isinstance(messages[index], HumanMessage):
+            return messages[:index + 1]
+    return messages
+
+def lookup_scope(conversation: list[BaseMessage], configuration: Configuration) -> Optional[ScopeResearch]:
+    """Return the cached scoping result of a conversation when the scope cache is enabled."""
+    if not configuration.scope_cache:
+        return None
+    with profile_span("scope_cache_lookup", "cache") as span:
+        cached = get_scope_cache().lookup(conversation, configuration.scope_cache_max_age_hours * 3600)
+        span["hit"] = cached is not None
+    return cached
+
+def store_scope(conversation: list[BaseMessage], result: ScopeResearch, configuration: Configuration) -> None:
+    """Cache a complete scoping result (a question, or a brief) when the scope cache is enabled."""
+    if not configuration.scope_cache or not (result.need_clarification or result.research_brief):
+        return
+    cache = get_scope_cache()
+    cache.store(conversation, result)
+    cache.purge(configuration.scope_cache_max_age_hours * 3600)
+
+def scope_command(result: ScopeResearch) -> Command[Literal["write_research_brief", "__end__"]]:
+    """Route on a scoping decision; a brief that is already known is handed to write_research_brief."""
+    if result.need_clarification:
+        return Command(
+            goto=END,
+            update={"messages": [AIMessage(content=result.question)]}
+        )
+    return Command(
+        goto="write_research_brief",
+        # Reset a brief left in the thread's state by an earlier turn
+        update={"messages": [AIMessage(content=result.verification)], "research_brief": result.research_brief or None}
+    )
 
 # ===== WORKFLOW NODES =====
 
-def clarify_with_user(state: AgentState) -> Command[Literal["write_research_brief", "__end__"]]:
+def clarify_with_user(state: AgentState, config: RunnableConfig) -> Command[Literal["write_research_brief", "__end__"]]:
     """
     Determine if the user's request contains sufficient information to proceed with research.
 
     Uses structured output to make deterministic decisions and avoid hallucination.
     Routes to either research brief generation or ends with a clarification question.
+    In single-call mode the same call also writes the research brief.
     """
-    # Set up structured output model
-    structured_output_model = model.with_structured_output(ClarifyWithUser)
+    configuration = Configuration.from_runnable_config(config)
+    conversation = scoping_conversation(state["messages"])
+
+    # Repeated and templated requests skip scoping entirely
+    cached = lookup_scope(conversation, configuration)
+    if cached is not None:
+        return scope_command(cached)
+
+    messages = get_buffer_string(messages=state["messages"])
+    if configuration.scoping_mode == "single_call":
+        # Clarification decision and research brief from one model call
+        structured_output_model = get_model("scope", lambda model: model.with_structured_output(ScopeResearch))
+        result = structured_output_model.invoke([
+            HumanMessage(content=partial_prompt("scope_research_prompt", date=get_today_str()).format(messages=messages))
+        ])
+    else:
+        # Set up structured output model
+        structured_output_model = get_model("scope", lambda model: model.with_structured_output(ClarifyWithUser))
 
-    # Invoke the model with clarification instructions
-    response = structured_output_model.invoke([
-        HumanMessage(content=clarify_with_user_instructions.format(
-            messages=get_buffer_string(messages=state["messages"]), 
-            date=get_today_str()
-        ))
-    ])
+        # Invoke the model with clarification instructions
+        response = structured_output_model.invoke([
+            HumanMessage(content=partial_prompt("clarify_with_user_instructions", date=get_today_str()).format(
+                messages=messages,
+            ))
+        ])
+        result = ScopeResearch(**response.model_dump(), research_brief="")
 
     # Route based on clarification need
-    if response.need_clarification:
-        return Command(
-            goto=END, 
-            update={"messages": [AIMessage(content=response.question)]}
-        )
-    else:
-        return Command(
-            goto="write_research_brief", 
-            update={"messages": [AIMessage(content=response.verification)]}
-        )
+    store_scope(conversation, result, configuration)
+    return scope_command(result)
 
-def write_research_brief(state: AgentState):
+def write_research_brief(state: AgentState, config: RunnableConfig):
     """
     Transform the conversation history into a comprehensive research brief.
 
     Uses structured output to ensure the brief follows the required format
-    and contains all necessary details for effective research.
+    and contains all necessary details for effective research. A brief that
+    clarify_with_user already produced (single-call mode or a cache hit) is
+    passed on without calling the model.
     """
-    # Set up structured output model
-    structured_output_model = model.with_structured_output(ResearchQuestion)
-
-    # Generate research brief from conversation history
-    response = structured_output_model.invoke([
-        HumanMessage(content=transform_messages_into_research_topic_prompt.format(
-            messages=get_buffer_string(state.get("messages", [])),
-            date=get_today_str()
-        ))
-    ])
+    research_brief = state.get("research_brief")
+    if not research_brief:
+        # Set up structured output model
+        structured_output_model = get_model("scope", lambda model: model.with_structured_output(ResearchQuestion))
+
+        # Generate research brief from conversation history
+        response = structured_output_model.invoke([
+            HumanMessage(content=partial_prompt("transform_messages_into_research_topic_prompt", date=get_today_str()).format(
+                messages=get_buffer_string(state.get("messages", [])),
+            ))
+        ])
+        research_brief = response.research_brief
+
+        messages = state.get("messages", [])
+        verification = messages[-1].content if messages and isinstance(messages[-1], AIMessage) else ""
+        store_scope(
+            scoping_conversation(messages),
+            ScopeResearch(need_clarification=False, question="", verification=str(verification), research_brief=research_brief),
+            Configuration.from_runnable_config(config),
+        )
 
     # Update state with generated research brief and pass it to the supervisor
     return {
-        "research_brief": response.research_brief,
-        "supervisor_messages": [HumanMessage(content=f"{response.research_brief}.")]
+        "research_brief": research_brief,
+        "supervisor_messages": [HumanMessage(content=f"{research_brief}.")]
     }
 
 # ===== GRAPH CONSTRUCTION =====
@@ -101,4 +169,4 @@ deep_researcher_builder.add_edge(START, "clarify_with_user")
 deep_researcher_builder.add_edge("write_research_brief", END)
 
 # Compile the workflow
-scope_research = deep_researcher_builder.compile()
+scope_research = deep_researcher_builder.compile(name="scope_research")
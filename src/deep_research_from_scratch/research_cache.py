@@ -0,0 +1,236 @@
+"""Semantic Cache for Sub-Agent Research.
+
+Follow-up runs on similar briefs tend to delegate nearly identical research
+topics again. This module caches researcher outputs on disk and serves them
+for topics that are semantically close to one researched before:
+
+- Topics are embedded locally (see local_embeddings.py); no hosted API is called
+- A cached result is returned when its topic's cosine similarity reaches the
+  threshold and it is younger than the freshness window
+- Entries are keyed on the embedder, the version of the research prompts, the
+  search provider and the models of the researcher's roles, so changing any of
+  them invalidates the cache automatically
+
+The cache is a single SQLite file, safe to share between worker processes and
+concurrent runs.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from array import array
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+
+from typing_extensions import Iterator, List, Optional
+
+from deep_research_from_scratch.local_embeddings import Embedder, get_local_embedder
+from deep_research_from_scratch.model_router import get_role_models
+from deep_research_from_scratch.prompt_registry import prompt_version
+from deep_research_from_scratch.storage_dirs import user_cache_dir
+
+# ===== CONFIGURATION =====
+
+# SQLite file in the per-user cache directory unless overridden by the environment
+default_cache_path = Path(os.getenv(
+    "DEEP_RESEARCH_RESEARCH_CACHE_PATH",
+    user_cache_dir() / "research_cache.sqlite",
+))
+
+# Prompts whose text shapes a researcher's output
+RESEARCH_PROMPTS = (
+    "research_agent_prompt",
+    "summarize_webpage_prompt",
+    "query_focused_summarize_prompt",
+    "compress_research_system_prompt",
+    "compress_research_human_message",
+)
+
+# Model roles whose models shape a researcher's output
+RESEARCH_ROLES = ("research", "summarize", "compress")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS research_cache (
+    id INTEGER PRIMARY KEY,
+    topic TEXT NOT NULL,
+    embedder TEXT NOT NULL,
+    prompt_version TEXT NOT NULL,
+    search_provider TEXT NOT NULL,
+    models TEXT NOT NULL,
+    embedding BLOB NOT NULL,
+    compressed_research TEXT NOT NULL,
+    raw_notes TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS research_cache_key ON research_cache (embedder, prompt_version, search_provider, models, created_at);
+"""
+
+def research_prompt_version() -> str:
+    """Return the combined version of the prompts that shape a researcher's output."""
+    return "-".join(prompt_version(name)[:6] for name in RESEARCH_PROMPTS)
+
+def research_models() -> str:
+    """Return the candidate models of the roles that shape a researcher's output, e.g. "research=openai:gpt-4.1;..."."""
+    return ";".join(f"{role}={','.join(get_role_models(role))}" for role in RESEARCH_ROLES)
+
+@dataclass
+class CacheHit:
+    """A cached researcher output matching a topic."""
+    topic: str
+    similarity: float
+    age_seconds: float
+    compressed_research: str
+    raw_notes: List[str]
+
+    def as_artifact(self) -> dict:
+        """Metadata recorded on the ToolMessage that was answered from the cache."""
+        return {
+            "hit": True,
+            "cached_topic": self.topic,
+            "similarity": round(self.similarity, 4),
+            "age_seconds": round(self.age_seconds),
+        }
+
+# ===== EMBEDDING STORE =====
+
+class EmbeddingStore:
+    """Base class for SQLite files holding texts with their local embeddings."""
+
+    schema = ""
+
+    def __init__(self, path: Path, embedder: Optional[Embedder] = None):
+        """Open (and create, if needed) the SQLite file.
+
+        Args:
+            path: SQLite file to use
+            embedder: Text embedder; defaults to the best available local embedder
+        """
+        self.path = Path(path)
+        self.embedder = embedder or get_local_embedder()
+        self._lock = threading.Lock()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as connection:
+            connection.execute("PRAGMA journal_mode=WAL")
+            self._migrate(connection)
+            connection.executescript(self.schema)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Open a short-lived connection that commits on success; connections are not shared across threads."""
+        connection = sqlite3.connect(self.path, timeout=30)
+        try:
+            with connection:
+                yield connection
+        finally:
+            connection.close()
+
+    def _migrate(self, connection: sqlite3.Connection) -> None:
+        """Upgrade a file written by an older version before the schema is applied."""
+
+    def _embed(self, text: str) -> List[float]:
+        """Embed a text. Embedders are not guaranteed to be thread-safe."""
+        with self._lock:
+            return self.embedder.embed([text])[0]
+
+    @staticmethod
+    def _encode(vector: List[float]) -> bytes:
+        """Serialize a vector for a BLOB column."""
+        return array("f", vector).tobytes()
+
+    @staticmethod
+    def _similarity(vector: List[float], blob: bytes) -> float:
+        """Cosine similarity with a stored vector; local embeddings are L2-normalized, so this is the dot product."""
+        return sum(x * y for x, y in zip(vector, array("f", blob)))
+
+# ===== RESEARCH CACHE =====
+
+class ResearchCache(EmbeddingStore):
+    """Researcher outputs stored with topic embeddings in a SQLite file."""
+
+    schema = SCHEMA
+
+    def __init__(self, path: Path = default_cache_path, embedder: Optional[Embedder] = None):
+        """Open (and create, if needed) the cache file."""
+        super().__init__(path, embedder)
+
+    def _migrate(self, connection: sqlite3.Connection) -> None:
+        """Add the key columns to an older cache; its entries get empty keys and never match."""
+        columns = {row[1] for row in connection.execute("PRAGMA table_info(research_cache)")}
+        if not columns:
+            return
+        for column in ("search_provider", "models"):
+            if column not in columns:
+                connection.execute(f"ALTER TABLE research_cache ADD COLUMN {column} TEXT NOT NULL DEFAULT ''")
+        connection.execute("DROP INDEX IF EXISTS research_cache_lookup")
+
+    def lookup(
+        self, topic: str, threshold: float, max_age_seconds: float, search_provider: str, models: str
+    ) -> Optional[CacheHit]:
+        """Return the most similar fresh entry for a topic, if it reaches the threshold.
+
+        Args:
+            topic: Research topic to look up
+            threshold: Minimum cosine similarity between the topics
+            max_age_seconds: Freshness window; older entries are ignored
+            search_provider: Search backend the researcher would use
+            models: Models of the researcher's roles, see research_models
+
+        Returns:
+            The best matching entry, or None
+        """
+        vector = self._embed(topic)
+        now = time.time()
+        with self._connect() as connection:
+            rows = connection.execute(
+                "SELECT topic, embedding, compressed_research, raw_notes, created_at FROM research_cache "
+                "WHERE embedder = ? AND prompt_version = ? AND search_provider = ? AND models = ? AND created_at >= ?",
+                (self.embedder.name, research_prompt_version(), search_provider, models, now - max_age_seconds),
+            ).fetchall()
+
+        best: Optional[CacheHit] = None
+        for cached_topic, blob, compressed_research, raw_notes, created_at in rows:
+            similarity = self._similarity(vector, blob)
+            if similarity >= threshold and (best is None or similarity > best.similarity):
+                best = CacheHit(
+                    topic=cached_topic,
+                    similarity=similarity,
+                    age_seconds=now - created_at,
+                    compressed_research=compressed_research,
+                    raw_notes=json.loads(raw_notes),
+                )
+        return best
+
+    def store(
+        self, topic: str, compressed_research: str, raw_notes: List[str], search_provider: str, models: str
+    ) -> None:
+        """Cache a researcher output for a topic, under the search provider and models that produced it."""
+        vector = self._encode(self._embed(topic))
+        with self._connect() as connection:
+            connection.execute(
+                "INSERT INTO research_cache "
+                "(topic, embedder, prompt_version, search_provider, models, embedding, compressed_research, "
+                "raw_notes, created_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (topic, self.embedder.name, research_prompt_version(), search_provider, models, vector,
+                 compressed_research, json.dumps(raw_notes), time.time()),
+            )
+
+    def purge(self, max_age_seconds: float) -> int:
+        """Delete entries older than max_age_seconds and return how many were removed."""
+        with self._connect() as connection:
+            cursor = connection.execute(
+                "DELETE FROM research_cache WHERE created_at < ?", (time.time() - max_age_seconds,)
+            )
+            return cursor.rowcount
+
+# Global cache - created lazily on first use
+_cache: Optional[ResearchCache] = None
+
+def get_research_cache() -> ResearchCache:
+    """Get or create the process-wide research cache."""
+    global _cache
+    if _cache is None:
+        _cache = ResearchCache()
+    return _cache
@@ -0,0 +1,198 @@
+"""Cross-Run Research Memory.
+
+Every run of the full agent used to start from empty notes. This module keeps
+the compressed findings of past researchers in a persistent local store, so the
+supervisor can look up what earlier runs already found before delegating:
+
+- Each finding is stored with its research topic, the source URLs it cites, a
+  local embedding of the topic and its creation and last-use timestamps
+- The supervisor's SearchResearchMemory tool returns the findings whose topics
+  are most similar to a query
+- Eviction removes findings older than a maximum age, then the least recently
+  used findings until the store fits its size limit
+
+Unlike the research cache (research_cache.py), which silently replaces a whole
+researcher run when a topic repeats, memory lookups are explicit: the supervisor
+decides what is still relevant and what needs fresh research.
+"""
+
+import json
+import os
+import re
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+
+from typing_extensions import List, Optional
+
+from deep_research_from_scratch.local_embeddings import Embedder
+from deep_research_from_scratch.research_cache import EmbeddingStore
+from deep_research_from_scratch.storage_dirs import user_data_dir
+
+# ===== CONFIGURATION =====
+
+# SQLite file in the per-user data directory unless overridden by the environment
+default_memory_path = Path(os.getenv(
+    "DEEP_RESEARCH_RESEARCH_MEMORY_PATH",
+    user_data_dir() / "research_memory.sqlite",
+))
+
+# Findings less similar than this to the query are never returned
+min_memory_similarity = 0.3
+
+URL_PATTERN = re.compile(r"https?://[^\s<>\"'()\[\]]+")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS research_memory (
+    id INTEGER PRIMARY KEY,
+    topic TEXT NOT NULL,
+    findings TEXT NOT NULL,
+    urls TEXT NOT NULL,
+    embedder TEXT NOT NULL,
+    embedding BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    last_used_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS research_memory_created ON research_memory (created_at);
+CREATE INDEX IF NOT EXISTS research_memory_last_used ON research_memory (last_used_at);
+"""
+
+def extract_urls(text: str) -> List[str]:
+    """Return the distinct URLs cited in a text, in order of appearance."""
+    return list(dict.fromkeys(url.rstrip(".,;:") for url in URL_PATTERN.findall(text)))
+
+@dataclass
+class MemoryEntry:
+    """A finding from an earlier research run."""
+    topic: str
+    findings: str
+    urls: List[str]
+    created_at: float
+    similarity: float = 0.0
+
+    def render(self, index: int) -> str:
+        """Render the entry for a supervisor ToolMessage."""
+        researched = datetime.fromtimestamp(self.created_at).strftime("%Y-%m-%d")
+        sources = "\n".join(f"- {url}" for url in self.urls) or "- (no URLs recorded)"
+        return (
+            f"[{index}] Topic: {self.topic}\n"
+            f"Researched: {researched} (similarity {self.similarity:.2f})\n"
+            f"Sources:\n{sources}\n\n"
+            f"Findings:\n{self.findings}"
+        )
+
+# ===== RESEARCH MEMORY =====
+
+class ResearchMemory(EmbeddingStore):
+    """Compressed research findings from past runs, searchable by topic similarity."""
+
+    schema = SCHEMA
+
+    def __init__(self, path: Path = default_memory_path, embedder: Optional[Embedder] = None):
+        """Open (and create, if needed) the memory file."""
+        super().__init__(path, embedder)
+
+    def add(self, topic: str, findings: str, urls: Optional[List[str]] = None) -> None:
+        """Store a finding; its URLs are extracted from the text unless given.
+
+        A finding already stored under the same topic, e.g. one served again from
+        the research cache, is not duplicated but counts as used.
+        """
+        urls = extract_urls(findings) if urls is None else urls
+        now = time.time()
+        with self._connect() as connection:
+            updated = connection.execute(
+                "UPDATE research_memory SET last_used_at = ? WHERE topic = ? AND findings = ? AND embedder = ?",
+                (now, topic, findings, self.embedder.name),
+            ).rowcount
+            if updated:
+                return
+            connection.execute(
+                "INSERT INTO research_memory "
+                "(topic, findings, urls, embedder, embedding, size, created_at, last_used_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (topic, findings, json.dumps(urls), self.embedder.name, self._encode(self._embed(topic)),
+                 len(topic.encode("utf-8")) + len(findings.encode("utf-8")), now, now),
+            )
+
+    def search(self, query: str, max_results: int = 3, max_age_seconds: Optional[float] = None) -> List[MemoryEntry]:
+        """Return the findings whose topics are most similar to a query, most similar first.
+
+        Returned findings count as used, which protects them from size-based eviction.
+
+        Args:
+            query: What the supervisor wants to know
+            max_results: Maximum number of findings to return
+            max_age_seconds: Ignore findings older than this
+
+        Returns:
+            Matching findings with their similarity to the query
+        """
+        vector = self._embed(query)
+        now = time.time()
+        min_created = now - max_age_seconds if max_age_seconds is not None else 0.0
+        with self._connect() as connection:
+            rows = connection.execute(
+                "SELECT id, topic, findings, urls, embedding, created_at FROM research_memory "
+                "WHERE embedder = ? AND created_at >= ?",
+                (self.embedder.name, min_created),
+            ).fetchall()
+
+            scored = []
+            for row_id, topic, findings, urls, blob, created_at in rows:
+                similarity = self._similarity(vector, blob)
+                if similarity >= min_memory_similarity:
+                    scored.append((similarity, row_id, MemoryEntry(topic, findings, json.loads(urls), created_at, similarity)))
+            scored.sort(key=lambda item: (-item[0], item[1]))
+            scored = scored[:max_results]
+
+            connection.executemany(
+                "UPDATE research_memory SET last_used_at = ? WHERE id = ?",
+                [(now, row_id) for _, row_id, _ in scored],
+            )
+        return [entry for _, _, entry in scored]
+
+    def evict(self, max_age_seconds: float, max_bytes: int) -> int:
+        """Delete expired findings, then least recently used ones until the store fits max_bytes.
+
+        Returns:
+            Number of findings removed
+        """
+        with self._connect() as connection:
+            removed = connection.execute(
+                "DELETE FROM research_memory WHERE created_at < ?", (time.time() - max_age_seconds,)
+            ).rowcount
+            total = connection.execute("SELECT COALESCE(SUM(size), 0) FROM research_memory").fetchone()[0]
+            if total <= max_bytes:
+                return removed
+
+            doomed = []
+            for row_id, size in connection.execute(
+                "SELECT id, size FROM research_memory ORDER BY last_used_at, id"
+            ).fetchall():
+                if total <= max_bytes:
+                    break
+                doomed.append((row_id,))
+                total -= size
+            connection.executemany("DELETE FROM research_memory WHERE id = ?", doomed)
+            return removed + len(doomed)
+
+    def stats(self) -> dict:
+        """Return the number of stored findings and their total size in bytes."""
+        with self._connect() as connection:
+            count, size = connection.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM research_memory"
+            ).fetchone()
+        return {"findings": count, "bytes": size}
+
+# Global memory - created lazily on first use
+_memory: Optional[ResearchMemory] = None
+
+def get_research_memory() -> ResearchMemory:
+    """Get or create the process-wide research memory."""
+    global _memory
+    if _memory is None:
+        _memory = ResearchMemory()
+    return _memory
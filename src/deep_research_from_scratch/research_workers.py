@@ -0,0 +1,137 @@
+"""Multi-Process Research Workers.
+
+This module runs ConductResearch jobs in a pool of worker processes so that a
+single large supervisor run can use every core. CPU-bound work inside the
+researcher (search result formatting, message filtering, JSON parsing of model
+responses) then happens outside the supervisor's process and no longer
+competes with its event loop.
+
+Jobs are submitted through the pool's local call queue and their results come
+back to the supervisor as awaitable futures. Each worker keeps a single event
+loop alive for its lifetime so async model and search clients can be reused
+between jobs.
+
+Workers enforce each job's research_timeout_seconds themselves: a job that runs
+past its deadline is cancelled inside the worker, so the process is free for the
+next job instead of finishing research nobody is waiting for.
+
+The process keeps one pool. A run that asks for a different number of workers
+replaces it; the old pool finishes the jobs already submitted and its processes
+exit. The pool is shut down when the interpreter exits.
+"""
+
+import asyncio
+import atexit
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from typing_extensions import Optional
+
+from deep_research_from_scratch.resilience import DeadlineExceeded
+
+# ===== CONFIGURATION =====
+
+# Seconds the supervisor waits past a job's deadline before giving up on the worker.
+# Workers cancel overdue jobs themselves; this covers a worker stuck outside its event loop.
+deadline_grace_seconds = 30.0
+
+# ===== WORKER PROCESS =====
+
+# Event loop owned by the current worker process
+_worker_loop: Optional[asyncio.AbstractEventLoop] = None
+
+def init_worker() -> None:
+    """Prepare a worker process: create its event loop and import the researcher graph once."""
+    global _worker_loop
+    _worker_loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(_worker_loop)
+
+    # Import eagerly so the first job does not pay for model and graph construction
+    import deep_research_from_scratch.research_agent  # noqa: F401
+
+def run_research_job(research_topic: str, configurable: Optional[dict] = None) -> dict:
+    """Run one researcher sub-agent inside a worker process.
+
+    Args:
+        research_topic: Topic passed by the supervisor's ConductResearch call
+        configurable: Runtime configuration values forwarded from the supervisor run
+
+    Returns:
+        Picklable dict with compressed_research and raw_notes
+
+    Raises:
+        DeadlineExceeded: If the researcher did not finish within research_timeout_seconds
+    """
+    from langchain_core.messages import HumanMessage
+
+    from deep_research_from_scratch.research_agent import researcher_agent
+
+    configurable = configurable or {}
+    timeout = configurable.get("research_timeout_seconds")
+    research = researcher_agent.ainvoke({
+        "researcher_messages": [HumanMessage(content=research_topic)],
+        "research_topic": research_topic,
+    }, config={"configurable": configurable})
+    try:
+        result = _worker_loop.run_until_complete(asyncio.wait_for(research, timeout=timeout))
+    except TimeoutError as e:
+        raise DeadlineExceeded(f"Research did not finish within {timeout:g}s") from e
+
+    # Only plain strings cross the process boundary
+    return {
+        "compressed_research": result.get("compressed_research", ""),
+        "raw_notes": list(result.get("raw_notes", [])),
+    }
+
+# ===== WORKER POOL =====
+
+class ResearchWorkerPool:
+    """Pool of worker processes that execute ConductResearch jobs."""
+
+    def __init__(self, max_workers: int):
+        """Start a pool with the given number of worker processes."""
+        self.max_workers = max_workers
+        # spawn avoids inheriting the supervisor's event loop and HTTP client state
+        self._executor = ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=init_worker,
+        )
+
+    async def run(self, research_topic: str, configurable: Optional[dict] = None) -> dict:
+        """Submit a research job and await its result without blocking the event loop."""
+        return await asyncio.wrap_future(self._executor.submit(run_research_job, research_topic, configurable))
+
+    def shutdown(self, cancel_pending: bool = True) -> None:
+        """Stop the worker processes once their current jobs are done.
+
+        Args:
+            cancel_pending: Cancel submitted jobs that have not started yet, instead of running them first
+        """
+        self._executor.shutdown(wait=False, cancel_futures=cancel_pending)
+
+# Process-wide pool, created on first use and replaced when a run needs another size
+_pool: Optional[ResearchWorkerPool] = None
+_pool_lock = threading.Lock()
+
+def get_worker_pool(max_workers: int) -> ResearchWorkerPool:
+    """Return the shared worker pool, resized to the requested number of processes."""
+    global _pool
+    with _pool_lock:
+        if _pool is None or _pool.max_workers != max_workers:
+            if _pool is not None:
+                # Jobs other runs already submitted to the old pool still complete
+                _pool.shutdown(cancel_pending=False)
+            _pool = ResearchWorkerPool(max_workers)
+        return _pool
+
+def shutdown_worker_pool() -> None:
+    """Shut down the shared worker pool, if one was started."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown()
+            _pool = None
+
+atexit.register(shutdown_worker_pool)
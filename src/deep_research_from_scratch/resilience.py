@@ -0,0 +1,283 @@
+"""Resilience Policy for External Calls.
+
+Model and search calls fail in a few recurring ways: rate limits (429),
+overloaded or broken backends (5xx), dropped connections and calls that simply
+never return. This module applies one policy to all of them:
+
+- Deadlines: every call has a total time budget, retries included
+- Retries: rate limits, 5xx responses, timeouts and connection errors are retried
+  with exponential backoff and full jitter; other errors fail immediately
+- Circuit breakers: after repeated retryable failures a provider's breaker opens
+  and calls fail fast with CircuitOpenError until a cool-down has passed. A single
+  probe call is then let through to test whether the provider has recovered.
+
+Model calls go through the policy in model_router.py (one breaker per model
+provider) and Tavily calls in search_providers.py (breaker "search:tavily").
+
+Defaults can be changed with environment variables: ``DEEP_RESEARCH_RETRY_ATTEMPTS``,
+``DEEP_RESEARCH_RETRY_BACKOFF_BASE``, ``DEEP_RESEARCH_RETRY_BACKOFF_MAX``,
+``DEEP_RESEARCH_BREAKER_FAILURES`` and ``DEEP_RESEARCH_BREAKER_RESET_SECONDS``.
+"""
+
+import asyncio
+import os
+import random
+import threading
+import time
+from dataclasses import dataclass, replace
+
+import httpx
+from typing_extensions import Any, Awaitable, Callable, Optional, TypeVar
+
+T = TypeVar("T")
+
+# ===== CONFIGURATION =====
+
+# Status codes worth retrying: timeouts, conflicts, rate limits and server errors
+RETRYABLE_STATUS_CODES = frozenset({408, 409, 429, 500, 502, 503, 504, 529})
+
+# SDK exceptions that signal a transient failure but carry no status code
+RETRYABLE_ERROR_NAMES = frozenset({
+    "APIConnectionError",
+    "APITimeoutError",
+    "UsageLimitExceededError",  # Tavily's 429
+})
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """How often and for how long a call is attempted."""
+    # Total attempts, including the first one
+    attempts: int = int(os.getenv("DEEP_RESEARCH_RETRY_ATTEMPTS", 3))
+    backoff_base: float = float(os.getenv("DEEP_RESEARCH_RETRY_BACKOFF_BASE", 0.5))
+    backoff_max: float = float(os.getenv("DEEP_RESEARCH_RETRY_BACKOFF_MAX", 20.0))
+    # Time budget in seconds for all attempts together (None for no deadline)
+    deadline: Optional[float] = None
+
+    def backoff(self, attempt: int) -> float:
+        """Full-jitter exponential backoff delay after a failed attempt (0-based)."""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+    def with_deadline(self, deadline: Optional[float]) -> "RetryPolicy":
+        """Return a copy of the policy with a different deadline."""
+        return replace(self, deadline=deadline)
+
+default_policy = RetryPolicy()
+
+# Consecutive retryable failures that open a breaker, and seconds before it lets a probe through
+breaker_failure_threshold = int(os.getenv("DEEP_RESEARCH_BREAKER_FAILURES", 5))
+breaker_reset_seconds = float(os.getenv("DEEP_RESEARCH_BREAKER_RESET_SECONDS", 30.0))
+
+# ===== ERRORS =====
+
+class DeadlineExceeded(TimeoutError):
+    """A call did not finish within its deadline."""
+
+class CircuitOpenError(RuntimeError):
+    """A provider's circuit breaker is open, so the call was not attempted."""
+
+    def __init__(self, breaker: str, retry_in: float):
+        """Create the error for a breaker that reopens for probes in ``retry_in`` seconds."""
+        super().__init__(f"Circuit breaker '{breaker}' is open; retry in {retry_in:.0f}s")
+        self.breaker = breaker
+        self.retry_in = retry_in
+
+def status_code(error: BaseException) -> Optional[int]:
+    """Return the HTTP status code carried by an SDK or httpx error, if any."""
+    for source in (error, getattr(error, "response", None)):
+        code = getattr(source, "status_code", None)
+        if isinstance(code, int):
+            return code
+    return None
+
+def is_retryable(error: BaseException) -> bool:
+    """Whether an error is transient: a timeout, a connection failure, a rate limit or a 5xx."""
+    if isinstance(error, DeadlineExceeded):
+        return False
+    if isinstance(error, (TimeoutError, httpx.TimeoutException, httpx.TransportError)):
+        return True
+    if type(error).__name__ in RETRYABLE_ERROR_NAMES:
+        return True
+    return status_code(error) in RETRYABLE_STATUS_CODES
+
+# ===== CIRCUIT BREAKER =====
+
+class CircuitBreaker:
+    """Thread-safe circuit breaker for one provider.
+
+    Closed: calls pass. Open: calls fail fast until ``reset_seconds`` have passed.
+    Half-open: one probe call passes; its success closes the breaker, its failure
+    opens it again.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = breaker_failure_threshold,
+        reset_seconds: float = breaker_reset_seconds,
+    ):
+        """Create a closed breaker."""
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._probing = False
+
+    @property
+    def state(self) -> str:
+        """Current state: "closed", "open" or "half_open"."""
+        with self._lock:
+            if self._opened_at is None:
+                return "closed"
+            if self._probing or time.monotonic() - self._opened_at >= self.reset_seconds:
+                return "half_open"
+            return "open"
+
+    def before_call(self) -> None:
+        """Admit a call, or raise CircuitOpenError while the breaker is open."""
+        with self._lock:
+            if self._opened_at is None:
+                return
+            waited = time.monotonic() - self._opened_at
+            if waited < self.reset_seconds or self._probing:
+                raise CircuitOpenError(self.name, max(0.0, self.reset_seconds - waited))
+            self._probing = True
+
+    def record_success(self) -> None:
+        """Close the breaker after a successful call."""
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._probing = False
+
+    def record_failure(self, error: BaseException) -> None:
+        """Count a failed call; only transient failures say anything about provider health."""
+        with self._lock:
+            if not is_retryable(error) and not isinstance(error, DeadlineExceeded):
+                # The provider answered; the request itself was bad
+                self._probing = False
+                return
+            self._failures += 1
+            if self._probing or self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+            self._probing = False
+
+    def release_probe(self) -> None:
+        """Let another probe through after one ended without a verdict, e.g. when it was cancelled."""
+        with self._lock:
+            self._probing = False
+
+_breakers: dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+def get_circuit_breaker(name: str) -> CircuitBreaker:
+    """Get or create the process-wide breaker for a provider name."""
+    with _breakers_lock:
+        if name not in _breakers:
+            _breakers[name] = CircuitBreaker(name)
+        return _breakers[name]
+
+def circuit_breaker_states() -> dict[str, str]:
+    """Return the state of every breaker created so far."""
+    with _breakers_lock:
+        breakers = list(_breakers.values())
+    return {breaker.name: breaker.state for breaker in breakers}
+
+# ===== RESILIENT CALLS =====
+
+def _remaining(deadline_at: Optional[float]) -> Optional[float]:
+    """Seconds left until an absolute monotonic deadline."""
+    return None if deadline_at is None else deadline_at - time.monotonic()
+
+def resilient_call(
+    breaker: str,
+    func: Callable[..., T],
+    *args: Any,
+    policy: RetryPolicy = default_policy,
+    **kwargs: Any,
+) -> T:
+    """Call a function under a provider's breaker with retries and a deadline.
+
+    A running synchronous call cannot be interrupted, so the deadline stops further
+    retries and backoff sleeps; individual requests are bounded by HTTP timeouts.
+
+    Args:
+        breaker: Name of the provider's circuit breaker, e.g. "search:tavily"
+        func: Function performing the external call
+        *args: Positional arguments for func
+        policy: Retry policy and deadline
+        **kwargs: Keyword arguments for func
+
+    Returns:
+        The function's result
+
+    Raises:
+        CircuitOpenError: If the breaker is open
+        DeadlineExceeded: If the deadline passed before a retry could be made
+        Exception: The last error when it is not retryable or attempts ran out
+    """
+    circuit = get_circuit_breaker(breaker)
+    deadline_at = None if policy.deadline is None else time.monotonic() + policy.deadline
+    for attempt in range(policy.attempts):
+        circuit.before_call()
+        try:
+            result = func(*args, **kwargs)
+        except BaseException as e:
+            if not isinstance(e, Exception):
+                circuit.release_probe()
+                raise
+            circuit.record_failure(e)
+            if not is_retryable(e) or attempt == policy.attempts - 1:
+                raise
+            delay = policy.backoff(attempt)
+            remaining = _remaining(deadline_at)
+            if remaining is not None and remaining <= delay:
+                raise DeadlineExceeded(f"{breaker}: deadline of {policy.deadline}s exceeded") from e
+            time.sleep(delay)
+        else:
+            circuit.record_success()
+            return result
+
+async def aresilient_call(
+    breaker: str,
+    func: Callable[..., Awaitable[T]],
+    *args: Any,
+    policy: RetryPolicy = default_policy,
+    **kwargs: Any,
+) -> T:
+    """Async version of resilient_call; the deadline also cancels a running attempt.
+
+    Raises:
+        CircuitOpenError: If the breaker is open
+        DeadlineExceeded: If the deadline passed, during an attempt or before a retry
+        Exception: The last error when it is not retryable or attempts ran out
+    """
+    circuit = get_circuit_breaker(breaker)
+    deadline_at = None if policy.deadline is None else time.monotonic() + policy.deadline
+    for attempt in range(policy.attempts):
+        circuit.before_call()
+        try:
+            try:
+                result = await asyncio.wait_for(func(*args, **kwargs), timeout=_remaining(deadline_at))
+            except TimeoutError as e:
+                if _remaining(deadline_at) is not None and _remaining(deadline_at) <= 0:
+                    raise DeadlineExceeded(f"{breaker}: deadline of {policy.deadline}s exceeded") from e
+                raise
+        except BaseException as e:
+            if not isinstance(e, Exception):
+                # Cancelled (e.g. a lost hedge race): no verdict on the provider, but a
+                # half-open probe must not stay claimed forever
+                circuit.release_probe()
+                raise
+            circuit.record_failure(e)
+            if not is_retryable(e) or attempt == policy.attempts - 1:
+                raise
+            delay = policy.backoff(attempt)
+            remaining = _remaining(deadline_at)
+            if remaining is not None and remaining <= delay:
+                raise DeadlineExceeded(f"{breaker}: deadline of {policy.deadline}s exceeded") from e
+            await asyncio.sleep(delay)
+        else:
+            circuit.record_success()
+            return result
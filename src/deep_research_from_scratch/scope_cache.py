@@ -0,0 +1,140 @@
+"""Cache of Scoping Results.
+
+Scoping (the clarification decision and the research brief) depends only on
+the conversation so far, and many runs start from the same request: repeated
+questions, templated requests from scripts, load tests. This module caches
+scoping results on disk so those runs skip the scoping model calls entirely:
+
+- Entries are keyed on the normalized conversation: message roles and text,
+  case-folded and with whitespace collapsed, so formatting differences in the
+  same request still hit
+- Keys include the version of the scoping prompts, so changing a prompt
+  invalidates the cache automatically
+- Entries expire after a freshness window, because briefs mention the date
+
+The cache is a single SQLite file, safe to share between worker processes and
+concurrent runs.
+"""
+
+import hashlib
+import os
+import re
+import sqlite3
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+from langchain_core.messages import BaseMessage, get_buffer_string
+from typing_extensions import Iterator, Optional, Sequence
+
+from deep_research_from_scratch.prompt_registry import prompt_version
+from deep_research_from_scratch.state_scope import ScopeResearch
+from deep_research_from_scratch.storage_dirs import user_cache_dir
+
+# ===== CONFIGURATION =====
+
+# SQLite file in the per-user cache directory unless overridden by the environment
+default_cache_path = Path(os.getenv(
+    "DEEP_RESEARCH_SCOPE_CACHE_PATH",
+    user_cache_dir() / "scope_cache.sqlite",
+))
+
+# Prompts whose text shapes a scoping result, in either scoping mode
+SCOPE_PROMPTS = (
+    "clarify_with_user_instructions",
+    "transform_messages_into_research_topic_prompt",
+    "scope_research_prompt",
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS scope_cache (
+    key TEXT PRIMARY KEY,
+    need_clarification INTEGER NOT NULL,
+    question TEXT NOT NULL,
+    verification TEXT NOT NULL,
+    research_brief TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS scope_cache_age ON scope_cache (created_at);
+"""
+
+WHITESPACE = re.compile(r"\s+")
+
+def normalize_conversation(messages: Sequence[BaseMessage]) -> str:
+    """Conversation text with roles, case-folded and with runs of whitespace collapsed."""
+    return WHITESPACE.sub(" ", get_buffer_string(messages)).strip().casefold()
+
+def scope_key(messages: Sequence[BaseMessage]) -> str:
+    """Cache key of a conversation: a hash of its normalized text and the scoping prompt versions."""
+    versions = "-".join(prompt_version(name)[:6] for name in SCOPE_PROMPTS)
+    return hashlib.sha256(f"{versions}\n{normalize_conversation(messages)}".encode()).hexdigest()
+
+# ===== SCOPE CACHE =====
+
+class ScopeCache:
+    """Scoping results keyed on the normalized conversation in a SQLite file."""
+
+    def __init__(self, path: Path = default_cache_path):
+        """Open (and create, if needed) the cache file."""
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as connection:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.executescript(SCHEMA)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Open a short-lived connection that commits on success; connections are not shared across threads."""
+        connection = sqlite3.connect(self.path, timeout=30)
+        try:
+            with connection:
+                yield connection
+        finally:
+            connection.close()
+
+    def lookup(self, messages: Sequence[BaseMessage], max_age_seconds: float) -> Optional[ScopeResearch]:
+        """Return the cached scoping result of a conversation, if a fresh one exists."""
+        with self._connect() as connection:
+            row = connection.execute(
+                "SELECT need_clarification, question, verification, research_brief FROM scope_cache "
+                "WHERE key = ? AND created_at >= ?",
+                (scope_key(messages), time.time() - max_age_seconds),
+            ).fetchone()
+        if row is None:
+            return None
+        need_clarification, question, verification, research_brief = row
+        return ScopeResearch(
+            need_clarification=bool(need_clarification),
+            question=question,
+            verification=verification,
+            research_brief=research_brief,
+        )
+
+    def store(self, messages: Sequence[BaseMessage], result: ScopeResearch) -> None:
+        """Cache the scoping result of a conversation, replacing an earlier one."""
+        with self._connect() as connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO scope_cache "
+                "(key, need_clarification, question, verification, research_brief, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (scope_key(messages), int(result.need_clarification), result.question,
+                 result.verification, result.research_brief, time.time()),
+            )
+
+    def purge(self, max_age_seconds: float) -> int:
+        """Delete entries older than max_age_seconds and return how many were removed."""
+        with self._connect() as connection:
+            cursor = connection.execute(
+                "DELETE FROM scope_cache WHERE created_at < ?", (time.time() - max_age_seconds,)
+            )
+            return cursor.rowcount
+
+# Global cache - created lazily on first use
+_cache: Optional[ScopeCache] = None
+
+def get_scope_cache() -> ScopeCache:
+    """Get or create the process-wide scope cache."""
+    global _cache
+    if _cache is None:
+        _cache = ScopeCache()
+    return _cache
@@ -0,0 +1,381 @@
+"""Pluggable Search Providers.
+
+This module decouples the research tools from a specific search API. A search
+provider answers queries and extracts page content, synchronously or
+asynchronously, one query at a time or in batches, and always returns results
+in the Tavily response shape the rest of the code expects:
+
+    {"results": [{"url", "title", "content", "score", "raw_content"?}, ...]}
+
+Two providers are available:
+- TavilySearchProvider: the hosted Tavily API (the default), called through the
+  Tavily SDK over the shared connection pools of http_transport.py
+- LocalSearchProvider: an offline provider that serves results from an indexed
+  directory of HTML, markdown or text files, for air-gapped runs and load tests
+  without API quotas. WARC archives can be unpacked into such a directory with
+  ``import_warc`` (requires the optional ``warcio`` package).
+
+For load tests, "fake" selects the synthetic provider of fake_backends.py.
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import re
+import threading
+from abc import ABC, abstractmethod
+from pathlib import Path
+
+from typing_extensions import TYPE_CHECKING, List, Literal, Optional
+
+from deep_research_from_scratch.http_transport import (
+    SharedAsyncClient,
+    create_requests_session,
+)
+from deep_research_from_scratch.http_transport import settings as http_settings
+from deep_research_from_scratch.local_index import (
+    LocalDocumentIndex,
+    _index_lock,
+    get_document_index,
+    html_to_text,
+)
+from deep_research_from_scratch.resilience import (
+    aresilient_call,
+    default_policy,
+    resilient_call,
+)
+
+if TYPE_CHECKING:
+    from tavily import AsyncTavilyClient, TavilyClient
+
+# ===== CONFIGURATION =====
+
+SearchTopic = Literal["general", "news", "finance"]
+
+# Corpus served by the local provider unless overridden by the run configuration
+default_local_corpus_dir = Path(os.getenv(
+    "DEEP_RESEARCH_LOCAL_CORPUS_DIR",
+    Path(__file__).resolve().parent / "files",
+))
+
+# Words of a passage shown as the search snippet
+snippet_words = 60
+
+# Neighbouring passages on each side returned as a local result's raw content
+context_passages = 1
+
+# Optional mapping from corpus file to original URL, written by import_warc
+SOURCES_FILE = ".sources.json"
+
+LOCAL_URL_PATTERN = re.compile(r"^local://(?P<path>[^#]+)(?:#L(?P<start>\d+)-L(?P<end>\d+))?$")
+
+# ===== PROVIDER INTERFACE =====
+
+class SearchProvider(ABC):
+    """Base class for search backends returning Tavily-shaped responses.
+
+    Subclasses must implement search and extract, otherwise they cannot be
+    instantiated; the async and batch variants default to running the sync
+    methods in a thread and in sequence.
+    """
+
+    name = "base"
+
+    @abstractmethod
+    def search(
+        self,
+        query: str,
+        max_results: int = 3,
+        topic: SearchTopic = "general",
+        include_raw_content: bool = True,
+    ) -> dict:
+        """Run one query and return {"results": [...]}."""
+
+    @abstractmethod
+    def extract(self, urls: List[str]) -> dict:
+        """Fetch full content for URLs and return {"results": [{"url", "raw_content"}], "failed_results": [...]}."""
+
+    async def asearch(
+        self,
+        query: str,
+        max_results: int = 3,
+        topic: SearchTopic = "general",
+        include_raw_content: bool = True,
+    ) -> dict:
+        """Async version of search."""
+        return await asyncio.to_thread(self.search, query, max_results, topic, include_raw_content)
+
+    async def aextract(self, urls: List[str]) -> dict:
+        """Async version of extract."""
+        return await asyncio.to_thread(self.extract, urls)
+
+    def search_many(
+        self,
+        queries: List[str],
+        max_results: int = 3,
+        topic: SearchTopic = "general",
+        include_raw_content: bool = True,
+    ) -> List[dict]:
+        """Run several queries, returning responses in query order."""
+        return [self.search(query, max_results, topic, include_raw_content) for query in queries]
+
+    async def asearch_many(
+        self,
+        queries: List[str],
+        max_results: int = 3,
+        topic: SearchTopic = "general",
+        include_raw_content: bool = True,
+    ) -> List[dict]:
+        """Run several queries concurrently, returning responses in query order."""
+        return list(await asyncio.gather(*[
+            self.asearch(query, max_results, topic, include_raw_content) for query in queries
+        ]))
+
+# ===== TAVILY =====
+
+TAVILY_API_URL = os.getenv("TAVILY_API_BASE_URL", "https://api.tavily.com")
+
+# Tavily rejects requests that take longer than this server-side
+tavily_timeout_seconds = 120
+
+# Retry policy and total time budget of a Tavily call, retries included
+search_policy = default_policy.with_deadline(float(os.getenv("DEEP_RESEARCH_SEARCH_DEADLINE_SECONDS", 180)))
+
+class TavilySearchProvider(SearchProvider):
+    """Search through the Tavily SDK over the shared connection pools.
+
+    The SDK clients are created on first use. The sync client sends its requests
+    through a pooled session from http_transport.py, and the async client through
+    the running event loop's pooled httpx client, so connections are kept alive
+    across calls instead of being opened per request.
+    """
+
+    name = "tavily"
+
+    def __init__(self, api_key: Optional[str] = None, api_base_url: str = TAVILY_API_URL):
+        """Create the provider without contacting the API."""
+        self._api_key = api_key
+        self._api_base_url = api_base_url
+        self._client = None
+        self._async_client = None
+
+    def _resolve_api_key(self) -> str:
+        """Return the API key, reading TAVILY_API_KEY on first use."""
+        if not self._api_key:
+            from tavily.errors import MissingAPIKeyError
+            self._api_key = os.getenv("TAVILY_API_KEY")
+            if not self._api_key:
+                raise MissingAPIKeyError()
+        return self._api_key
+
+    @property
+    def client(self) -> "TavilyClient":
+        """Sync SDK client sharing a pooled requests session."""
+        if self._client is None:
+            from tavily import TavilyClient
+            self._client = TavilyClient(
+                api_key=self._resolve_api_key(), api_base_url=self._api_base_url, session=create_requests_session()
+            )
+        return self._client
+
+    @property
+    def async_client(self) -> "AsyncTavilyClient":
+        """Async SDK client whose requests go through the running loop's shared pool."""
+        if self._async_client is None:
+            from tavily import AsyncTavilyClient
+            # A handle of its own: the SDK sets its API key header on the client it is given
+            self._async_client = AsyncTavilyClient(
+                api_key=self._resolve_api_key(),
+                api_base_url=self._api_base_url,
+                client=SharedAsyncClient(timeout=http_settings.timeout()),
+            )
+        return self._async_client
+
+    def search(self, query, max_results=3, topic="general", include_raw_content=True) -> dict:
+        """Run one query through the Tavily search endpoint."""
+        return resilient_call(
+            "search:tavily", self.client.search, query,
+            max_results=max_results, topic=topic, include_raw_content=include_raw_content,
+            timeout=tavily_timeout_seconds, policy=search_policy,
+        )
+
+    def extract(self, urls: List[str]) -> dict:
+        """Fetch page content through the Tavily extract endpoint."""
+        return resilient_call("search:tavily", self.client.extract, urls, timeout=tavily_timeout_seconds, policy=search_policy)
+
+    async def asearch(self, query, max_results=3, topic="general", include_raw_content=True) -> dict:
+        """Run one query through the Tavily search endpoint without blocking the event loop."""
+        return await aresilient_call(
+            "search:tavily", self.async_client.search, query,
+            max_results=max_results, topic=topic, include_raw_content=include_raw_content,
+            timeout=tavily_timeout_seconds, policy=search_policy,
+        )
+
+    async def aextract(self, urls: List[str]) -> dict:
+        """Fetch page content through the Tavily extract endpoint without blocking the event loop."""
+        return await aresilient_call(
+            "search:tavily", self.async_client.extract, urls, timeout=tavily_timeout_seconds, policy=search_policy
+        )
+
+# ===== LOCAL CORPUS =====
+
+class LocalSearchProvider(SearchProvider):
+    """Offline search over a directory of local documents.
+
+    Passages are ranked by the local document index (BM25, optionally blended with
+    local embeddings). Each result is one passage; its raw content is the passage
+    with its neighbouring passages, and its score is normalized so the best match is 1.0.
+    Result URLs are the original URLs from ``.sources.json`` when present, otherwise
+    ``local://<path>#L<start>-L<end>``.
+    """
+
+    name = "local"
+
+    def __init__(
+        self,
+        corpus_dir: Path = default_local_corpus_dir,
+        index: Optional[LocalDocumentIndex] = None,
+        lock: Optional[threading.Lock] = None,
+    ):
+        """Open the index for a corpus directory, or use an existing index and the lock guarding it."""
+        self.corpus_dir = Path(corpus_dir).resolve()
+        self.index = index or LocalDocumentIndex(self.corpus_dir)
+        # The index is not thread-safe; searches from worker threads take this lock
+        self.lock = lock or threading.Lock()
+        self._sources: dict[str, str] = {}
+        self._sources_mtime: Optional[float] = None
+
+    def _source_urls(self) -> dict[str, str]:
+        """Load the path-to-URL map, re-reading it when the file changes."""
+        path = self.corpus_dir / SOURCES_FILE
+        mtime = path.stat().st_mtime if path.exists() else None
+        if mtime != self._sources_mtime:
+            self._sources = json.loads(path.read_text(encoding="utf-8")) if mtime else {}
+            self._sources_mtime = mtime
+        return self._sources
+
+    def _passage_context(self, path: str, start_line: int) -> str:
+        """Return a passage joined with its neighbouring passages in the same file."""
+        chunks = self.index.files.get(path, {}).get("chunks", [])
+        for i, chunk in enumerate(chunks):
+            if chunk["start_line"] == start_line:
+                window = chunks[max(0, i - context_passages):i + context_passages + 1]
+                return "\n\n".join(c["text"] for c in window)
+        return ""
+
+    def search(self, query, max_results=3, topic="general", include_raw_content=True) -> dict:
+        """Rank local passages for a query. The topic filter does not apply to local documents."""
+        with self.lock:
+            passages = self.index.search(query, max_results=max_results)
+            top = passages[0]["score"] if passages else 1.0
+            sources = self._source_urls()
+            results = []
+            for passage in passages:
+                words = passage["text"].split()
+                snippet = " ".join(words[:snippet_words]) + (" ..." if len(words) > snippet_words else "")
+                line_range = f"L{passage['start_line']}-L{passage['end_line']}"
+                original_url = sources.get(passage["path"])
+                result = {
+                    "url": f"{original_url}#{line_range}" if original_url else f"local://{passage['path']}#{line_range}",
+                    "title": f"{passage['path']} (lines {passage['start_line']}-{passage['end_line']})",
+                    "content": snippet,
+                    "score": round(passage["score"] / top, 4) if top else 0.0,
+                }
+                if include_raw_content:
+                    result["raw_content"] = self._passage_context(passage["path"], passage["start_line"])
+                results.append(result)
+            return {"query": query, "results": results}
+
+    async def asearch(self, query, max_results=3, topic="general", include_raw_content=True) -> dict:
+        """Rank passages in a worker thread: refreshing the index reads and tokenizes files."""
+        return await asyncio.to_thread(self.search, query, max_results, topic, include_raw_content)
+
+    async def aextract(self, urls: List[str]) -> dict:
+        """Extract in a worker thread, like asearch."""
+        return await asyncio.to_thread(self.extract, urls)
+
+    def extract(self, urls: List[str]) -> dict:
+        """Return raw content for local result URLs (a passage window, or a whole document without a line range)."""
+        with self.lock:
+            results, failed = [], []
+            by_url = {url: path for path, url in self._source_urls().items()}
+            for url in urls:
+                base, _, fragment = url.partition("#")
+                match = LOCAL_URL_PATTERN.match(url) if base.startswith("local://") else None
+                path = match.group("path") if match else by_url.get(base)
+                if path is None or path not in self.index.files:
+                    failed.append(url)
+                    continue
+                start = re.match(r"L(\d+)-L\d+$", fragment)
+                if start:
+                    content = self._passage_context(path, int(start.group(1)))
+                else:
+                    content = "\n\n".join(chunk["text"] for chunk in self.index.files[path]["chunks"])
+                results.append({"url": url, "raw_content": content})
+            return {"results": results, "failed_results": failed}
+
+def import_warc(warc_path: Path, corpus_dir: Path) -> int:
+    """Unpack the HTML responses of a WARC archive into a corpus directory.
+
+    Each page is written as text to ``<sha1 of url>.txt`` and its original URL is
+    recorded in ``.sources.json``, so local search results cite the real URLs.
+
+    Args:
+        warc_path: Path of a .warc or .warc.gz file
+        corpus_dir: Directory to write pages into
+
+    Returns:
+        Number of pages written
+
+    Raises:
+        ImportError: If the optional warcio package is not installed
+    """
+    from warcio.archiveiterator import ArchiveIterator
+
+    corpus_dir = Path(corpus_dir)
+    corpus_dir.mkdir(parents=True, exist_ok=True)
+    sources_path = corpus_dir / SOURCES_FILE
+    sources = json.loads(sources_path.read_text(encoding="utf-8")) if sources_path.exists() else {}
+
+    written = 0
+    with open(warc_path, "rb") as stream:
+        for record in ArchiveIterator(stream):
+            if record.rec_type != "response" or not record.http_headers:
+                continue
+            if "html" not in (record.http_headers.get_header("Content-Type") or ""):
+                continue
+            url = record.rec_headers.get_header("WARC-Target-URI")
+            name = hashlib.sha1(url.encode("utf-8")).hexdigest() + ".txt"
+            html = record.content_stream().read().decode("utf-8", errors="replace")
+            (corpus_dir / name).write_text(html_to_text(html), encoding="utf-8")
+            sources[name] = url
+            written += 1
+
+    sources_path.write_text(json.dumps(sources, indent=1), encoding="utf-8")
+    return written
+
+# ===== PROVIDER REGISTRY =====
+
+_providers: dict[tuple[str, str], SearchProvider] = {}
+
+def get_search_provider(name: Literal["tavily", "local", "fake"] = "tavily", corpus_dir: Optional[str] = None) -> SearchProvider:
+    """Get or create the shared provider for a backend name (and corpus, for the local provider)."""
+    corpus = str(Path(corpus_dir or default_local_corpus_dir).resolve())
+    key = (name, corpus if name == "local" else "")
+    if key not in _providers:
+        if name == "tavily":
+            _providers[key] = TavilySearchProvider()
+        elif name == "local":
+            # Share the MCP agent's index when serving the default research files
+            if Path(corpus) == default_local_corpus_dir.resolve():
+                _providers[key] = LocalSearchProvider(Path(corpus), index=get_document_index(), lock=_index_lock)
+            else:
+                _providers[key] = LocalSearchProvider(Path(corpus))
+        elif name == "fake":
+            # Synthetic results with simulated latency, for load tests
+            from deep_research_from_scratch.fake_backends import FakeSearchProvider
+            _providers[key] = FakeSearchProvider()
+        else:
+            raise ValueError(f"Unknown search provider '{name}'")
+    return _providers[key]
@@ -26,12 +26,14 @@ class SupervisorState(TypedDict):
     supervisor_messages: Annotated[Sequence[BaseMessage], add_messages]
     # Detailed research brief that guides the overall research direction
     research_brief: str
-    # Processed and structured notes ready for final report generation
+    # Processed and structured notes ready for final report generation (may be blob store references)
     notes: Annotated[list[str], operator.add] = []
     # Counter tracking the number of research iterations performed
     research_iterations: int = 0
-    # Raw unprocessed research notes collected from sub-agent research
+    # Raw unprocessed research notes collected from sub-agent research (may be blob store references)
     raw_notes: Annotated[list[str], operator.add] = []
+    # Background research still running in speculative mode, mapping research_id to topic
+    pending_research: dict[str, str] = {}
 
 @tool
 class ConductResearch(BaseModel):
@@ -40,6 +42,20 @@ class ConductResearch(BaseModel):
         description="The topic to research. Should be a single topic, and should be described in high detail (at least a paragraph).",
     )
 
+@tool
+class CancelResearch(BaseModel):
+    """Tool for cancelling a background research task whose topic has become redundant."""
+    research_id: str = Field(
+        description="The research_id of the running research task to cancel.",
+    )
+
+@tool
+class SearchResearchMemory(BaseModel):
+    """Tool for looking up findings from earlier research runs before delegating new research."""
+    query: str = Field(
+        description="What you want to know, described like a research topic.",
+    )
+
 @tool
 class ResearchComplete(BaseModel):
     """Tool for indicating that the research process is complete."""
@@ -7,7 +7,7 @@ the research agent workflow, including researcher state management and output sc
 """
 
 import operator
-from typing_extensions import TypedDict, Annotated, List, Sequence
+from typing_extensions import TypedDict, Annotated, List, Literal, Sequence
 from pydantic import BaseModel, Field
 from langchain_core.messages import BaseMessage
 from langgraph.graph.message import add_messages
@@ -20,7 +20,8 @@ class ResearcherState(TypedDict):
 
     This state tracks the researcher's conversation, iteration count for limiting
     tool calls, the research topic being investigated, compressed findings,
-    and raw research notes for detailed analysis.
+    and raw research notes for detailed analysis. Raw notes may be blob store
+    references instead of text when spill_raw_notes is enabled.
     """
     researcher_messages: Annotated[Sequence[BaseMessage], add_messages]
     tool_call_iterations: int
@@ -63,3 +64,38 @@ class Summary(BaseModel):
     """Schema for webpage content summarization."""
     summary: str = Field(description="Concise summary of the webpage content")
     key_excerpts: str = Field(description="Important quotes and excerpts from the content")
+
+# ===== SEARCH RESULTS =====
+
+class SourceRecord(BaseModel):
+    """One search result after processing."""
+    title: str = Field(description="Title of the source page")
+    url: str = Field(description="URL of the source page")
+    summary: str = Field(description="Summary of the page, or the search snippet when it was not summarized")
+    excerpts: str = Field(default="", description="Key excerpts from the page, if it was summarized")
+    summary_tier: Literal["snippet", "extractive", "llm", "truncated"] = Field(
+        default="snippet",
+        description="How the summary was produced: search snippet, local extractive summary, LLM summary, or truncated raw content",
+    )
+
+    @property
+    def content(self) -> str:
+        """Summary and excerpts in the tagged form shown to the researcher."""
+        if not self.excerpts:
+            return self.summary
+        return f"<summary>\n{self.summary}\n</summary>\n\n<key_excerpts>\n{self.excerpts}\n</key_excerpts>"
+
+class SearchResults(BaseModel):
+    """Structured output of a search tool call: an ordered list of source records.
+
+    Rendering for prompts lives in utils (format_search_output, render_search_results).
+    """
+    sources: List[SourceRecord] = Field(default_factory=list)
+
+    @classmethod
+    def from_dict(cls, results: dict) -> "SearchResults":
+        """Build from the legacy ``{url: {"title", "content"}}`` mapping."""
+        return cls(sources=[
+            SourceRecord(title=result["title"], url=url, summary=result["content"])
+            for url, result in results.items()
+        ])
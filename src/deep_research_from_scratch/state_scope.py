@@ -33,8 +33,10 @@ class AgentState(MessagesState):
     # Messages exchanged with the supervisor agent for coordination
     supervisor_messages: Annotated[Sequence[BaseMessage], add_messages]
     # Raw unprocessed research notes collected during the research phase
+    # (entries may be blob store references when spill_raw_notes is enabled, see blob_store.load_notes)
     raw_notes: Annotated[list[str], operator.add] = []
     # Processed and structured notes ready for report generation
+    # (entries may be blob store references when the memory budget is exceeded)
     notes: Annotated[list[str], operator.add] = []
     # Final formatted research report
     final_report: str
@@ -60,3 +62,19 @@ class ResearchQuestion(BaseModel):
     research_brief: str = Field(
         description="A research question that will be used to guide the research.",
     )
+
+class ScopeResearch(BaseModel):
+    """Schema for the single-call scoping decision: clarification and research brief together."""
+
+    need_clarification: bool = Field(
+        description="Whether the user needs to be asked a clarifying question.",
+    )
+    question: str = Field(
+        description="A question to ask the user to clarify the report scope",
+    )
+    verification: str = Field(
+        description="Verify message that we will start research after the user has provided the necessary information.",
+    )
+    research_brief: str = Field(
+        description="A research question that will be used to guide the research. Empty when clarification is needed.",
+    )
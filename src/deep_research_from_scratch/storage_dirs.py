@@ -0,0 +1,47 @@
+"""Per-User Storage Directories.
+
+Persistent stores (the scope and research caches, the local document index,
+research memory, spilled notes) live in the user's cache or data directory
+rather than next to the package sources, which may be read-only, shared between
+users or wiped on reinstall:
+
+- Linux and other Unix systems follow the XDG base directory specification
+- macOS uses ~/Library/Caches and ~/Library/Application Support
+- Windows uses %LOCALAPPDATA%
+
+``DEEP_RESEARCH_CACHE_DIR`` and ``DEEP_RESEARCH_DATA_DIR`` override the base
+directories; each store also keeps its own file path override.
+"""
+
+import os
+import sys
+from pathlib import Path
+
+# ===== CONFIGURATION =====
+
+# Subdirectory created under the platform's cache and data directories
+APP_NAME = "deep_research_from_scratch"
+
+# ===== DIRECTORIES =====
+
+def user_cache_dir() -> Path:
+    """Return the directory for stores that can be rebuilt, such as caches."""
+    override = os.getenv("DEEP_RESEARCH_CACHE_DIR")
+    if override:
+        return Path(override)
+    if sys.platform == "win32":
+        return Path(os.getenv("LOCALAPPDATA", Path.home() / "AppData" / "Local")) / APP_NAME / "Cache"
+    if sys.platform == "darwin":
+        return Path.home() / "Library" / "Caches" / APP_NAME
+    return Path(os.getenv("XDG_CACHE_HOME") or Path.home() / ".cache") / APP_NAME
+
+def user_data_dir() -> Path:
+    """Return the directory for stores that should persist, such as research memory."""
+    override = os.getenv("DEEP_RESEARCH_DATA_DIR")
+    if override:
+        return Path(override)
+    if sys.platform == "win32":
+        return Path(os.getenv("LOCALAPPDATA", Path.home() / "AppData" / "Local")) / APP_NAME
+    if sys.platform == "darwin":
+        return Path.home() / "Library" / "Application Support" / APP_NAME
+    return Path(os.getenv("XDG_DATA_HOME") or Path.home() / ".local" / "share") / APP_NAME
@@ -5,18 +5,27 @@ This module provides search and content processing utilities for the research ag
 including web search capabilities and content summarization tools.
 """
 
+import asyncio
+import logging
 from pathlib import Path
 from datetime import datetime
-from typing_extensions import Annotated, List, Literal
+from pydantic import Field
+from typing_extensions import Annotated, List, Literal, Optional, Union
 
-from langchain.chat_models import init_chat_model 
 from langchain_core.messages import HumanMessage
 from langchain_core.runnables import RunnableConfig
-from langchain_core.tools import tool, InjectedToolArg
-from tavily import TavilyClient
+from langchain_core.tools import tool, InjectedToolArg, StructuredTool
 
-from deep_research_from_scratch.state_research import Summary
-from deep_research_from_scratch.prompts import summarize_webpage_prompt
+from deep_research_from_scratch.configuration import Configuration
+from deep_research_from_scratch.extractive_summary import extractive_summary, select_summary_tier
+from deep_research_from_scratch.model_router import get_model
+from deep_research_from_scratch.profiling import profile_span
+from deep_research_from_scratch.progress_events import progress_span
+from deep_research_from_scratch.search_providers import SearchProvider, get_search_provider
+from deep_research_from_scratch.state_research import SearchResults, SourceRecord, Summary
+from deep_research_from_scratch.prompt_registry import partial_prompt
+
+logger = logging.getLogger(__name__)
 
 # ===== UTILITY FUNCTIONS =====
 
@@ -39,8 +48,14 @@ def get_current_dir() -> Path:
 
 # ===== CONFIGURATION =====
 
-summarization_model = init_chat_model(model="openai:gpt-4.1-mini")
-tavily_client = TavilyClient()
+# Rough characters-per-token ratio used to size token-budgeted summaries and renderings
+chars_per_token = 4
+
+NO_RESULTS_MESSAGE = "No valid search results found. Please try different search queries or use a different search API."
+
+# Adaptive search: widen a snippet search to this many results when too few sources pass the threshold
+adaptive_expanded_results = 8
+adaptive_min_relevant = 2
 
 # ===== SEARCH FUNCTIONS =====
 
@@ -49,64 +64,279 @@ def tavily_search_multiple(
     max_results: int = 3, 
     topic: Literal["general", "news", "finance"] = "general", 
     include_raw_content: bool = True, 
+    provider: Optional[SearchProvider] = None,
 ) -> List[dict]:
-    """Perform search using Tavily API for multiple queries.
+    """Perform search for multiple queries using a search provider (Tavily by default).
 
     Args:
         search_queries: List of search queries to execute
         max_results: Maximum number of results per query
         topic: Topic filter for search results
         include_raw_content: Whether to include raw webpage content
+        provider: Search backend to use; defaults to the shared Tavily provider
 
     Returns:
         List of search result dictionaries
     """
+    # Execute searches sequentially. See atavily_search_multiple for the concurrent async version.
+    provider = provider or get_search_provider()
+    return provider.search_many(search_queries, max_results, topic, include_raw_content)
+
+async def atavily_search_multiple(
+    search_queries: List[str], 
+    max_results: int = 3, 
+    topic: Literal["general", "news", "finance"] = "general", 
+    include_raw_content: bool = True, 
+    provider: Optional[SearchProvider] = None,
+) -> List[dict]:
+    """Perform concurrent searches for multiple queries using a search provider.
+
+    Args:
+        search_queries: List of search queries to execute
+        max_results: Maximum number of results per query
+        topic: Topic filter for search results
+        include_raw_content: Whether to include raw webpage content
+        provider: Search backend to use; defaults to the shared Tavily provider
+
+    Returns:
+        List of search result dictionaries, in the same order as the queries
+    """
+    provider = provider or get_search_provider()
+    return await provider.asearch_many(search_queries, max_results, topic, include_raw_content)
+
+def build_summarization_prompt(
+    webpage_content: str,
+    query: Optional[str] = None,
+    research_topic: str = "",
+    max_tokens: Optional[int] = None,
+) -> str:
+    """Build the summarization prompt, focused on the query when one is given."""
+    if not query:
+        return partial_prompt("summarize_webpage_prompt", date=get_today_str()).format(webpage_content=webpage_content)
+    # Words run a little longer than tokens
+    max_words = int((max_tokens or 300) * 0.75)
+    return partial_prompt("query_focused_summarize_prompt", date=get_today_str(), max_words=max_words).format(
+        webpage_content=webpage_content,
+        query=query,
+        research_topic=research_topic or query,
+    )
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """Cut text to roughly max_tokens, at a word boundary where possible."""
+    max_chars = max_tokens * chars_per_token
+    if len(text) <= max_chars:
+        return text
+    return text[:max_chars].rsplit(" ", 1)[0] + " [...]"
+
+def fit_summary_to_budget(summary: Summary, max_tokens: int) -> Summary:
+    """Enforce a token budget on a summary; the summary keeps priority over excerpts."""
+    text = truncate_to_tokens(summary.summary, max_tokens)
+    remaining = max_tokens - len(text) // chars_per_token
+    excerpts = truncate_to_tokens(summary.key_excerpts, remaining) if remaining > 0 else ""
+    return Summary(summary=text, key_excerpts=excerpts)
+
+def select_relevant_urls(unique_results: dict, threshold: float) -> List[str]:
+    """Return the URLs whose search relevance score reaches the threshold, best first."""
+    relevant = [(result.get("score", 0.0), url) for url, result in unique_results.items()]
+    return [url for score, url in sorted(relevant, reverse=True) if score >= threshold]
+
+def merge_extracted_content(unique_results: dict, extract_response: dict) -> None:
+    """Attach raw content from a provider's extract response to the matching search results."""
+    for extracted in extract_response.get("results", []):
+        result = unique_results.get(extracted.get("url"))
+        if result is not None and extracted.get("raw_content"):
+            result["raw_content"] = extracted["raw_content"]
+
+def add_relevant_results(unique_results: dict, widened: dict, threshold: float) -> None:
+    """Add results from a widened search that are new and reach the threshold."""
+    for url, result in widened.items():
+        if url not in unique_results and result.get("score", 0.0) >= threshold:
+            unique_results[url] = result
+
+def needs_expansion(relevant: List[str], max_results: int) -> bool:
+    """Return whether a snippet search found too few relevant sources and can still be widened."""
+    return len(relevant) < min(adaptive_min_relevant, max_results) and max_results < adaptive_expanded_results
+
+def adaptive_search(
+    query: str,
+    max_results: int = 3,
+    topic: Literal["general", "news", "finance"] = "general",
+    threshold: float = 0.5,
+    fetch_full_content: bool = False,
+    provider: Optional[SearchProvider] = None,
+) -> dict:
+    """Search with snippets first and fetch raw content only where it is worth it.
+
+    1. Run a snippet-only search (no raw content)
+    2. If too few results reach the relevance threshold, widen the search once and
+       keep the newly found results that do
+    3. Extract raw content only for the relevant results, or for all results
+       when fetch_full_content is set
+
+    Args:
+        query: Search query
+        max_results: Number of results for the initial search
+        topic: Topic filter for search results
+        threshold: Minimum relevance score for fetching raw content
+        fetch_full_content: Fetch raw content for every result, e.g. when the researcher reports gaps
+        provider: Search backend to use; defaults to the shared Tavily provider
+
+    Returns:
+        Dictionary mapping URLs to results; relevant results carry raw_content
+    """
+    provider = provider or get_search_provider()
+    unique_results = deduplicate_search_results(
+        provider.search_many([query], max_results, topic, include_raw_content=False)
+    )
+    relevant = select_relevant_urls(unique_results, threshold)
+    if needs_expansion(relevant, max_results):
+        widened = deduplicate_search_results(
+            provider.search_many([query], adaptive_expanded_results, topic, include_raw_content=False)
+        )
+        add_relevant_results(unique_results, widened, threshold)
+        relevant = select_relevant_urls(unique_results, threshold)
 
-    # Execute searches sequentially. Note: yon can use AsyncTavilyClient to parallelize this step.
-    search_docs = []
-    for query in search_queries:
-        result = tavily_client.search(
-            query,
-            max_results=max_results,
-            include_raw_content=include_raw_content,
-            topic=topic
+    urls = list(unique_results) if fetch_full_content else relevant
+    if urls:
+        merge_extracted_content(unique_results, provider.extract(urls))
+    return unique_results
+
+async def aadaptive_search(
+    query: str,
+    max_results: int = 3,
+    topic: Literal["general", "news", "finance"] = "general",
+    threshold: float = 0.5,
+    fetch_full_content: bool = False,
+    provider: Optional[SearchProvider] = None,
+) -> dict:
+    """Async version of adaptive_search."""
+    provider = provider or get_search_provider()
+    unique_results = deduplicate_search_results(
+        await provider.asearch_many([query], max_results, topic, include_raw_content=False)
+    )
+    relevant = select_relevant_urls(unique_results, threshold)
+    if needs_expansion(relevant, max_results):
+        widened = deduplicate_search_results(
+            await provider.asearch_many([query], adaptive_expanded_results, topic, include_raw_content=False)
         )
-        search_docs.append(result)
+        add_relevant_results(unique_results, widened, threshold)
+        relevant = select_relevant_urls(unique_results, threshold)
 
-    return search_docs
+    urls = list(unique_results) if fetch_full_content else relevant
+    if urls:
+        merge_extracted_content(unique_results, await provider.aextract(urls))
+    return unique_results
 
-def summarize_webpage_content(webpage_content: str) -> str:
+def summarization_model():
+    """Return the summarize role's model with structured Summary output."""
+    return get_model("summarize", lambda model: model.with_structured_output(Summary))
+
+def summarization_messages(
+    webpage_content: str,
+    query: Optional[str] = None,
+    research_topic: str = "",
+    max_tokens: Optional[int] = None,
+) -> list:
+    """Build the messages for one summarization call."""
+    return [HumanMessage(content=build_summarization_prompt(webpage_content, query, research_topic, max_tokens))]
+
+def summarize_webpage(
+    webpage_content: str,
+    query: Optional[str] = None,
+    research_topic: str = "",
+    max_tokens: Optional[int] = None,
+) -> Optional[Summary]:
     """Summarize webpage content using the configured summarization model.
 
     Args:
         webpage_content: Raw webpage content to summarize
+        query: Search query the page was found for; focuses the summary on it when given
+        research_topic: Overall research topic, used together with the query
+        max_tokens: Token budget for summary and excerpts together
 
     Returns:
-        Formatted summary with key excerpts
+        Structured summary with key excerpts, or None if summarization failed
     """
     try:
-        # Set up structured output model for summarization
-        structured_model = summarization_model.with_structured_output(Summary)
-
-        # Generate summary
-        summary = structured_model.invoke([
-            HumanMessage(content=summarize_webpage_prompt.format(
-                webpage_content=webpage_content, 
-                date=get_today_str()
-            ))
-        ])
-
-        # Format summary with clear structure
-        formatted_summary = (
-            f"<summary>\n{summary.summary}\n</summary>\n\n"
-            f"<key_excerpts>\n{summary.key_excerpts}\n</key_excerpts>"
+        summary = summarization_model().invoke(
+            summarization_messages(webpage_content, query, research_topic, max_tokens)
         )
+    except Exception as e:
+        # Retries, deadline and circuit breaker are applied by the model router; the
+        # caller degrades to a local summary and marks the source as such
+        logger.warning("Failed to summarize webpage: %r", e)
+        return None
+    return fit_summary_to_budget(summary, max_tokens) if max_tokens else summary
+
+async def asummarize_webpage(
+    webpage_content: str,
+    query: Optional[str] = None,
+    research_topic: str = "",
+    max_tokens: Optional[int] = None,
+) -> Optional[Summary]:
+    """Summarize webpage content asynchronously using the configured summarization model.
 
-        return formatted_summary
+    Args:
+        webpage_content: Raw webpage content to summarize
+        query: Search query the page was found for; focuses the summary on it when given
+        research_topic: Overall research topic, used together with the query
+        max_tokens: Token budget for summary and excerpts together
 
+    Returns:
+        Structured summary with key excerpts, or None if summarization failed
+    """
+    try:
+        summary = await summarization_model().ainvoke(
+            summarization_messages(webpage_content, query, research_topic, max_tokens)
+        )
     except Exception as e:
-        print(f"Failed to summarize webpage: {str(e)}")
-        return webpage_content[:1000] + "..." if len(webpage_content) > 1000 else webpage_content
+        # Retries, deadline and circuit breaker are applied by the model router; the
+        # caller degrades to a local summary and marks the source as such
+        logger.warning("Failed to summarize webpage: %r", e)
+        return None
+    return fit_summary_to_budget(summary, max_tokens) if max_tokens else summary
+
+def truncate_content(content: str, max_chars: int = 1000) -> str:
+    """Shorten unsummarized page content to max_chars."""
+    return content[:max_chars] + "..." if len(content) > max_chars else content
+
+def build_source_record(
+    url: str,
+    result: dict,
+    summary: Optional[Summary] = None,
+    tier: Literal["extractive", "llm"] = "llm",
+) -> SourceRecord:
+    """Turn a raw search result and its optional summary into a source record.
+
+    Pages without a summary fall back to the truncated raw content, or to the
+    search snippet when no raw content was returned.
+    """
+    if summary is not None:
+        return SourceRecord(
+            title=result['title'], url=url, summary=summary.summary, excerpts=summary.key_excerpts, summary_tier=tier
+        )
+    if result.get("raw_content"):
+        return SourceRecord(
+            title=result['title'], url=url, summary=truncate_content(result['raw_content']), summary_tier="truncated"
+        )
+    return SourceRecord(title=result['title'], url=url, summary=result['content'], summary_tier="snippet")
+
+def summarize_webpage_content(webpage_content: str) -> str:
+    """Summarize webpage content and format it with summary and key excerpt tags.
+
+    Args:
+        webpage_content: Raw webpage content to summarize
+
+    Returns:
+        Formatted summary with key excerpts
+    """
+    summary = summarize_webpage(webpage_content)
+    return build_source_record("", {"title": "", "raw_content": webpage_content}, summary).content
+
+async def asummarize_webpage_content(webpage_content: str) -> str:
+    """Async version of summarize_webpage_content."""
+    summary = await asummarize_webpage(webpage_content)
+    return build_source_record("", {"title": "", "raw_content": webpage_content}, summary).content
 
 def deduplicate_search_results(search_results: List[dict]) -> dict:
     """Deduplicate search results by URL to avoid processing duplicate content.
@@ -127,88 +357,286 @@ def deduplicate_search_results(search_results: List[dict]) -> dict:
 
     return unique_results
 
-def process_search_results(unique_results: dict) -> dict:
+def extractive_source_record(url: str, result: dict, query: str, budget: Optional[int]) -> SourceRecord:
+    """Summarize a result locally with the extractive summarizer."""
+    summary = extractive_summary(result['raw_content'], query)
+    if budget:
+        summary = fit_summary_to_budget(summary, budget)
+    return build_source_record(url, result, summary, tier="extractive")
+
+def summarize_search_result(
+    url: str,
+    result: dict,
+    query: str,
+    research_topic: str,
+    configuration: Configuration,
+) -> SourceRecord:
+    """Summarize one search result according to the configured summarization options."""
+    if not result.get("raw_content"):
+        # Use the search snippet if there is no raw content to summarize
+        return build_source_record(url, result)
+    # Summaries are focused on the query, within a token budget, only in query-aware mode
+    focus, budget = (query, configuration.summary_max_tokens) if configuration.query_aware_summaries else (None, None)
+    if configuration.summarization_mode == "tiered" and select_summary_tier(result, query) == "extractive":
+        # Cheap local summary for pages that do not need the model
+        return extractive_source_record(url, result, query, budget)
+
+    # Summarize raw content for better processing
+    summary = summarize_webpage(result['raw_content'], focus, research_topic, budget)
+    if summary is None:
+        # The model is failing or its circuit is open: degrade to a local summary
+        return extractive_source_record(url, result, query, budget)
+    return build_source_record(url, result, summary)
+
+async def asummarize_search_result(
+    url: str,
+    result: dict,
+    query: str,
+    research_topic: str,
+    configuration: Configuration,
+) -> SourceRecord:
+    """Async version of summarize_search_result."""
+    if not result.get("raw_content"):
+        return build_source_record(url, result)
+    focus, budget = (query, configuration.summary_max_tokens) if configuration.query_aware_summaries else (None, None)
+    if configuration.summarization_mode == "tiered" and select_summary_tier(result, query) == "extractive":
+        return extractive_source_record(url, result, query, budget)
+
+    summary = await asummarize_webpage(result['raw_content'], focus, research_topic, budget)
+    if summary is None:
+        return extractive_source_record(url, result, query, budget)
+    return build_source_record(url, result, summary)
+
+def summary_progress_fields(result: dict, source: SourceRecord) -> dict:
+    """Tier and approximate token sizes of a summarized page, for page_summarized events."""
+    return {
+        "tier": source.summary_tier,
+        "page_tokens": len(result.get("raw_content") or result.get("content", "")) // chars_per_token,
+        "summary_tokens": len(source.content) // chars_per_token,
+    }
+
+def process_search_results(
+    unique_results: dict,
+    query: str = "",
+    research_topic: str = "",
+    configuration: Optional[Configuration] = None,
+) -> SearchResults:
     """Process search results by summarizing content where available.
 
     Args:
         unique_results: Dictionary of unique search results
+        query: The search query the results were returned for
+        research_topic: The researcher's overall topic, for query-aware summaries
+        configuration: Summarization options (summarization_mode, query_aware_summaries,
+            summary_max_tokens); defaults summarize every page generically with the LLM
 
     Returns:
-        Dictionary of processed results with summaries
+        Structured results with one source record per URL
     """
-    summarized_results = {}
-
+    configuration = configuration or Configuration()
+    sources = []
     for url, result in unique_results.items():
-        # Use existing content if no raw content for summarization
-        if not result.get("raw_content"):
-            content = result['content']
-        else:
-            # Summarize raw content for better processing
-            content = summarize_webpage_content(result['raw_content'])
+        with progress_span(None, "page_summarized", url=url) as progress, profile_span("summarize_webpage_content", url=url):
+            source = summarize_search_result(url, result, query, research_topic, configuration)
+            progress.update(summary_progress_fields(result, source))
+        sources.append(source)
+    return SearchResults(sources=sources)
+
+async def aprocess_search_results(
+    unique_results: dict,
+    query: str = "",
+    research_topic: str = "",
+    configuration: Optional[Configuration] = None,
+) -> SearchResults:
+    """Process search results by summarizing all raw content concurrently.
+
+    Args:
+        unique_results: Dictionary of unique search results
+        query: The search query the results were returned for
+        research_topic: The researcher's overall topic, for query-aware summaries
+        configuration: Summarization options, see process_search_results
+
+    Returns:
+        Structured results with one source record per URL, in the input order
+    """
+    configuration = configuration or Configuration()
 
-        summarized_results[url] = {
-            'title': result['title'],
-            'content': content
-        }
+    async def summarize(url: str, result: dict) -> SourceRecord:
+        with progress_span(None, "page_summarized", url=url) as progress, profile_span("summarize_webpage_content", url=url):
+            source = await asummarize_search_result(url, result, query, research_topic, configuration)
+            progress.update(summary_progress_fields(result, source))
+        return source
 
-    return summarized_results
+    sources = await asyncio.gather(*[summarize(url, result) for url, result in unique_results.items()])
+    return SearchResults(sources=list(sources))
 
-def format_search_output(summarized_results: dict) -> str:
+def format_search_output(
+    summarized_results: Union[SearchResults, dict], contents: Optional[List[str]] = None
+) -> str:
     """Format search results into a well-structured string output.
 
     Args:
-        summarized_results: Dictionary of processed search results
+        summarized_results: Structured search results, or a legacy mapping of URL to title and content
+        contents: Per-source text to show instead of each source's full content
 
     Returns:
         Formatted string of search results with clear source separation
     """
-    if not summarized_results:
-        return "No valid search results found. Please try different search queries or use a different search API."
-
-    formatted_output = "Search results: \n\n"
+    if isinstance(summarized_results, dict):
+        summarized_results = SearchResults.from_dict(summarized_results)
+    sources = summarized_results.sources
+    if not sources:
+        return NO_RESULTS_MESSAGE
+    if contents is None:
+        contents = [source.content for source in sources]
+    separator = "-" * 80
+    return "Search results: \n\n" + "".join(
+        f"\n\n--- SOURCE {i}: {source.title} ---\nURL: {source.url}\n\nSUMMARY:\n{content}\n\n{separator}\n"
+        for i, (source, content) in enumerate(zip(sources, contents), 1)
+    )
 
-    for i, (url, result) in enumerate(summarized_results.items(), 1):
-        formatted_output += f"\n\n--- SOURCE {i}: {result['title']} ---\n"
-        formatted_output += f"URL: {url}\n\n"
-        formatted_output += f"SUMMARY:\n{result['content']}\n\n"
-        formatted_output += "-" * 80 + "\n"
+def format_truncated_search_output(results: SearchResults, max_tokens: int) -> str:
+    """Format search results as text, shortening source contents to fit a token budget.
 
-    return formatted_output
+    The budget left after the fixed per-source headers is shared between sources.
+    Sources shorter than their share keep their full text and hand the remainder
+    to the longer ones.
+    """
+    if not results.sources:
+        return NO_RESULTS_MESSAGE
+    contents = [source.content for source in results.sources]
+    overhead = len(format_search_output(results, contents=[""] * len(contents)))
+    remaining = max(0, max_tokens * chars_per_token - overhead)
+
+    limits = [0] * len(contents)
+    pending = sorted(range(len(contents)), key=lambda i: len(contents[i]))
+    while pending:
+        share = remaining // len(pending)
+        index = pending.pop(0)
+        limits[index] = min(len(contents[index]), share)
+        remaining -= limits[index]
+
+    return format_search_output(results, contents=[
+        content if len(content) <= limit else content[:limit].rstrip() + " [...]"
+        for content, limit in zip(contents, limits)
+    ])
+
+def render_search_results(results: SearchResults, output_format: str = "text", max_tokens: Optional[int] = None) -> str:
+    """Render search results as "text", "json" or "truncated" text (the latter requires max_tokens)."""
+    if output_format == "json":
+        return results.model_dump_json()
+    if output_format == "truncated" and max_tokens:
+        return format_truncated_search_output(results, max_tokens)
+    return format_search_output(results)
 
 # ===== RESEARCH TOOLS =====
 
-@tool(parse_docstring=True)
-def tavily_search(
+def search_and_summarize(
     query: str,
     max_results: Annotated[int, InjectedToolArg] = 3,
     topic: Annotated[Literal["general", "news", "finance"], InjectedToolArg] = "general",
-) -> str:
-    """Fetch results from Tavily search API with content summarization.
+    fetch_full_content: Annotated[bool, InjectedToolArg] = False,
+    research_topic: Annotated[str, InjectedToolArg] = "",
+    config: RunnableConfig = None,
+) -> tuple[str, dict]:
+    """Fetch web search results with content summarization.
 
     Args:
         query: A single search query to execute
         max_results: Maximum number of results to return
         topic: Topic to filter results by ('general', 'news', 'finance')
+        fetch_full_content: Read every result in full; only offered to the model in adaptive search mode
+        research_topic: The researcher's overall topic, injected by the tool node
+        config: Run configuration, used to pick the search provider, search depth, summarization mode
+            and output rendering
 
     Returns:
         Formatted string of search results with summaries
     """
-    # Execute search for single query
-    search_results = tavily_search_multiple(
-        [query],  # Convert single query to list for the internal function
-        max_results=max_results,
-        topic=topic,
-        include_raw_content=True,
+    configuration = Configuration.from_runnable_config(config)
+    provider = get_search_provider(configuration.search_provider, configuration.local_corpus_dir)
+    with progress_span(
+        "search_issued", "search_completed", query=query, provider=provider.name, depth=configuration.search_depth
+    ) as progress, profile_span(f"search:{provider.name}", "search", query=query):
+        if configuration.search_depth == "adaptive":
+            # Snippets first; raw content only for relevant sources
+            unique_results = adaptive_search(
+                query, max_results, topic, configuration.search_relevance_threshold, fetch_full_content, provider
+            )
+        else:
+            # Execute search for single query, deduplicated by URL to avoid processing duplicate content
+            unique_results = deduplicate_search_results(tavily_search_multiple(
+                [query], max_results=max_results, topic=topic, include_raw_content=True, provider=provider
+            ))
+        progress["results"] = len(unique_results)
+
+    # Process results with summarization
+    summarized_results = process_search_results(unique_results, query, research_topic, configuration)
+    output = render_search_results(
+        summarized_results, configuration.search_output_format, configuration.search_output_max_tokens
     )
+    # The structured results become the ToolMessage artifact
+    return output, summarized_results.model_dump()
 
-    # Deduplicate results by URL to avoid processing duplicate content
-    unique_results = deduplicate_search_results(search_results)
+async def asearch_and_summarize(
+    query: str,
+    max_results: Annotated[int, InjectedToolArg] = 3,
+    topic: Annotated[Literal["general", "news", "finance"], InjectedToolArg] = "general",
+    fetch_full_content: Annotated[bool, InjectedToolArg] = False,
+    research_topic: Annotated[str, InjectedToolArg] = "",
+    config: RunnableConfig = None,
+) -> tuple[str, dict]:
+    """Async implementation of tavily_search that runs on the event loop."""
+    configuration = Configuration.from_runnable_config(config)
+    provider = get_search_provider(configuration.search_provider, configuration.local_corpus_dir)
+    with progress_span(
+        "search_issued", "search_completed", query=query, provider=provider.name, depth=configuration.search_depth
+    ) as progress, profile_span(f"search:{provider.name}", "search", query=query):
+        if configuration.search_depth == "adaptive":
+            unique_results = await aadaptive_search(
+                query, max_results, topic, configuration.search_relevance_threshold, fetch_full_content, provider
+            )
+        else:
+            unique_results = deduplicate_search_results(await atavily_search_multiple(
+                [query], max_results=max_results, topic=topic, include_raw_content=True, provider=provider
+            ))
+        progress["results"] = len(unique_results)
 
-    # Process results with summarization
-    summarized_results = process_search_results(unique_results)
+    summarized_results = await aprocess_search_results(unique_results, query, research_topic, configuration)
+    output = render_search_results(
+        summarized_results, configuration.search_output_format, configuration.search_output_max_tokens
+    )
+    return output, summarized_results.model_dump()
+
+# Expose both implementations as one tool: sync callers use invoke, async graphs use ainvoke.
+# The tool keeps its historical name; the backend is chosen by the search_provider option.
+# Invoked with a tool call, the ToolMessage artifact carries the SearchResults as a dict.
+tavily_search = StructuredTool.from_function(
+    func=search_and_summarize,
+    coroutine=asearch_and_summarize,
+    name="tavily_search",
+    parse_docstring=True,
+    response_format="content_and_artifact",
+)
+
+class AdaptiveSearchArgs(tavily_search.args_schema):
+    """Arguments of tavily_search in adaptive search mode, where the model may ask for full content."""
+
+    fetch_full_content: bool = Field(
+        default=False,
+        description="Set to true to read every result in full, when earlier searches on this subject left gaps",
+    )
 
-    # Format output for consumption
-    return format_search_output(summarized_results)
+# Same tool with fetch_full_content exposed to the model. It only has an effect in
+# adaptive mode, so it is bound only when search_depth is "adaptive".
+adaptive_tavily_search = StructuredTool.from_function(
+    func=search_and_summarize,
+    coroutine=asearch_and_summarize,
+    name="tavily_search",
+    description=tavily_search.description,
+    args_schema=AdaptiveSearchArgs,
+    response_format="content_and_artifact",
+)
 
 @tool(parse_docstring=True)
 def think_tool(reflection: str) -> str:
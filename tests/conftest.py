@@ -0,0 +1,10 @@
+import os
+import tempfile
+
+# The graph modules build their models at import time; run them on the fake backends
+# so the tests need no API keys, and keep every default store out of the home directory.
+os.environ.setdefault("DEEP_RESEARCH_FAKE_MODELS", "true")
+os.environ.setdefault("DEEP_RESEARCH_FAKE_MODEL_LATENCY", "0")
+os.environ.setdefault("DEEP_RESEARCH_FAKE_SEARCH_LATENCY", "0")
+os.environ.setdefault("DEEP_RESEARCH_CACHE_DIR", tempfile.mkdtemp(prefix="deep_research_cache_"))
+os.environ.setdefault("DEEP_RESEARCH_DATA_DIR", tempfile.mkdtemp(prefix="deep_research_data_"))
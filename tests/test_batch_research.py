@@ -0,0 +1,98 @@
+import asyncio
+import json
+
+import pytest
+from langchain_core.globals import get_llm_cache, set_llm_cache
+from langchain_core.messages import AIMessage
+
+from deep_research_from_scratch import batch_research, model_router
+from deep_research_from_scratch.batch_research import (
+    load_requests,
+    normalize_request,
+    shared_batch_resources,
+    stream_batch,
+)
+
+
+class StubGraph:
+    """Graph stand-in: sleeps for the delay named in the query, fails on "fail", and tracks concurrency."""
+
+    def __init__(self):
+        self.running = 0
+        self.peak = 0
+
+    async def ainvoke(self, state, config=None):
+        query = state["messages"][-1].content
+        self.running += 1
+        self.peak = max(self.peak, self.running)
+        try:
+            await asyncio.sleep(float(query.split()[-1]))
+            if query.startswith("fail"):
+                raise RuntimeError("provider unavailable")
+            return {"messages": [AIMessage(content="done")], "final_report": f"report on {query}"}
+        finally:
+            self.running -= 1
+
+
+@pytest.fixture
+def graph(monkeypatch):
+    stub = StubGraph()
+    monkeypatch.setattr(batch_research, "get_graph", lambda name: stub)
+    return stub
+
+
+def run(requests, **kwargs):
+    async def collect():
+        return [result async for result in stream_batch(requests, **kwargs)]
+
+    return asyncio.run(collect())
+
+
+def test_results_arrive_in_completion_order_with_errors_captured(graph):
+    results = run(["slow 0.2", {"id": "broken", "query": "fail 0"}, "fast 0.05"], max_concurrency=3)
+
+    assert [result["id"] for result in results] == ["broken", "2", "0"]
+    broken, fast, slow = results
+    assert broken["status"] == "error" and broken["error"] == "RuntimeError: provider unavailable"
+    assert fast["status"] == slow["status"] == "completed"
+    assert slow["final_report"] == "report on slow 0.2"
+
+
+def test_concurrency_is_capped(graph):
+    results = run(["item 0.01" for _ in range(7)], max_concurrency=2)
+    assert len(results) == 7
+    assert graph.peak == 2
+
+
+def test_shared_resources_are_restored():
+    assert get_llm_cache() is None
+    previous_limiter = model_router.router.rate_limiter
+
+    with shared_batch_resources(share_llm_cache=True, llm_cache_size=10, requests_per_second=5.0, max_concurrency=2):
+        assert get_llm_cache() is not None
+        assert model_router.router.rate_limiter is not previous_limiter
+
+    assert get_llm_cache() is None
+    assert model_router.router.rate_limiter is previous_limiter
+
+
+def test_configured_llm_cache_is_left_in_place():
+    existing = object()
+    set_llm_cache(existing)
+    try:
+        with shared_batch_resources(share_llm_cache=True, llm_cache_size=10, requests_per_second=None, max_concurrency=1):
+            assert get_llm_cache() is existing
+        assert get_llm_cache() is existing
+    finally:
+        set_llm_cache(None)
+
+
+def test_normalize_and_load_requests(tmp_path):
+    assert normalize_request("grid storage", 3) == {"query": "grid storage", "id": "3"}
+    assert normalize_request({"id": "a", "messages": [("user", "hi")]}, 0)["id"] == "a"
+    with pytest.raises(ValueError, match="neither"):
+        normalize_request({"id": "empty"}, 0)
+
+    path = tmp_path / "requests.jsonl"
+    path.write_text(json.dumps("plain query") + "\n\n" + json.dumps({"id": "x", "query": "q"}) + "\n")
+    assert load_requests(path) == ["plain query", {"id": "x", "query": "q"}]
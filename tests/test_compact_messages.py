@@ -0,0 +1,27 @@
+from langchain_core.messages import ToolMessage
+
+from deep_research_from_scratch import blob_store
+from deep_research_from_scratch.compact_messages import (
+    compact_tool_message,
+    is_compact,
+    render_messages,
+)
+
+
+def test_text_compaction_keeps_existing_artifact(tmp_path, monkeypatch):
+    monkeypatch.setattr(blob_store, "_store", blob_store.BlobStore(tmp_path))
+    content = "finding " * 500
+    message = ToolMessage(
+        content=content,
+        name="ConductResearch",
+        tool_call_id="call-1",
+        artifact={"research_id": "abc", "status": "completed", "cache": {"similarity": 0.97}},
+    )
+
+    compacted = compact_tool_message(message)
+
+    assert is_compact(compacted)
+    assert compacted.artifact["research_id"] == "abc"
+    assert compacted.artifact["status"] == "completed"
+    assert compacted.artifact["cache"] == {"similarity": 0.97}
+    assert render_messages([compacted])[0].content == content
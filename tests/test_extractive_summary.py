@@ -0,0 +1,24 @@
+from deep_research_from_scratch.extractive_summary import select_summary_tier
+
+QUERY = "heat pump running costs"
+ON_TOPIC = "Heat pump running costs depend on the electricity price in each region. "
+OFF_TOPIC = "The company was founded in a small workshop many decades ago. "
+
+
+def page(sentence: str, repeat: int) -> str:
+    return sentence * repeat
+
+
+def test_long_highly_scored_page_without_query_density_stays_local():
+    content = page(ON_TOPIC, 10) + page(OFF_TOPIC, 300)
+    assert select_summary_tier({"raw_content": content, "score": 0.95}, QUERY) == "extractive"
+
+
+def test_dense_page_escalates_when_long_or_highly_scored():
+    content = page(ON_TOPIC, 250)
+    assert select_summary_tier({"raw_content": content, "score": 0.5}, QUERY) == "llm"
+    assert select_summary_tier({"raw_content": page(ON_TOPIC, 20), "score": 0.9}, QUERY) == "llm"
+
+
+def test_short_dense_page_with_moderate_score_stays_local():
+    assert select_summary_tier({"raw_content": page(ON_TOPIC, 20), "score": 0.6}, QUERY) == "extractive"
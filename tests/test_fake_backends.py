@@ -0,0 +1,47 @@
+import asyncio
+
+import pytest
+from langchain_core.messages import HumanMessage
+
+from deep_research_from_scratch.fake_backends import FakeChatModel, LatencyDistribution
+
+
+@pytest.mark.parametrize("spec, expected", [
+    ("0.5", LatencyDistribution("fixed", 0.5)),
+    ("fixed:2", LatencyDistribution("fixed", 2.0)),
+    (" uniform:0.2,1.0 ", LatencyDistribution("uniform", 0.2, 1.0)),
+    ("lognormal:1.5,0.6", LatencyDistribution("lognormal", 1.5, 0.6)),
+    ("exponential:0.3", LatencyDistribution("exponential", 0.3)),
+    (None, LatencyDistribution("fixed", 0.0)),
+])
+def test_parse_valid_specs(spec, expected):
+    assert LatencyDistribution.parse(spec) == expected
+
+
+@pytest.mark.parametrize("spec", ["gamma:1,2", "uniform:", "slow", "normal:a,b"])
+def test_parse_rejects_invalid_specs(spec):
+    with pytest.raises(ValueError):
+        LatencyDistribution.parse(spec)
+
+
+@pytest.mark.parametrize("spec", ["normal:0,5", "fixed:-1", "uniform:-2,-1", "lognormal:0,1", "exponential:0"])
+def test_samples_are_never_negative(spec):
+    distribution = LatencyDistribution.parse(spec)
+    assert all(distribution.sample() >= 0 for _ in range(200))
+
+
+def test_fake_model_drives_the_full_agent_to_a_report():
+    from deep_research_from_scratch import model_router
+    from deep_research_from_scratch.research_agent_full import agent
+
+    # tests/conftest.py switches every role to the fake model with zero latency
+    assert all(config.models == [f"fake:{role}"] for role, config in model_router.load_role_configs().items())
+    assert isinstance(model_router.router.get_base_model("fake:research"), FakeChatModel)
+
+    state = asyncio.run(agent.ainvoke(
+        {"messages": [HumanMessage(content="Compare sodium-ion and lithium-ion batteries for grid storage")]},
+        {"configurable": {"search_provider": "fake", "thread_id": "fake-run"}},
+    ))
+    assert state["research_brief"]
+    assert state["notes"]
+    assert state["final_report"]
@@ -0,0 +1,73 @@
+import os
+
+import pytest
+
+from deep_research_from_scratch import local_files
+from deep_research_from_scratch.local_files import (
+    grep_document,
+    read_document_lines,
+    read_document_window,
+)
+
+LINES = [f"line {number}: {'sodium-ion' if number % 10 == 0 else 'lithium'} cells" for number in range(1, 51)]
+
+
+@pytest.fixture
+def document(tmp_path, monkeypatch):
+    monkeypatch.setattr(local_files, "documents_dir", tmp_path)
+    monkeypatch.setattr(local_files, "_line_offset_cache", {})
+    path = tmp_path / "report.md"
+    path.write_text("\n".join(LINES) + "\n", encoding="utf-8")
+    return path
+
+
+def test_line_window_is_numbered(document):
+    output = read_document_lines.invoke({"path": "report.md", "start_line": 49, "num_lines": 5})
+    assert output.splitlines() == [
+        "[report.md: lines 49-50 of 50]",
+        "49: line 49: lithium cells",
+        "50: line 50: sodium-ion cells",
+    ]
+
+
+def test_start_past_end_of_file_is_reported(document):
+    output = read_document_lines.invoke({"path": "report.md", "start_line": 51})
+    assert output == "[report.md: line 51 is past the end of the file (50 lines)]"
+
+
+def test_byte_window_reports_range_and_size(document):
+    size = document.stat().st_size
+    output = read_document_window.invoke({"path": "report.md", "offset": 8, "length": 16})
+    header, text = output.split("\n", 1)
+    assert header == f"[report.md: bytes 8-24 of {size}]"
+    assert text == document.read_bytes()[8:24].decode()
+
+    past_end = read_document_window.invoke({"path": "report.md", "offset": size + 100})
+    assert past_end == f"[report.md: bytes {size}-{size} of {size}]\n"
+
+
+def test_grep_returns_matching_line_numbers(document):
+    output = grep_document.invoke({"path": "report.md", "pattern": r"SODIUM-\w+"})
+    assert output.splitlines() == ["[report.md: 50 lines]"] + [
+        f"{number}: line {number}: sodium-ion cells" for number in (10, 20, 30, 40, 50)
+    ]
+    assert grep_document.invoke({"path": "report.md", "pattern": "["}).startswith("Error: invalid pattern")
+
+
+def test_paths_outside_the_documents_dir_are_refused(document):
+    assert "Access denied" in read_document_lines.invoke({"path": "../secrets.txt"})
+
+
+def test_line_offsets_are_reused_until_the_file_changes(document):
+    read_document_lines.invoke({"path": "report.md", "start_line": 1})
+    offsets = local_files._line_offset_cache[document.resolve()][2]
+    read_document_lines.invoke({"path": "report.md", "start_line": 20})
+    assert local_files._line_offset_cache[document.resolve()][2] is offsets
+
+    document.write_text("first\nsecond\n", encoding="utf-8")
+    stat = document.stat()
+    os.utime(document, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert read_document_lines.invoke({"path": "report.md", "start_line": 2}).splitlines() == [
+        "[report.md: lines 2-2 of 2]",
+        "2: second",
+    ]
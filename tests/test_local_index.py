@@ -0,0 +1,53 @@
+import asyncio
+import threading
+
+from deep_research_from_scratch import local_embeddings, local_index
+from deep_research_from_scratch.local_index import (
+    LocalDocumentIndex,
+    search_local_documents,
+)
+
+
+def test_semantic_embedder_load_failure_falls_back(monkeypatch):
+    def offline(*args, **kwargs):
+        raise OSError("model files not found and no network")
+
+    monkeypatch.setattr(local_embeddings, "SentenceTransformerEmbedder", offline)
+    monkeypatch.setattr(local_embeddings, "_semantic_embedder", None)
+    monkeypatch.setattr(local_embeddings, "_semantic_unavailable", False)
+
+    assert local_embeddings.get_semantic_embedder() is None
+    assert isinstance(local_embeddings.get_local_embedder(), local_embeddings.HashingEmbedder)
+
+
+def test_async_search_runs_off_the_event_loop(tmp_path, monkeypatch):
+    corpus = tmp_path / "files"
+    corpus.mkdir()
+    (corpus / "notes.md").write_text("Sodium-ion cells avoid lithium and cobalt.\n\nUnrelated paragraph.\n")
+    index = LocalDocumentIndex(corpus, use_embeddings=False)
+    monkeypatch.setattr(local_index, "_index", index)
+
+    search_threads = []
+
+    def search(query, max_results=5):
+        search_threads.append(threading.current_thread())
+        return LocalDocumentIndex.search(index, query, max_results)
+
+    monkeypatch.setattr(index, "search", search)
+
+    output = asyncio.run(search_local_documents.ainvoke({"query": "sodium-ion cells"}))
+
+    assert "notes.md" in output
+    assert search_threads == [search_threads[0]] and search_threads[0] is not threading.main_thread()
+
+
+def test_default_index_is_saved_outside_the_corpus(tmp_path):
+    first, second = tmp_path / "a" / "files", tmp_path / "b" / "files"
+    for corpus in (first, second):
+        corpus.mkdir(parents=True)
+        (corpus / "notes.md").write_text("Sodium-ion cells avoid lithium.\n")
+
+    paths = [LocalDocumentIndex(corpus, use_embeddings=False).index_path for corpus in (first, second)]
+    assert all(path.parent == local_index.default_index_dir for path in paths)
+    # Corpora with the same directory name keep separate indexes
+    assert paths[0] != paths[1]
@@ -0,0 +1,58 @@
+from langchain_core.messages import AIMessage, ToolMessage
+
+from deep_research_from_scratch import blob_store, memory_budget
+from deep_research_from_scratch.blob_store import is_blob_ref, load_notes
+from deep_research_from_scratch.compact_messages import is_compact
+from deep_research_from_scratch.configuration import Configuration
+from deep_research_from_scratch.memory_budget import approx_size, enforce_memory_budget
+
+
+def tool_message(call_id, text):
+    return ToolMessage(content=text, name="ConductResearch", tool_call_id=call_id, id=f"msg-{call_id}")
+
+
+def test_state_over_budget_is_compacted_and_spilled(tmp_path, monkeypatch):
+    monkeypatch.setattr(blob_store, "_store", blob_store.BlobStore(tmp_path))
+    events = []
+    monkeypatch.setattr(memory_budget, "emit_progress", lambda event, **fields: events.append({"event": event, **fields}))
+
+    old = tool_message("old", "earlier findings " * 400)
+    state = {"supervisor_messages": [AIMessage(content="delegating", id="msg-ai"), old], "notes": [], "raw_notes": []}
+    new = tool_message("new", "fresh findings " * 400)
+    update = {
+        "supervisor_messages": [new],
+        "notes": ["note " * 300],
+        "raw_notes": ["raw note " * 300, blob_store.spill_text("already spilled")],
+    }
+
+    result = enforce_memory_budget(
+        "supervisor_tools", state, update, Configuration(memory_budget_mb=0.005),
+        message_fields=("supervisor_messages",), note_fields=("notes", "raw_notes"),
+    )
+
+    # The history's tool message is replaced in place by id, the new one is compacted
+    replaced, appended = result["supervisor_messages"]
+    assert replaced.id == old.id and is_compact(replaced)
+    assert appended.id == new.id and is_compact(appended)
+    # Notes are spilled, and load back unchanged
+    assert all(is_blob_ref(note) for note in result["notes"] + result["raw_notes"])
+    assert load_notes(result["notes"] + result["raw_notes"]) == update["notes"] + ["raw note " * 300, "already spilled"]
+
+    measured, exceeded = events
+    assert measured["event"] == "state_measured"
+    assert exceeded["event"] == "memory_budget_exceeded"
+    assert exceeded["state_bytes"] == measured["state_bytes"] > exceeded["budget_bytes"]
+    freed = (
+        approx_size([old, new]) - approx_size(result["supervisor_messages"])
+        + approx_size(update["notes"] + update["raw_notes"]) - approx_size(result["notes"] + result["raw_notes"])
+    )
+    assert exceeded["freed_bytes"] == freed > 0
+
+
+def test_state_under_budget_is_unchanged(monkeypatch):
+    events = []
+    monkeypatch.setattr(memory_budget, "emit_progress", lambda event, **fields: events.append(event))
+    update = {"notes": ["short note"]}
+
+    assert enforce_memory_budget("test", {"notes": []}, update, Configuration(memory_budget_mb=1), note_fields=("notes",)) is update
+    assert events == ["state_measured"]
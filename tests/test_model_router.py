@@ -0,0 +1,42 @@
+import asyncio
+
+import pytest
+from langchain_core.runnables import RunnableLambda
+
+from deep_research_from_scratch import resilience
+from deep_research_from_scratch.model_router import (
+    LatencyTracker,
+    ModelRouter,
+    RoleConfig,
+    RoutedModel,
+)
+
+
+@pytest.fixture(autouse=True)
+def fresh_breakers(monkeypatch):
+    monkeypatch.setattr(resilience, "_breakers", {})
+
+
+def test_zero_hedge_delay_is_kept():
+    router = ModelRouter(role_configs={"write": RoleConfig(models=["fake:write"])}, hedge_delay=0.0)
+
+    assert router.hedge_delay == 0.0
+
+
+def test_single_candidate_hedges_with_a_duplicate_request():
+    calls = []
+
+    async def respond(prompt):
+        calls.append(prompt)
+        # The first request stalls; the duplicate answers at once
+        if len(calls) == 1:
+            await asyncio.sleep(5)
+            return "slow"
+        return "fast"
+
+    model = RoutedModel(
+        "write", [("fake:write", RunnableLambda(respond))], LatencyTracker(), hedge=True, hedge_delay=0.05
+    )
+
+    assert asyncio.run(model.ainvoke("prompt")) == "fast"
+    assert len(calls) == 2
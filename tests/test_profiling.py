@@ -0,0 +1,18 @@
+import json
+import uuid
+
+from deep_research_from_scratch.profiling import ChromeTraceProfiler
+
+
+def test_span_ending_after_its_root_is_dropped(tmp_path):
+    profiler = ChromeTraceProfiler(tmp_path)
+    root, child = uuid.uuid4(), uuid.uuid4()
+    profiler.start_span(root, None, "supervisor", "chain")
+    profiler.start_span(child, root, "researcher", "chain")
+
+    profiler.end_span(root)
+    profiler.end_span(child)
+
+    trace = json.loads((tmp_path / f"trace-{root}.json").read_text())
+    assert [event["name"] for event in trace["traceEvents"] if event["ph"] == "X"] == ["supervisor"]
+    assert profiler._spans == {} and profiler._tracks == {}
@@ -0,0 +1,50 @@
+import asyncio
+
+from langgraph.graph import END, START, StateGraph
+from typing_extensions import TypedDict
+
+from deep_research_from_scratch import memory_budget, progress_events
+from deep_research_from_scratch.configuration import Configuration
+
+
+class State(TypedDict):
+    active: list
+
+
+async def probe(state: State) -> dict:
+    return {"active": state["active"] + [progress_events.progress_consumers_active()]}
+
+
+def probe_graph():
+    builder = StateGraph(State)
+    builder.add_node("probe", probe)
+    builder.add_edge(START, "probe")
+    builder.add_edge("probe", END)
+    return builder.compile()
+
+
+def test_consumers_are_a_sink_or_a_custom_stream(tmp_path):
+    graph = probe_graph()
+    assert progress_events.progress_consumers_active() is False
+    assert asyncio.run(graph.ainvoke({"active": []}))["active"] == [False]
+
+    async def custom_stream():
+        return [chunk async for chunk in graph.astream({"active": []}, stream_mode=["custom", "values"], subgraphs=True)]
+
+    values = [chunk for _, mode, chunk in asyncio.run(custom_stream()) if mode == "values"]
+    assert values[-1]["active"] == [True]
+
+    progress_events.set_progress_sink(tmp_path / "events.jsonl")
+    try:
+        assert progress_events.progress_consumers_active() is True
+    finally:
+        progress_events.set_progress_sink(None)
+
+
+def test_state_is_not_measured_without_budget_or_consumer(monkeypatch):
+    def fail(*args, **kwargs):
+        raise AssertionError("state was measured")
+
+    monkeypatch.setattr(memory_budget, "measure_state", fail)
+    update = {"notes": ["finding"]}
+    assert memory_budget.enforce_memory_budget("test", {"notes": []}, update, Configuration()) is update
@@ -0,0 +1,51 @@
+import pytest
+
+from deep_research_from_scratch import prompt_registry
+from deep_research_from_scratch.prompt_registry import (
+    PROMPTS,
+    get_system_message,
+    partial_prompt,
+    prompt_version,
+    render_prompt,
+    template_fields,
+)
+
+
+@pytest.mark.parametrize("name", sorted(PROMPTS))
+def test_render_fills_every_field(name):
+    values = {field: f"<{field} value>" for field in template_fields(name)}
+    rendered = render_prompt(name, **values)
+
+    for field, value in values.items():
+        assert value in rendered
+        assert "{" + field + "}" not in rendered
+    message = get_system_message(name, **values)
+    assert message.content == rendered
+    assert get_system_message(name, **values) is message
+
+
+def test_partial_prompt_leaves_per_call_fields_open():
+    name = "query_focused_summarize_prompt"
+    static = {"date": "Mon Jan 5, 2026", "max_words": 150}
+    per_call = {"webpage_content": "Page with {braces}", "query": "grid storage", "research_topic": "batteries"}
+    assert set(static) | set(per_call) == template_fields(name)
+
+    template = partial_prompt(name, **static)
+    assert "{webpage_content}" in template and "{date}" not in template
+    assert template.format(**per_call) == render_prompt(name, **static, **per_call)
+    # Values filled in early survive the later format call even with braces
+    assert "{x}" in partial_prompt(name, date="{x}", max_words=1).format(**per_call)
+
+
+def test_prompt_version_changes_with_the_template(monkeypatch):
+    name = "compress_research_human_message"
+    before = prompt_version(name)
+    assert prompt_version(name) == before
+
+    monkeypatch.setitem(PROMPTS, name, PROMPTS[name] + "\nBe brief.")
+    prompt_registry.prompt_version.cache_clear()
+    try:
+        assert prompt_version(name) != before
+        assert prompt_registry.prompt_versions()[name] == prompt_version(name)
+    finally:
+        prompt_registry.prompt_version.cache_clear()
@@ -0,0 +1,32 @@
+import sqlite3
+
+from deep_research_from_scratch.local_embeddings import HashingEmbedder
+from deep_research_from_scratch.research_cache import ResearchCache
+
+TOPIC = "Battery chemistries used in grid-scale energy storage"
+
+
+def test_lookup_requires_same_provider_and_models(tmp_path):
+    cache = ResearchCache(tmp_path / "cache.sqlite", embedder=HashingEmbedder())
+    cache.store(TOPIC, "findings", ["note"], search_provider="tavily", models="research=openai:gpt-4.1")
+
+    assert cache.lookup(TOPIC, 0.9, 3600, search_provider="tavily", models="research=openai:gpt-4.1") is not None
+    assert cache.lookup(TOPIC, 0.9, 3600, search_provider="local", models="research=openai:gpt-4.1") is None
+    assert cache.lookup(TOPIC, 0.9, 3600, search_provider="tavily", models="research=openai:gpt-4.1-mini") is None
+
+
+def test_older_cache_file_is_upgraded_and_its_entries_ignored(tmp_path):
+    path = tmp_path / "cache.sqlite"
+    with sqlite3.connect(path) as connection:
+        connection.executescript(
+            "CREATE TABLE research_cache (id INTEGER PRIMARY KEY, topic TEXT NOT NULL, embedder TEXT NOT NULL, "
+            "prompt_version TEXT NOT NULL, embedding BLOB NOT NULL, compressed_research TEXT NOT NULL, "
+            "raw_notes TEXT NOT NULL, created_at REAL NOT NULL);"
+            "CREATE INDEX research_cache_lookup ON research_cache (embedder, prompt_version, created_at);"
+        )
+    connection.close()
+
+    cache = ResearchCache(path, embedder=HashingEmbedder())
+    cache.store(TOPIC, "findings", [], search_provider="tavily", models="m")
+
+    assert cache.lookup(TOPIC, 0.9, 3600, search_provider="tavily", models="m").compressed_research == "findings"
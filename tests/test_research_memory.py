@@ -0,0 +1,99 @@
+import asyncio
+import sqlite3
+import time
+
+import pytest
+
+from deep_research_from_scratch import (
+    multi_agent_supervisor,
+    research_cache,
+    research_memory,
+)
+from deep_research_from_scratch.configuration import Configuration
+from deep_research_from_scratch.local_embeddings import HashingEmbedder
+from deep_research_from_scratch.research_cache import ResearchCache
+from deep_research_from_scratch.research_memory import ResearchMemory
+
+GRID = "Battery chemistries used in grid-scale energy storage"
+SOLAR = "Efficiency of perovskite solar cells"
+WIND = "Offshore wind turbine maintenance costs"
+
+
+@pytest.fixture
+def memory(tmp_path, monkeypatch):
+    store = ResearchMemory(tmp_path / "memory.sqlite", embedder=HashingEmbedder())
+    monkeypatch.setattr(research_memory, "_memory", store)
+    return store
+
+
+def test_search_returns_similar_findings_with_their_sources(memory):
+    memory.add(GRID, "Sodium-ion is cheaper [1].\n\n### Sources\n[1] https://example.com/sodium.")
+    memory.add(SOLAR, "Perovskites reach 26% in the lab.")
+
+    entries = memory.search("grid-scale battery storage chemistries")
+    assert entries[0].topic == GRID
+    assert entries[0].urls == ["https://example.com/sodium"]
+    assert all(entry.topic != WIND for entry in entries)
+
+
+def test_size_eviction_removes_least_recently_used(memory, monkeypatch):
+    now = time.time()
+    for offset, topic in enumerate([GRID, SOLAR, WIND]):
+        monkeypatch.setattr(research_memory.time, "time", lambda offset=offset: now + offset)
+        memory.add(topic, "x" * 100)
+    monkeypatch.setattr(research_memory.time, "time", lambda: now + 10)
+    assert memory.search(GRID, max_results=1)[0].topic == GRID
+
+    # One finding over the limit: the least recently used one goes, not the oldest
+    assert memory.evict(max_age_seconds=3600, max_bytes=memory.stats()["bytes"] - 1) == 1
+    with sqlite3.connect(memory.path) as connection:
+        topics = {topic for (topic,) in connection.execute("SELECT topic FROM research_memory")}
+    connection.close()
+    assert topics == {GRID, WIND}
+
+
+def test_age_eviction_removes_expired_findings(memory, monkeypatch):
+    memory.add(GRID, "old findings")
+    now = time.time()
+    monkeypatch.setattr(research_memory.time, "time", lambda: now + 7200)
+    memory.add(SOLAR, "new findings")
+
+    assert memory.evict(max_age_seconds=3600, max_bytes=10**6) == 1
+    assert memory.stats()["findings"] == 1
+    assert memory.search(GRID, max_age_seconds=3600) == []
+
+
+def test_search_research_memory_tool_output(memory):
+    call = {"name": "SearchResearchMemory", "args": {"query": GRID}, "id": "call_1"}
+    configuration = Configuration(research_memory=True)
+
+    empty = asyncio.run(multi_agent_supervisor.search_research_memory(call, configuration))
+    assert empty.artifact == {"status": "empty"}
+
+    memory.add(GRID, "Sodium-ion is cheaper, see https://example.com/sodium")
+    message = asyncio.run(multi_agent_supervisor.search_research_memory(call, configuration))
+    assert message.tool_call_id == "call_1"
+    assert f"[1] Topic: {GRID}" in message.content
+    assert "- https://example.com/sodium" in message.content
+    assert message.artifact["memory"][0]["topic"] == GRID
+
+
+def test_research_served_from_cache_is_remembered_once(memory, tmp_path, monkeypatch):
+    monkeypatch.setattr(research_cache, "_cache", ResearchCache(tmp_path / "cache.sqlite", embedder=HashingEmbedder()))
+    runs = []
+
+    async def run_research_agent(topic, configuration):
+        runs.append(topic)
+        return {"compressed_research": "Sodium-ion is cheaper.", "raw_notes": ["raw"]}
+
+    monkeypatch.setattr(multi_agent_supervisor, "run_research_agent", run_research_agent)
+
+    asyncio.run(multi_agent_supervisor.conduct_research(GRID, Configuration(research_cache=True)))
+    assert memory.stats()["findings"] == 0
+
+    with_memory = Configuration(research_cache=True, research_memory=True)
+    for _ in range(2):
+        result = asyncio.run(multi_agent_supervisor.conduct_research(GRID, with_memory))
+        assert "cache" in result
+    assert runs == [GRID]
+    assert memory.stats()["findings"] == 1
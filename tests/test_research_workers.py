@@ -0,0 +1,54 @@
+import asyncio
+
+import pytest
+
+from deep_research_from_scratch import research_workers
+from deep_research_from_scratch.resilience import DeadlineExceeded
+
+
+class RecordingPool:
+    def __init__(self, max_workers):
+        self.max_workers = max_workers
+        self.shutdowns = []
+
+    def shutdown(self, cancel_pending=True):
+        self.shutdowns.append(cancel_pending)
+
+
+def test_one_pool_is_reused_resized_and_shut_down(monkeypatch):
+    monkeypatch.setattr(research_workers, "ResearchWorkerPool", RecordingPool)
+    monkeypatch.setattr(research_workers, "_pool", None)
+
+    first = research_workers.get_worker_pool(2)
+    assert research_workers.get_worker_pool(2) is first
+
+    resized = research_workers.get_worker_pool(4)
+    assert resized.max_workers == 4
+    # Jobs already submitted to the old pool are allowed to finish
+    assert first.shutdowns == [False]
+
+    research_workers.shutdown_worker_pool()
+    assert resized.shutdowns == [True]
+    assert research_workers._pool is None
+
+
+def test_overdue_job_is_cancelled_inside_the_worker(monkeypatch):
+    from deep_research_from_scratch.research_agent import researcher_agent
+
+    started = []
+
+    async def hang(state, config=None):
+        started.append(config["configurable"]["research_timeout_seconds"])
+        await asyncio.sleep(60)
+
+    monkeypatch.setattr(researcher_agent, "ainvoke", hang)
+    loop = asyncio.new_event_loop()
+    monkeypatch.setattr(research_workers, "_worker_loop", loop)
+    try:
+        with pytest.raises(DeadlineExceeded):
+            research_workers.run_research_job("topic", {"research_timeout_seconds": 0.05})
+        # Nothing is left running, so the worker process is free for its next job
+        assert started == [0.05]
+        assert asyncio.all_tasks(loop) == set()
+    finally:
+        loop.close()
@@ -0,0 +1,128 @@
+import asyncio
+import time
+
+import pytest
+
+from deep_research_from_scratch import resilience
+from deep_research_from_scratch.resilience import (
+    CircuitBreaker,
+    CircuitOpenError,
+    DeadlineExceeded,
+    RetryPolicy,
+    aresilient_call,
+    get_circuit_breaker,
+    resilient_call,
+)
+
+
+class Overloaded(Exception):
+    status_code = 503
+
+
+class BadRequest(Exception):
+    status_code = 400
+
+
+@pytest.fixture(autouse=True)
+def fresh_breakers(monkeypatch):
+    monkeypatch.setattr(resilience, "_breakers", {})
+
+
+def open_breaker(name: str, reset_seconds: float = 0.0) -> CircuitBreaker:
+    breaker = CircuitBreaker(name, failure_threshold=1, reset_seconds=reset_seconds)
+    resilience._breakers[name] = breaker
+    breaker.before_call()
+    breaker.record_failure(Overloaded())
+    return breaker
+
+
+def test_breaker_opens_after_threshold_and_fails_fast():
+    breaker = open_breaker("test", reset_seconds=60)
+    assert breaker.state == "open"
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+
+def test_non_retryable_error_does_not_open_breaker():
+    breaker = CircuitBreaker("test", failure_threshold=1)
+    breaker.before_call()
+    breaker.record_failure(BadRequest())
+    assert breaker.state == "closed"
+
+
+def test_half_open_admits_single_probe_and_success_closes():
+    breaker = open_breaker("test")
+    breaker.before_call()
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+    breaker.record_success()
+    assert breaker.state == "closed"
+
+
+def test_retries_transient_errors():
+    calls = []
+
+    def flaky():
+        calls.append(1)
+        if len(calls) < 3:
+            raise Overloaded()
+        return "ok"
+
+    policy = RetryPolicy(attempts=3, backoff_base=0.0)
+    assert resilient_call("test", flaky, policy=policy) == "ok"
+    assert len(calls) == 3
+
+
+def test_does_not_retry_bad_requests():
+    calls = []
+
+    def bad():
+        calls.append(1)
+        raise BadRequest()
+
+    with pytest.raises(BadRequest):
+        resilient_call("test", bad, policy=RetryPolicy(attempts=3, backoff_base=0.0))
+    assert len(calls) == 1
+
+
+def test_async_deadline_cancels_running_attempt():
+    async def slow():
+        await asyncio.sleep(1)
+
+    policy = RetryPolicy(attempts=3, backoff_base=0.0, deadline=0.05)
+    start = time.monotonic()
+    with pytest.raises(DeadlineExceeded):
+        asyncio.run(aresilient_call("test", slow, policy=policy))
+    assert time.monotonic() - start < 0.5
+
+
+def test_cancelled_probe_releases_half_open_breaker():
+    open_breaker("test")
+
+    async def hang():
+        await asyncio.sleep(10)
+
+    async def ok():
+        return "ok"
+
+    async def scenario():
+        probe = asyncio.create_task(aresilient_call("test", hang))
+        await asyncio.sleep(0.01)
+        probe.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await probe
+        return await aresilient_call("test", ok)
+
+    assert asyncio.run(scenario()) == "ok"
+    assert get_circuit_breaker("test").state == "closed"
+
+
+def test_interrupted_sync_probe_releases_half_open_breaker():
+    open_breaker("test")
+
+    def interrupted():
+        raise KeyboardInterrupt
+
+    with pytest.raises(KeyboardInterrupt):
+        resilient_call("test", interrupted)
+    assert resilient_call("test", lambda: "ok") == "ok"
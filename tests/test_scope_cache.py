@@ -0,0 +1,113 @@
+import time
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage
+
+from deep_research_from_scratch import research_agent_scope, scope_cache
+from deep_research_from_scratch.scope_cache import ScopeCache, scope_key
+from deep_research_from_scratch.state_scope import (
+    ClarifyWithUser,
+    ResearchQuestion,
+    ScopeResearch,
+)
+
+REQUEST = "Compare  the best coffee shops in San Francisco\nby coffee quality"
+
+
+class FakeScopeModel:
+    """Structured-output scoping model that answers from canned results and records its calls."""
+
+    def __init__(self, need_clarification=False):
+        self.need_clarification = need_clarification
+        self.calls = []
+
+    def with_structured_output(self, schema):
+        return FakeStructuredModel(self, schema)
+
+
+class FakeStructuredModel:
+    def __init__(self, model, schema):
+        self.model, self.schema = model, schema
+
+    def invoke(self, messages):
+        self.model.calls.append(self.schema.__name__)
+        decision = {
+            "need_clarification": self.model.need_clarification,
+            "question": "Which neighbourhoods?" if self.model.need_clarification else "",
+            "verification": "Starting research on coffee shops.",
+        }
+        if self.schema is ClarifyWithUser:
+            return ClarifyWithUser(**decision)
+        if self.schema is ScopeResearch:
+            return ScopeResearch(**decision, research_brief="" if self.model.need_clarification else "Brief: coffee")
+        return ResearchQuestion(research_brief="Brief: coffee")
+
+
+@pytest.fixture
+def model(tmp_path, monkeypatch):
+    monkeypatch.setattr(scope_cache, "_cache", ScopeCache(tmp_path / "scope_cache.sqlite"))
+    fake = FakeScopeModel()
+    monkeypatch.setattr(research_agent_scope, "get_model", lambda role, transform: transform(fake))
+    return fake
+
+
+def scope(text, **configurable):
+    return research_agent_scope.scope_research.invoke(
+        {"messages": [HumanMessage(content=text)]},
+        {"configurable": {"scope_cache": True, **configurable}},
+    )
+
+
+def test_key_ignores_case_and_whitespace():
+    assert scope_key([HumanMessage(content=REQUEST)]) == scope_key([HumanMessage(content="compare the BEST coffee shops in san francisco by coffee quality ")])
+    assert scope_key([HumanMessage(content=REQUEST)]) != scope_key([HumanMessage(content=REQUEST + " and price")])
+    assert scope_key([HumanMessage(content=REQUEST)]) != scope_key([AIMessage(content=REQUEST)])
+
+
+def test_entries_expire_after_max_age(tmp_path, monkeypatch):
+    cache = ScopeCache(tmp_path / "scope_cache.sqlite")
+    conversation = [HumanMessage(content=REQUEST)]
+    cache.store(conversation, ScopeResearch(need_clarification=False, question="", verification="ok", research_brief="b"))
+    assert cache.lookup(conversation, 3600).research_brief == "b"
+
+    now = time.time()
+    monkeypatch.setattr(scope_cache.time, "time", lambda: now + 7200)
+    assert cache.lookup(conversation, 3600) is None
+    assert cache.purge(3600) == 1
+
+
+def test_repeated_conversation_skips_the_model(model):
+    first = scope(REQUEST)
+    assert model.calls == ["ClarifyWithUser", "ResearchQuestion"]
+
+    model.calls.clear()
+    second = scope(REQUEST.upper())
+    assert model.calls == []
+    assert second["research_brief"] == first["research_brief"] == "Brief: coffee"
+    assert second["messages"][-1].content == "Starting research on coffee shops."
+
+
+def test_cached_clarification_question_is_served(model):
+    model.need_clarification = True
+    first = scope(REQUEST)
+    assert first["messages"][-1].content == "Which neighbourhoods?"
+    assert not first.get("research_brief")
+
+    model.calls.clear()
+    assert scope(REQUEST)["messages"][-1].content == "Which neighbourhoods?"
+    assert model.calls == []
+
+
+def test_single_call_mode_makes_one_call_and_is_cached(model):
+    assert scope(REQUEST, scoping_mode="single_call")["research_brief"] == "Brief: coffee"
+    assert model.calls == ["ScopeResearch"]
+
+    model.calls.clear()
+    assert scope(REQUEST, scoping_mode="single_call")["research_brief"] == "Brief: coffee"
+    assert model.calls == []
+
+
+def test_cache_is_off_by_default(model):
+    scope(REQUEST, scope_cache=False)
+    scope(REQUEST, scope_cache=False)
+    assert model.calls == ["ClarifyWithUser", "ResearchQuestion"] * 2
@@ -0,0 +1,24 @@
+from deep_research_from_scratch.state_research import SearchResults, SourceRecord
+from deep_research_from_scratch.utils import (
+    NO_RESULTS_MESSAGE,
+    chars_per_token,
+    render_search_results,
+)
+
+
+def test_truncated_output_fits_budget_and_keeps_short_sources():
+    results = SearchResults(sources=[
+        SourceRecord(title="Long", url="https://example.com/long", summary="word " * 2000),
+        SourceRecord(title="Short", url="https://example.com/short", summary="A short summary."),
+    ])
+
+    output = render_search_results(results, "truncated", max_tokens=300)
+
+    assert len(output) <= 300 * chars_per_token + len(" [...]")
+    assert "A short summary." in output
+    assert "[...]" in output
+
+
+def test_empty_results_render_the_no_results_message():
+    assert render_search_results(SearchResults(), "truncated", max_tokens=100) == NO_RESULTS_MESSAGE
+    assert render_search_results(SearchResults()) == NO_RESULTS_MESSAGE
@@ -0,0 +1,51 @@
+import asyncio
+import threading
+
+import pytest
+
+from deep_research_from_scratch.local_index import LocalDocumentIndex
+from deep_research_from_scratch.search_providers import (
+    LocalSearchProvider,
+    SearchProvider,
+)
+
+
+def test_incomplete_provider_cannot_be_instantiated():
+    class SearchOnly(SearchProvider):
+        def search(self, query, max_results=3, topic="general", include_raw_content=True):
+            return {"results": []}
+
+    with pytest.raises(TypeError, match="extract"):
+        SearchOnly()
+
+
+def test_complete_provider_gets_async_and_batch_defaults():
+    class Echo(SearchProvider):
+        def search(self, query, max_results=3, topic="general", include_raw_content=True):
+            return {"results": [{"url": query, "title": query, "content": "", "score": 1.0}]}
+
+        def extract(self, urls):
+            return {"results": [{"url": url, "raw_content": url} for url in urls], "failed_results": []}
+
+    responses = Echo().search_many(["a", "b"])
+    assert [response["results"][0]["url"] for response in responses] == ["a", "b"]
+
+
+def test_local_provider_searches_off_the_loop_under_the_index_lock(tmp_path):
+    corpus = tmp_path / "corpus"
+    corpus.mkdir()
+    (corpus / "grid.md").write_text("Sodium-ion cells are cheap for grid storage.\n", encoding="utf-8")
+    provider = LocalSearchProvider(corpus, index=LocalDocumentIndex(corpus, index_path=tmp_path / "index.json"))
+
+    calls = []
+    search = provider.index.search
+
+    def recording_search(*args, **kwargs):
+        calls.append((threading.current_thread() is threading.main_thread(), provider.lock.locked()))
+        return search(*args, **kwargs)
+
+    provider.index.search = recording_search
+    response = asyncio.run(provider.asearch("sodium-ion grid"))
+    assert response["results"][0]["url"].startswith("local://grid.md#L1")
+    assert calls == [(False, True)]
+    assert asyncio.run(provider.aextract([response["results"][0]["url"]]))["results"]
@@ -0,0 +1,123 @@
+import asyncio
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+
+from deep_research_from_scratch import multi_agent_supervisor
+from deep_research_from_scratch.configuration import Configuration
+
+
+def supervisor_message(*tool_calls):
+    return AIMessage(content="", tool_calls=[
+        {"name": name, "args": args, "id": f"call_{index}"}
+        for index, (name, args) in enumerate(tool_calls)
+    ])
+
+
+def research(topic):
+    return ("ConductResearch", {"research_topic": topic})
+
+
+@pytest.fixture
+def researchers(monkeypatch):
+    """Replace conduct_research with researchers released by the test, per topic."""
+    monkeypatch.setattr(multi_agent_supervisor, "_background_research", {})
+    gates = {}
+
+    async def conduct_research(topic, configuration):
+        await gates.setdefault(topic, asyncio.Event()).wait()
+        return {"compressed_research": f"findings on {topic}", "raw_notes": [f"raw {topic}"]}
+
+    monkeypatch.setattr(multi_agent_supervisor, "conduct_research", conduct_research)
+    return gates
+
+
+def release(gates, topic):
+    gates.setdefault(topic, asyncio.Event()).set()
+
+
+def run_speculatively(message, pending, **config):
+    return multi_agent_supervisor.conduct_research_speculatively(message, pending, Configuration(**config))
+
+
+def test_waits_for_quorum_and_leaves_the_rest_running(researchers):
+    async def scenario():
+        release(researchers, "a")
+        update = await run_speculatively(
+            supervisor_message(research("a"), research("b")), {}, speculative_quorum=0.5
+        )
+        statuses = [message.artifact["status"] for message in update["supervisor_messages"]]
+        assert statuses == ["completed", "running"]
+        assert update["supervisor_messages"][0].content == "findings on a"
+        assert update["raw_notes"] == ["raw a"]
+        assert list(update["pending_research"].values()) == ["b"]
+        assert list(multi_agent_supervisor._background_research) == list(update["pending_research"])
+
+    asyncio.run(scenario())
+
+
+def test_late_research_is_delivered_without_waiting(researchers):
+    async def scenario():
+        first = await run_speculatively(supervisor_message(research("a"), research("b")), {}, speculative_quorum=0.5)
+        late_id = next(iter(first["pending_research"]))
+
+        # Nothing new launched and nothing finished: returns at once
+        idle = await asyncio.wait_for(run_speculatively(supervisor_message(), first["pending_research"]), 1)
+        assert idle["supervisor_messages"] == [] and idle["pending_research"] == first["pending_research"]
+
+        release(researchers, first["pending_research"][late_id])
+        await asyncio.sleep(0)
+        update = await run_speculatively(supervisor_message(), first["pending_research"])
+        assert update["pending_research"] == {}
+        assert isinstance(update["supervisor_messages"][0], HumanMessage)
+        assert late_id in update["supervisor_messages"][0].content
+        assert update["notes"] == [f"findings on {first['pending_research'][late_id]}"]
+
+    release(researchers, "a")
+    asyncio.run(scenario())
+
+
+def test_cancel_research_stops_the_task(researchers):
+    async def scenario():
+        release(researchers, "a")
+        first = await run_speculatively(supervisor_message(research("a"), research("b")), {}, speculative_quorum=0.5)
+        research_id = next(iter(first["pending_research"]))
+        task = multi_agent_supervisor._background_research[research_id]
+
+        update = await run_speculatively(
+            supervisor_message(("CancelResearch", {"research_id": research_id})), first["pending_research"]
+        )
+        await asyncio.sleep(0)
+        assert task.cancelled()
+        assert update["pending_research"] == {}
+        assert isinstance(update["supervisor_messages"][0], ToolMessage)
+        assert update["supervisor_messages"][0].artifact["status"] == "cancelled"
+        assert multi_agent_supervisor._background_research == {}
+
+    asyncio.run(scenario())
+
+
+def test_malformed_call_launches_nothing(researchers):
+    async def scenario():
+        with pytest.raises(KeyError):
+            await run_speculatively(supervisor_message(research("a"), ("ConductResearch", {})), {})
+        assert multi_agent_supervisor._background_research == {}
+
+    asyncio.run(scenario())
+
+
+def test_launched_research_is_cancelled_when_the_iteration_fails(researchers):
+    async def scenario():
+        call = asyncio.create_task(run_speculatively(supervisor_message(research("a"), research("b")), {}))
+        await asyncio.sleep(0.01)
+        tasks = list(multi_agent_supervisor._background_research.values())
+        assert len(tasks) == 2
+
+        call.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await call
+        await asyncio.sleep(0)
+        assert all(task.cancelled() for task in tasks)
+        assert multi_agent_supervisor._background_research == {}
+
+    asyncio.run(scenario())